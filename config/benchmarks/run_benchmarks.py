@@ -0,0 +1,345 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    run_benchmarks.py
+
+DESCRIPTION:
+    This module benchmarks the performance and weight and balance engines.
+    Run it from the config folder:
+
+        python -m benchmarks.run_benchmarks --output results.json
+        python -m benchmarks.run_benchmarks --baseline results.json --threshold 0.2
+
+    The suite measures:
+
+    > latency: time per call of compute_performance (with and without the
+      result cache) and of compute_weight_and_balance, one scenario at a
+      time (median and 99th percentile).
+    > import: cold-start time of the engines and of config.wsgi, each one
+      imported in a new interpreter (median of several runs).
+    > throughput: scenarios/s of compute_performance_batch for batches of
+      1k, 100k and 1M random valid scenarios (see --sizes), and for a batch
+      of unchecked scenarios where the invalid ones are recorded.
+    > interpolation: time per call of helpers.dataframe_interpolation on an
+      ArrayTable and on a pandas DataFrame.
+    > memory: peak traced memory (tracemalloc) of a 100k scenarios batch and
+      peak resident memory of the process.
+    > envelope: time of a 100x100x10 takeoff envelope (pressure altitude x
+      temperature x weight) and of a cruise envelope (altitude x rpm), see
+      performance/src/envelope.py.
+
+    The scenarios are generated from a fixed seed, and every path is
+    relative to this file. The results are written as JSON: one entry per
+    metric with its value, unit and direction ('lower' or 'higher' is
+    better). With --baseline, every metric is compared with the same metric
+    of a previous results file, and the command exits with status 1 if any
+    of them is worse by more than the threshold (a fraction of the baseline
+    value).
+"""
+
+import argparse
+import functools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+import numpy as np
+
+CONFIG_DIR = Path(__file__).resolve().parents[1]
+if str(CONFIG_DIR) not in sys.path:
+    sys.path.insert(0, str(CONFIG_DIR))
+
+from performance.src import cache
+from performance.src import envelope
+from performance.src import helpers
+from performance.src import run_performance
+from performance.src import tables
+from weight_balance.src import run_weight_balance
+
+FORMAT_VERSION = 1
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DEFAULT_THRESHOLD = 0.2
+MEMORY_BATCH_SIZE = 100000
+# Random scenarios checked once, and then drawn to build the batches.
+POOL_SIZE = 4096
+# Size of the batch of unchecked scenarios, where the invalid ones are recorded.
+ERROR_BATCH_SIZE = 1000
+SEED = 172
+
+PERFORMANCE_SCENARIO = {'to_weight': 2120, 'fuel_capacity': 40,
+                        'to_heading': 170, 'to_length': 1750, 'to_condition': 'g', 'to_press_alt': 1200, 'to_temp': 15,
+                        'to_wind_speed': 27, 'to_wind_direction': 110,
+                        'travel_dist': 590, 'cr_heading': 90, 'cr_press_alt': 7000, 'cr_temp': 4,
+                        'cr_wind_speed': 18, 'cr_wind_direction': 270, 'cr_power': 2500,
+                        'land_heading': 220, 'land_length': 2000, 'land_condition': 'p', 'land_press_alt': 4000,
+                        'land_temp': 10, 'land_wind_speed': 9, 'land_wind_direction': 70}
+WEIGHT_BALANCE_SCENARIO = {'seat_config': 0, 'basic_weight': 1450, 'basic_moment': 57, 'usable_fuel': 38,
+                           'pilot': 180, 'front_pax': 160, 'rear_pax_left': 140, 'rear_pax_right': 0,
+                           'cargo_1': 40, 'cargo_2': 10, 'fuel_allowance': 1.1}
+# Modules imported by the cold-start benchmark, by metric name.
+IMPORTS = {'import.performance': 'performance.src.run_performance',
+           'import.weight_balance': 'weight_balance.src.run_weight_balance',
+           'import.wsgi': 'config.wsgi'}
+MEASURE_IMPORT = """
+import sys, time
+start = time.perf_counter()
+import {}
+print(time.perf_counter() - start)
+"""
+
+
+def metric(value, unit, better='lower'):
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def generate_candidates(size, seed=SEED):
+    """Returns size random scenarios as a dict of arrays (see compute_performance_batch).
+
+    The values are within the limits of the input checks, but some
+    combinations (e.g. a low rpm at a high altitude) have no valid power
+    setting or fall outside the performance tables.
+    """
+    rng = np.random.default_rng(seed)
+    scenarios = {}
+    for stage in ('to', 'land'):
+        scenarios[stage + '_heading'] = rng.integers(1, 361, size)
+        scenarios[stage + '_length'] = rng.integers(1000, 5000, size)
+        scenarios[stage + '_condition'] = rng.choice(['p', 'g'], size)
+    for stage in ('to', 'cr', 'land'):
+        scenarios[stage + '_press_alt'] = rng.integers(0, 14201, size)
+        scenarios[stage + '_temp'] = rng.integers(-20, 41, size)
+        scenarios[stage + '_wind_speed'] = rng.integers(0, 36, size)
+        scenarios[stage + '_wind_direction'] = 5*rng.integers(1, 73, size)
+    scenarios['to_weight'] = rng.integers(1397, 2301, size)
+    scenarios['fuel_capacity'] = rng.choice([40, 50], size)
+    scenarios['travel_dist'] = rng.integers(0, 751, size)
+    scenarios['cr_heading'] = rng.integers(1, 361, size)
+    scenarios['cr_power'] = rng.integers(2100, 2651, size)
+    return {field: scenarios[field] for field in run_performance.INPUT_FIELDS}
+
+
+@functools.lru_cache(maxsize=None)
+def get_valid_pool(seed=SEED):
+    """Returns the candidates (see generate_candidates) that compute_performance can solve."""
+    candidates = generate_candidates(POOL_SIZE, seed)
+    errors = run_performance.compute_performance_batch(candidates, on_error='record')['error']
+    rows = np.array([row for (row, error) in enumerate(errors.tolist()) if error is None])
+    return {field: values[rows] for (field, values) in candidates.items()}
+
+
+def generate_scenarios(size, seed=SEED):
+    """Returns size random scenarios that compute_performance can solve, as a dict of arrays.
+
+    The scenarios are drawn from a pool of POOL_SIZE valid scenarios.
+    """
+    pool = get_valid_pool(seed)
+    rows = np.random.default_rng(seed).integers(0, len(pool['to_weight']), size)
+    return {field: values[rows] for (field, values) in pool.items()}
+
+
+def time_calls(function, arguments, repeat):
+    """Returns the seconds spent in each call of function, cycling through arguments."""
+    durations = []
+    for i in range(repeat):
+        argument = arguments[i % len(arguments)]
+        start = time.perf_counter()
+        function(argument)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def latency_metrics(name, durations):
+    durations = sorted(durations)
+    return {name + '.p50': metric(statistics.median(durations)*1e6, 'us'),
+            name + '.p99': metric(durations[int(0.99*(len(durations) - 1))]*1e6, 'us')}
+
+
+def bench_latency(repeat):
+    """Returns the latency of a single scenario."""
+    scenarios = generate_scenarios(1000)
+    valid = [dict(zip(run_performance.INPUT_FIELDS, row)) for row in
+             zip(*(scenarios[field].tolist() for field in run_performance.INPUT_FIELDS))]
+    metrics = {}
+    previous_cache = cache.get_result_cache()
+    try:
+        cache.configure_result_cache(0)
+        metrics.update(latency_metrics('latency.performance', time_calls(
+            lambda scenario: run_performance.compute_performance(dict(scenario)), valid, repeat)))
+        cache.configure_result_cache()
+        run_performance.compute_performance(dict(PERFORMANCE_SCENARIO))
+        metrics.update(latency_metrics('latency.performance_cached', time_calls(
+            lambda scenario: run_performance.compute_performance(dict(scenario)), [PERFORMANCE_SCENARIO], repeat)))
+    finally:
+        cache.configure_result_cache(previous_cache.maxsize, previous_cache.ttl)
+    metrics.update(latency_metrics('latency.weight_balance', time_calls(
+        lambda scenario: run_weight_balance.compute_weight_and_balance(dict(scenario)), [WEIGHT_BALANCE_SCENARIO], repeat)))
+    return metrics
+
+
+def bench_imports(runs):
+    """Returns the cold-start import time of each engine, in a new interpreter."""
+    metrics = {}
+    for (name, module) in IMPORTS.items():
+        durations = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, '-c', MEASURE_IMPORT.format(module)], cwd=CONFIG_DIR,
+                                    capture_output=True, text=True, check=True).stdout
+            durations.append(float(output.split()[-1]))
+        metrics[name] = metric(statistics.median(durations)*1e3, 'ms')
+    return metrics
+
+
+def bench_throughput(sizes):
+    """Returns the throughput of compute_performance_batch for each batch size."""
+    metrics = {}
+    for size in sizes:
+        scenarios = generate_scenarios(size)
+        start = time.perf_counter()
+        run_performance.compute_performance_batch(scenarios, on_error='record')
+        elapsed = time.perf_counter() - start
+        metrics['throughput.batch_{}'.format(size)] = metric(size/elapsed, 'scenarios/s', 'higher')
+    # Batch with invalid scenarios, which are isolated and recorded (see compute_recorded_performance_batch).
+    scenarios = generate_candidates(ERROR_BATCH_SIZE)
+    start = time.perf_counter()
+    run_performance.compute_performance_batch(scenarios, on_error='record')
+    elapsed = time.perf_counter() - start
+    metrics['throughput.batch_{}_with_errors'.format(ERROR_BATCH_SIZE)] = metric(ERROR_BATCH_SIZE/elapsed, 'scenarios/s', 'higher')
+    return metrics
+
+
+def bench_interpolation(repeat):
+    """Returns the time per call of helpers.dataframe_interpolation."""
+    rng = np.random.default_rng(SEED)
+    points = list(zip(rng.integers(0, 12001, 256).tolist(), rng.integers(45, 76, 256).tolist()))
+    metrics = {}
+    for (name, df) in (('array_table', tables.get_array_table('range40')), ('dataframe', tables.get_table('range40'))):
+        helpers.dataframe_interpolation(*points[0], df)
+        durations = time_calls(lambda point: helpers.dataframe_interpolation(point[0], point[1], df), points, repeat)
+        metrics['interpolation.{}'.format(name)] = metric(statistics.median(durations)*1e6, 'us')
+    return metrics
+
+
+def bench_envelope(repeat=5):
+    """Returns the best time of a takeoff and of a cruise envelope."""
+    sweeps = {
+        'envelope.takeoff_100x100x10': functools.partial(
+            envelope.takeoff_envelope, np.linspace(0, 14200, 100).round(), np.linspace(-20, 40, 100).round(),
+            np.linspace(1397, 2300, 10).round()),
+        'envelope.cruise_143x56': functools.partial(
+            envelope.cruise_envelope, np.arange(0, 14201, 100), np.arange(2100, 2651, 10)),
+    }
+    metrics = {}
+    for (name, sweep) in sweeps.items():
+        durations = time_calls(lambda _: sweep(), [None], repeat)
+        metrics[name] = metric(min(durations)*1e3, 'ms')
+    return metrics
+
+
+def bench_memory(size=MEMORY_BATCH_SIZE):
+    """Returns the peak memory of a batch and of the process."""
+    scenarios = generate_scenarios(size)
+    tracemalloc.start()
+    try:
+        run_performance.compute_performance_batch(scenarios, on_error='record')
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    metrics = {'memory.batch_{}_peak'.format(size): metric(peak/2**20, 'MiB')}
+    try:
+        import resource
+    except ImportError:
+        return metrics
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    scale = 1 if sys.platform == 'darwin' else 1024
+    metrics['memory.process_peak_rss'] = metric(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*scale/2**20, 'MiB')
+    return metrics
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=2000, import_runs=5):
+    """Runs every benchmark.
+
+    Args:
+        sizes (list): batch sizes of the throughput benchmark.
+        repeat (int): calls per latency and interpolation benchmark.
+        import_runs (int): new interpreters per import benchmark.
+
+    Returns:
+        results (dict): environment description and metrics by name.
+    """
+    tables.get_array_tables()
+    metrics = {}
+    metrics.update(bench_imports(import_runs))
+    metrics.update(bench_latency(repeat))
+    metrics.update(bench_interpolation(repeat))
+    metrics.update(bench_throughput(sizes))
+    metrics.update(bench_envelope())
+    metrics.update(bench_memory(min(MEMORY_BATCH_SIZE, max(sizes))))
+    return {'version': FORMAT_VERSION, 'python': platform.python_version(), 'numpy': np.__version__,
+            'platform': platform.platform(), 'metrics': metrics}
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compares the metrics with those of a baseline run.
+
+    Args:
+        results (dict): output of run_benchmarks.
+        baseline (dict): output of a previous run.
+        threshold (float): allowed degradation, as a fraction of the baseline value.
+
+    Returns:
+        regressions (list): description of every metric worse than the baseline by more than threshold.
+    """
+    regressions = []
+    for (name, current) in results['metrics'].items():
+        previous = baseline.get('metrics', {}).get(name)
+        if previous is None or previous['value'] <= 0:
+            continue
+        change = current['value']/previous['value'] - 1
+        if current['better'] == 'higher':
+            change = -change
+        if change > threshold:
+            regressions.append('{}: {:.4g} {} (baseline {:.4g}, {:+.0%} worse)'.format(
+                name, current['value'], current['unit'], previous['value'], change))
+    return regressions
+
+
+def format_results(results):
+    """Returns the metrics of run_benchmarks as printable text."""
+    return '\n'.join('{:<36} {:>14.4g} {}'.format(name, values['value'], values['unit'])
+                     for (name, values) in results['metrics'].items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the performance and weight and balance engines.')
+    parser.add_argument('--output', help='JSON results file')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed degradation as a fraction of the baseline (default: 0.2)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='batch sizes')
+    parser.add_argument('--repeat', type=int, default=2000, help='calls per latency benchmark')
+    parser.add_argument('--import-runs', type=int, default=5, help='interpreters per import benchmark')
+    args = parser.parse_args(argv)
+    results = run_benchmarks(args.sizes, args.repeat, args.import_runs)
+    print(format_results(results))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = find_regressions(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Cessna 172N Calculators
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    executor.py
+
+DESCRIPTION:
+    This module runs the computations of the async views of the
+    performance and weight and balance apps in bounded pools of worker
+    threads, so the event loop of an ASGI process is never blocked by
+    compute_performance or compute_weight_and_balance.
+
+    The pool accepts at most max_workers running computations plus
+    max_queued waiting ones. When every slot is taken, submit() raises an
+    ExecutorSaturated error immediately instead of queueing the work, and
+    the views answer 503. A slot is released when its computation ends,
+    even if the request that submitted it has timed out, because a running
+    thread cannot be interrupted: the slots always bound the work in
+    progress.
+
+    Each app has its own process-wide executor, identified by the app
+    name. It is configured at startup from the settings of the app (see
+    the apps.py of each app) with configure_executor(), and returned by
+    get_executor().
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUED = 16
+DEFAULT_TIMEOUT = 10.0
+
+
+class ExecutorSaturated(Exception):
+    """Raised when every slot of a BoundedExecutor is taken."""
+
+
+class BoundedExecutor:
+    """Thread pool that rejects the work it cannot start or queue.
+
+    Args:
+        max_workers (int): number of worker threads.
+        max_queued (int): number of computations that can wait for a worker.
+        name (str): prefix of the names of the worker threads.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_queued=DEFAULT_QUEUED, name='compute'):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.capacity = max_workers + max_queued
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def acquire(self):
+        """Takes a slot, or raises ExecutorSaturated if there is none left."""
+        with self._lock:
+            if self._active >= self.capacity:
+                self._rejected += 1
+                raise ExecutorSaturated('The {} computation slots are taken.'.format(self.capacity))
+            self._active += 1
+
+    def release(self, future=None):
+        with self._lock:
+            self._active -= 1
+            self._completed += 1
+
+    def submit(self, function, *args):
+        """Runs function(*args) in a worker thread.
+
+        Returns:
+            future (concurrent.futures.Future): result of the computation.
+
+        Raises:
+            ExecutorSaturated: if every slot is taken.
+        """
+        self.acquire()
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self.release()
+            raise
+        future.add_done_callback(self.release)
+        return future
+
+    async def run(self, function, *args, timeout=DEFAULT_TIMEOUT):
+        """Returns the result of function(*args), computed in a worker thread.
+
+        Raises:
+            ExecutorSaturated: if every slot is taken.
+            TimeoutError: if the result is not available after timeout
+                seconds (None waits forever). The computation is cancelled if
+                it has not started yet.
+        """
+        return await self.wait(self.submit(function, *args), timeout)
+
+    async def wait(self, future, timeout=DEFAULT_TIMEOUT, shared=False):
+        """Returns the result of a future of submit().
+
+        Args:
+            future (concurrent.futures.Future): computation to wait for.
+            timeout (float): seconds to wait (None waits forever).
+            shared (bool): True if other requests wait for the same future
+                (see coalesce.py), in which case it is never cancelled.
+
+        Raises:
+            TimeoutError: if the result is not available after timeout seconds.
+        """
+        waiter = asyncio.wrap_future(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter) if shared else waiter, timeout)
+        except TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise
+
+    async def iterate(self, iterator, timeout=DEFAULT_TIMEOUT):
+        """Yields the items of a blocking iterator, computing each one in a worker thread.
+
+        A single slot is taken for the whole iteration, so a long stream
+        does not compete for slots with itself. The slot is taken when the
+        first item is requested, so check is_saturated() before starting a
+        response.
+
+        Raises:
+            ExecutorSaturated: if every slot is taken when the iteration starts.
+            TimeoutError: if an item is not available after timeout seconds.
+        """
+        self.acquire()
+        future = None
+        try:
+            while True:
+                future = self._executor.submit(next, iterator, StopIteration)
+                item = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+                if item is StopIteration:
+                    return
+                yield item
+        finally:
+            if future is not None and not future.done():
+                # Keep the slot until the running item is finished.
+                future.add_done_callback(self.release)
+            else:
+                self.release()
+
+    def is_saturated(self):
+        with self._lock:
+            return self._active >= self.capacity
+
+    def stats(self):
+        with self._lock:
+            return {'workers': self.max_workers, 'capacity': self.capacity, 'active': self._active,
+                    'completed': self._completed, 'rejected': self._rejected, 'timeouts': self._timeouts}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Executor and per-request timeout of each app.
+_executors = {}
+_timeouts = {}
+
+
+def configure_executor(name, max_workers=DEFAULT_WORKERS, max_queued=DEFAULT_QUEUED, timeout=DEFAULT_TIMEOUT):
+    """Replaces the process-wide executor of an app with a new one and sets its per-request timeout."""
+    if name in _executors:
+        _executors[name].shutdown(wait=False)
+    _executors[name] = BoundedExecutor(max_workers, max_queued, name)
+    _timeouts[name] = timeout
+    return _executors[name]
+
+
+def get_executor(name):
+    """Returns the process-wide executor used by the async views of an app."""
+    if name not in _executors:
+        configure_executor(name)
+    return _executors[name]
+
+
+def get_timeout(name):
+    """Returns the per-request timeout of an app in seconds (None waits forever)."""
+    return _timeouts.get(name, DEFAULT_TIMEOUT)
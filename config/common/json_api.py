@@ -0,0 +1,110 @@
+"""
+Cessna 172N Calculators
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    json_api.py
+
+DESCRIPTION:
+    This module contains the parts of the JSON bulk endpoints shared by the
+    performance and weight and balance apps (performance/api and
+    weight_balance/api).
+
+    The endpoints are not public: each request must come from an
+    authenticated session, with its CSRF token, or carry one of the
+    JSON_API_TOKENS of the settings in an "Authorization: Bearer <token>"
+    header. Otherwise the response is 401.
+
+    The body of a request is a JSON array of scenarios. Requests bigger
+    than JSON_API_MAX_BODY_SIZE bytes or with more than
+    JSON_API_MAX_SCENARIOS scenarios are rejected with a 413 response, and
+    malformed ones with a 400 response. The response is a JSON array,
+    streamed as the scenarios are computed.
+"""
+
+import functools
+import hmac
+import json
+from django.conf import settings
+from django.http import JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+
+
+def read_token(request):
+    """Returns the bearer token of a request, or None."""
+    scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    return token.strip() if scheme.lower() == 'bearer' and token.strip() else None
+
+
+def is_valid_token(token):
+    """Returns True if the token is one of the JSON_API_TOKENS of the settings."""
+    tokens = getattr(settings, 'JSON_API_TOKENS', ())
+    return any(hmac.compare_digest(token.encode(), valid_token.encode()) for valid_token in tokens)
+
+
+def require_api_access(view):
+    """Decorates an endpoint that is only available to sessions and API tokens.
+
+    The view must be csrf_exempt: requests with a token do not have a CSRF
+    token, so the CSRF token is only checked for the session requests.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = read_token(request)
+        if token is not None:
+            if not is_valid_token(token):
+                return JsonResponse({'error': 'The API token is not valid.'}, status=401)
+        elif request.user.is_authenticated:
+            rejection = CsrfViewMiddleware(view).process_view(request, None, (), {})
+            if rejection is not None:
+                return rejection
+        else:
+            return JsonResponse({'error': 'Authentication required.'}, status=401,
+                                headers={'WWW-Authenticate': 'Bearer'})
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def read_json_scenarios(request):
+    """Returns the scenarios of a JSON API request, or an error response.
+
+    Args:
+        request: POST request whose body is a JSON array of scenarios.
+
+    Returns:
+        scenarios (list): the scenarios, or None if the request is invalid.
+        response: error response (400 or 413), or None if the request is valid.
+    """
+    max_body_size = getattr(settings, 'JSON_API_MAX_BODY_SIZE', 10*1024*1024)
+    max_scenarios = getattr(settings, 'JSON_API_MAX_SCENARIOS', 10000)
+    content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    if content_length > max_body_size:
+        return None, JsonResponse({'error': 'The request is bigger than {} bytes.'.format(max_body_size)}, status=413)
+    body = request.read(max_body_size + 1)
+    if len(body) > max_body_size:
+        return None, JsonResponse({'error': 'The request is bigger than {} bytes.'.format(max_body_size)}, status=413)
+    try:
+        scenarios = json.loads(body)
+    except ValueError:
+        return None, JsonResponse({'error': 'The request is not valid JSON.'}, status=400)
+    if not isinstance(scenarios, list) or not all(isinstance(scenario, dict) for scenario in scenarios):
+        return None, JsonResponse({'error': 'The request must be an array of objects.'}, status=400)
+    if len(scenarios) > max_scenarios:
+        return None, JsonResponse({'error': 'The request has more than {} scenarios.'.format(max_scenarios)}, status=413)
+    return scenarios, None
+
+
+def to_json(value):
+    """Converts the numpy values of the results to JSON values."""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError('{} is not JSON serializable'.format(type(value).__name__))
+
+
+def iter_json_results(scenarios, compute_scenario):
+    """Yields a JSON array with the result of each scenario, one item at a time."""
+    yield '['
+    for (i, scenario) in enumerate(scenarios):
+        yield (',' if i else '') + json.dumps(compute_scenario(scenario), default=to_json)
+    yield ']'
@@ -0,0 +1,150 @@
+"""
+Cessna 172N Calculators
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    rules.py
+
+DESCRIPTION:
+    This module checks input values against declarative rules. It is shared
+    by the performance and weight and balance calculators, whose schema.py
+    modules only declare the rule of each of their input fields.
+
+    Every input field has a Rule with the following attributes:
+
+    > label: name of the value in the error messages, e.g. 'Takeoff weight'.
+    > description: what a valid value is, e.g. 'The weight must be between
+      1397 and 2300 pounds'.
+    > kind: 'int' (any value accepted by int()), 'float' (any value
+      accepted by float()) or 'str'.
+    > min_value, max_value: inclusive limits, or None.
+    > choices: allowed values, or None. The 'str' values are compared in
+      lower case.
+    > step: the value must be a multiple of step, or None.
+    > negative: if True, negative values get a specific error message.
+
+    find_error() checks a single value and returns its error message, and
+    validate_columns() checks whole columns of scenarios with array
+    comparisons and returns a per-row error mask and the error message of
+    each invalid row.
+"""
+
+from collections import namedtuple
+import math
+import numpy as np
+
+Rule = namedtuple('Rule', ['label', 'description', 'kind', 'min_value', 'max_value', 'choices', 'step', 'negative'],
+                  defaults=['int', None, None, None, None, False])
+
+# Error messages.
+MSG_ERROR_INVALID_VALUE = 'ERROR: invalid value.'
+MSG_ERROR_NEGATIVE_VALUE = "ERROR: the value can't be negative."
+
+
+def format_message(rule, message):
+    """Returns the error message of rule, e.g. 'Takeoff weight | ERROR: invalid value.'."""
+    return '{} | {}'.format(rule.label, message)
+
+
+def parse_value(rule, value):
+    """Returns value as a number (or a lower case string), or None if it has the wrong type."""
+    if rule.kind == 'str':
+        return value.lower() if isinstance(value, str) else None
+    convert = int if rule.kind == 'int' else float
+    try:
+        number = convert(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return number if isinstance(value, str) else value
+
+
+def find_error(rule, value):
+    """Returns the error message (without the label) of value, or None if it is valid."""
+    value = parse_value(rule, value)
+    if value is None:
+        return MSG_ERROR_INVALID_VALUE
+    if rule.kind != 'str':
+        if rule.negative and value < 0:
+            return MSG_ERROR_NEGATIVE_VALUE
+        if ((rule.min_value is not None and value < rule.min_value) or (rule.max_value is not None and value > rule.max_value)
+                or (rule.step is not None and value % rule.step != 0)):
+            return 'ERROR: {}.'.format(rule.description)
+    if rule.choices is not None and value not in rule.choices:
+        return 'ERROR: {}.'.format(rule.description)
+    return None
+
+
+def parse_column(rule, values):
+    """Array version of parse_value.
+
+    Returns:
+        values (array): numbers (or lower case strings), with a placeholder
+            for the values of the wrong type.
+        valid (array): False for the values of the wrong type.
+    """
+    values = np.asarray(values)
+    if rule.kind != 'str' and values.dtype.kind in 'biu':
+        return values, np.ones(len(values), dtype=bool)
+    if rule.kind != 'str' and values.dtype.kind == 'f':
+        valid = np.isfinite(values)
+        return np.where(valid, values, 0), valid
+    if rule.kind == 'str' and values.dtype.kind == 'U':
+        return np.char.lower(values), np.ones(len(values), dtype=bool)
+    # Mixed or unexpected types, parsed one at a time.
+    parsed = [parse_value(rule, value) for value in values.tolist()]
+    valid = np.array([value is not None for value in parsed], dtype=bool)
+    placeholder = '' if rule.kind == 'str' else 0
+    return np.array([placeholder if value is None else value for value in parsed]), valid
+
+
+def find_column_errors(rule, values):
+    """Array version of find_error.
+
+    Returns:
+        errors (list): (mask, message) pairs in checking order, where mask
+            is True for the values that get message.
+    """
+    values, valid = parse_column(rule, values)
+    errors = [(~valid, MSG_ERROR_INVALID_VALUE)]
+    out_of_limits = np.zeros(len(values), dtype=bool)
+    if rule.kind != 'str':
+        if rule.negative:
+            errors.append((valid & (values < 0), MSG_ERROR_NEGATIVE_VALUE))
+        if rule.min_value is not None:
+            out_of_limits |= values < rule.min_value
+        if rule.max_value is not None:
+            out_of_limits |= values > rule.max_value
+        if rule.step is not None:
+            out_of_limits |= values % rule.step != 0
+    if rule.choices is not None:
+        out_of_limits |= ~np.isin(values, rule.choices)
+    errors.append((valid & out_of_limits, 'ERROR: {}.'.format(rule.description)))
+    return errors
+
+
+def validate_columns(columns, schema):
+    """Validates whole columns of scenarios at once.
+
+    Args:
+        columns: dataframe or dict of arrays with the fields of the schema,
+            one element per scenario.
+        schema (dict): rule of each field, in checking order.
+
+    Returns:
+        invalid (array): True for the scenarios with invalid data.
+        messages (array): error message of the first invalid field of each
+            scenario, or None for valid scenarios.
+    """
+    size = len(columns[next(iter(schema))])
+    invalid = np.zeros(size, dtype=bool)
+    messages = np.full(size, None, dtype=object)
+    for (field, rule) in schema.items():
+        for (mask, message) in find_column_errors(rule, columns[field]):
+            mask = mask & ~invalid
+            if mask.any():
+                messages[mask] = format_message(rule, message)
+                invalid |= mask
+    return invalid, messages
@@ -130,3 +130,41 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Performance results cache (see performance/src/cache.py). Size 0 disables it
+# and a TTL of None keeps the results until they are evicted.
+
+PERFORMANCE_RESULT_CACHE_SIZE = 1024
+PERFORMANCE_RESULT_CACHE_TTL = None
+
+# JSON bulk endpoints (performance/api and weight_balance/api, see
+# common/json_api.py). Bigger requests are rejected with a 413 response. The
+# endpoints are available to authenticated sessions and to the requests with
+# an "Authorization: Bearer <token>" header of one of the tokens.
+
+JSON_API_MAX_BODY_SIZE = 10 * 1024 * 1024
+JSON_API_MAX_SCENARIOS = 10000
+JSON_API_TOKENS = [token for token in os.environ.get('JSON_API_TOKENS', '').split(',') if token]
+
+# Per-stage timing of the performance computations (see
+# performance/src/instrumentation.py and the performance_stats command). A
+# fraction of the computations can also be profiled with 'cprofile' or
+# 'tracemalloc'.
+
+PERFORMANCE_INSTRUMENTATION = False
+PERFORMANCE_PROFILE_SAMPLE_RATE = 0.0
+PERFORMANCE_PROFILER = None
+
+# Async views (performance/async and weight_balance/async, see
+# common/executor.py). The computations of each app run in a pool of worker
+# threads with a bounded number of waiting computations; the requests beyond
+# that get a 503 response, and those that take longer than the timeout (in
+# seconds) a 504 response.
+
+COMPUTE_EXECUTOR_WORKERS = 4
+COMPUTE_EXECUTOR_QUEUED = 16
+COMPUTE_TIMEOUT = 10
+
+WEIGHT_BALANCE_EXECUTOR_WORKERS = 4
+WEIGHT_BALANCE_EXECUTOR_QUEUED = 16
+WEIGHT_BALANCE_TIMEOUT = 10
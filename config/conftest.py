@@ -0,0 +1,13 @@
+import os
+import sys
+import django
+
+# pytest imports this folder as the "config" package, which hides the project
+# package config/ (settings and urls) used by manage.py. The project modules
+# are found in both.
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, here)
+if 'config' in sys.modules:
+    sys.modules['config'].__path__.append(os.path.join(here, 'config'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
@@ -1,6 +1,23 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PerformanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'performance'
+
+    def ready(self):
+        from common import executor
+        from .src import cache
+        from .src import instrumentation
+        from .src import precompute
+        cache.configure_result_cache(getattr(settings, 'PERFORMANCE_RESULT_CACHE_SIZE', cache.DEFAULT_MAXSIZE),
+                                     getattr(settings, 'PERFORMANCE_RESULT_CACHE_TTL', None))
+        executor.configure_executor(self.name, getattr(settings, 'COMPUTE_EXECUTOR_WORKERS', executor.DEFAULT_WORKERS),
+                                    getattr(settings, 'COMPUTE_EXECUTOR_QUEUED', executor.DEFAULT_QUEUED),
+                                    getattr(settings, 'COMPUTE_TIMEOUT', executor.DEFAULT_TIMEOUT))
+        # Use the precomputed takeoff and landing distances, if they are up to date.
+        precompute.install()
+        if getattr(settings, 'PERFORMANCE_INSTRUMENTATION', False):
+            instrumentation.enable(getattr(settings, 'PERFORMANCE_PROFILE_SAMPLE_RATE', 0.0),
+                                   getattr(settings, 'PERFORMANCE_PROFILER', None))
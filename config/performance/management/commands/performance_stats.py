@@ -0,0 +1,78 @@
+# Imports.
+import io
+import json
+import pstats
+from django.core.management.base import BaseCommand, CommandError
+from ...src import cache
+from ...src.errors import PerformanceError
+from ...src import instrumentation
+from ...src import run_performance
+from ...src import runner
+
+TOP_ENTRIES = 20
+
+
+class Command(BaseCommand):
+    help = ('Computes the scenarios of a .csv or .jsonl file with compute_performance and prints the wall time '
+            'of each stage. A fraction of the scenarios can be profiled with cProfile or tracemalloc.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', help='scenarios file (.csv or .jsonl)')
+        parser.add_argument('--repeat', type=int, default=1, help='number of times each scenario is computed')
+        parser.add_argument('--no-cache', action='store_true', help='disable the result cache')
+        parser.add_argument('--batch', action='store_true', help='also compute the scenarios with compute_performance_batch')
+        parser.add_argument('--sample-rate', type=float, default=0.0, help='fraction of the computations that are profiled')
+        parser.add_argument('--profiler', choices=sorted(instrumentation.PROFILERS), default='cprofile')
+        parser.add_argument('--json', action='store_true', help='print the statistics as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['scenarios'], newline='') as file:
+                scenarios = list(runner.read_scenarios(file, runner.detect_format(options['scenarios'])))
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+        if options['no_cache']:
+            cache.configure_result_cache(0)
+
+        was_enabled = instrumentation.is_enabled()
+        instrumentation.reset()
+        instrumentation.enable(options['sample_rate'], options['profiler'])
+        errors = 0
+        try:
+            for _ in range(options['repeat']):
+                for scenario in scenarios:
+                    try:
+                        run_performance.compute_performance(runner.get_input_data(scenario))
+                    except PerformanceError:
+                        errors += 1
+                if options['batch'] and scenarios:
+                    inputs = [runner.get_input_data(scenario) for scenario in scenarios]
+                    columns = {field: [input_data[field] for input_data in inputs] for field in run_performance.INPUT_FIELDS}
+                    run_performance.compute_performance_batch(columns, on_error='record')
+        finally:
+            if not was_enabled:
+                instrumentation.disable()
+        stats = instrumentation.get_stats()
+        profiles = instrumentation.get_profiles()
+
+        if options['json']:
+            self.stdout.write(json.dumps({'scenarios': len(scenarios), 'errors': errors, 'stages': stats,
+                                          'profiles': len(profiles)}, indent=2))
+            return
+        self.stdout.write('Scenarios: {} x {} ({} errors)'.format(len(scenarios), options['repeat'], errors))
+        self.stdout.write(instrumentation.format_stats(stats))
+        if profiles:
+            self.stdout.write('\n{} profiled computations:'.format(len(profiles)))
+            self.stdout.write(self.format_profiles(profiles, options['profiler']))
+
+    def format_profiles(self, profiles, profiler):
+        """Returns the aggregated profiles as printable text."""
+        if profiler == 'tracemalloc':
+            lines = ['Peak traced memory: {:.1f} KiB'.format(max(profile['peak'] for profile in profiles)/1024)]
+            top = profiles[-1]['snapshot'].statistics('lineno')[:TOP_ENTRIES]
+            lines.extend(str(statistic) for statistic in top)
+            return '\n'.join(lines)
+        stream = io.StringIO()
+        stats = pstats.Stats(*profiles, stream=stream)
+        stats.sort_stats('cumulative').print_stats(TOP_ENTRIES)
+        return stream.getvalue()
@@ -0,0 +1,148 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    bundle.py
+
+DESCRIPTION:
+    This module stores the performance tables in a single binary file.
+
+    Parsing the .csv files is slow compared to the size of the tables, so
+    the tables can be compiled into a bundle (see precompute.py) that is
+    opened with mmap. The columns are read-only arrays that view the mapped
+    file, hence every process that opens the bundle shares the same memory
+    pages. This module only depends on numpy.
+    The bundle has the following layout:
+
+    > magic (8 bytes): b'C172PERF'.
+    > version (4 bytes): format version, little-endian.
+    > header size (4 bytes): size of the header, little-endian.
+    > header: JSON document with the SHA-256 checksum of the payload, the
+      SHA-256 digest of the source .csv files, and the index, columns,
+      dtypes and payload offsets of every table.
+    > payload: the column arrays, aligned to 8 bytes.
+
+    read_bundle() raises a BundleError if the file is not a valid bundle
+    (including a header that is not a valid layout), if the payload does not match the checksum, or if the source files
+    have changed since the bundle was compiled.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+from pathlib import Path
+import numpy as np
+
+MAGIC = b'C172PERF'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<8sII')
+ALIGNMENT = 8
+
+
+class BundleError(Exception):
+    """Raised when a table bundle cannot be used."""
+
+
+def align(size):
+    """Returns the smallest multiple of ALIGNMENT not lower than size."""
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def compute_source_digest(paths):
+    """Returns the SHA-256 digest of the given files, ignoring missing ones."""
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def write_bundle(path, tables, source_digest):
+    """Writes the tables to a bundle.
+
+    Args:
+        path: output bundle file.
+        tables (dict): performance ArrayTables (see tables.py) by table name.
+        source_digest (str): digest of the .csv files the tables come from.
+
+    Returns:
+        path: the output file.
+    """
+    arrays = []
+    layout = {}
+    offset = 0
+    for (name, table) in tables.items():
+        columns = []
+        # The first column is the index, unnamed for the default 0..n-1 index.
+        for (label, values) in [(table.index_name, table.index)] + [(column, table[column]) for column in table.columns]:
+            values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+            columns.append([label, values.dtype.str, offset, len(values)])
+            arrays.append((offset, values))
+            offset = align(offset + values.nbytes)
+        layout[name] = {'columns': columns}
+    payload = bytearray(offset)
+    for (start, values) in arrays:
+        payload[start:start + values.nbytes] = values.tobytes()
+    header = json.dumps({'checksum': hashlib.sha256(payload).hexdigest(), 'source_digest': source_digest,
+                         'tables': layout}).encode()
+    header += b' ' * (align(PREAMBLE.size + len(header)) - PREAMBLE.size - len(header))
+    with open(path, 'wb') as file:
+        file.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        file.write(header)
+        file.write(payload)
+    return path
+
+
+def read_bundle(path, source_digest=None):
+    """Returns the arrays of the tables stored in a bundle.
+
+    The arrays are read-only views of the mapped file.
+
+    Args:
+        path: bundle file.
+        source_digest (str): digest of the current .csv files, or None to
+            skip the check.
+
+    Returns:
+        tables (dict): (index name, index array, column arrays by name) by
+            table name.
+    """
+    try:
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as error:
+        raise BundleError('{}: {}'.format(path, error))
+    if len(buffer) < PREAMBLE.size:
+        raise BundleError('{} is not a table bundle.'.format(path))
+    magic, version, header_size = PREAMBLE.unpack_from(buffer)
+    if magic != MAGIC:
+        raise BundleError('{} is not a table bundle.'.format(path))
+    if version != FORMAT_VERSION:
+        raise BundleError('{} has version {}, expected {}.'.format(path, version, FORMAT_VERSION))
+    # The checksum only covers the payload, so a corrupted header is detected when it is parsed.
+    try:
+        header = json.loads(buffer[PREAMBLE.size:PREAMBLE.size + header_size].decode())
+        checksum, header_digest, layouts = header['checksum'], header['source_digest'], header['tables']
+    except (UnicodeDecodeError, ValueError, KeyError, TypeError) as error:
+        raise BundleError('{} has an invalid header: {!r}'.format(path, error))
+    payload_start = PREAMBLE.size + header_size
+    if hashlib.sha256(memoryview(buffer)[payload_start:]).hexdigest() != checksum:
+        raise BundleError('{} is corrupted.'.format(path))
+    if source_digest is not None and header_digest != source_digest:
+        raise BundleError('{} is out of date.'.format(path))
+    tables = {}
+    try:
+        for (name, layout) in layouts.items():
+            columns = {}
+            for (label, dtype, offset, length) in layout['columns']:
+                columns[label] = np.frombuffer(buffer, dtype=np.dtype(dtype), count=length, offset=payload_start + offset)
+            index_label = layout['columns'][0][0]
+            tables[name] = (index_label, columns.pop(index_label), columns)
+    except (ValueError, KeyError, TypeError, IndexError, AttributeError) as error:
+        raise BundleError('{} has an invalid header: {!r}'.format(path, error))
+    return tables
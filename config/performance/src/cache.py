@@ -0,0 +1,104 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    cache.py
+
+DESCRIPTION:
+    This module stores the results of the most recent scenarios.
+
+    Many different user inputs are approximated to the same valid table
+    values (see data.py), so once the input data has been validated and
+    the wind components have been computed, different scenarios often
+    lead to the same performance results. compute_performance uses a
+    ResultCache keyed on those values to skip the takeoff, cruise, fuel
+    and landing computations for repeated scenarios.
+
+    The cache keeps at most maxsize results and discards the least
+    recently used one when it is full. Optionally, results older than ttl
+    seconds are discarded. The number of hits, misses and evictions can be
+    obtained with ResultCache.stats().
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+
+
+class ResultCache:
+    """Thread-safe LRU cache with an optional time to live.
+
+    Args:
+        maxsize (int): maximum number of results. 0 disables the cache.
+        ttl (float): seconds after which a result expires, or None.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Returns the result stored for key, or None."""
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._results[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, result):
+        """Stores the result for key, evicting the least recently used one if needed."""
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            self._results[key] = (time.monotonic(), result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+                self.evictions += 1
+        return None
+
+    def clear(self):
+        """Removes every result and resets the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+        return None
+
+    def stats(self):
+        """Returns the cache size and the hit, miss and eviction counters."""
+        with self._lock:
+            return {'size': len(self._results), 'maxsize': self.maxsize, 'ttl': self.ttl,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+_result_cache = ResultCache()
+
+
+def get_result_cache():
+    """Returns the process-wide cache used by compute_performance."""
+    return _result_cache
+
+
+def configure_result_cache(maxsize=DEFAULT_MAXSIZE, ttl=None):
+    """Replaces the process-wide cache with an empty one of the given size and ttl."""
+    global _result_cache
+    _result_cache = ResultCache(maxsize, ttl)
+    return _result_cache
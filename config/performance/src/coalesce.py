@@ -0,0 +1,145 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    coalesce.py
+
+DESCRIPTION:
+    This module merges identical computations that are in flight at the
+    same time (single-flight).
+
+    Many users submit the same scenario within seconds of each other (e.g.
+    the pilots of a morning briefing at the same airport). The first
+    request for a scenario computes it, and the requests for the same
+    scenario that arrive before it ends wait for that computation and
+    share its result (or its error) instead of starting their own. The
+    result cache (see cache.py) takes over once the computation has ended.
+
+    The scenarios are identified by their canonical input (see
+    canonical_key): the exact value and type of every input field, as
+    compute_performance receives them, so e.g. 'G' and 'g' or '15' and 15
+    are different scenarios. Scenarios with invalid values are never
+    merged.
+
+    Both view paths use the process-wide SingleFlight:
+
+    > sync views: compute_performance() runs the computation in the
+      calling thread, or waits for the thread that is already running it.
+    > async views: SingleFlight.submit() returns the future of the
+      computation in flight, or submits a new one to the executor (see
+      common/executor.py), so waiting requests do not take executor slots.
+
+    The number of computations (leaders) and of requests that joined a
+    computation in flight (coalesced) can be obtained with
+    SingleFlight.stats().
+"""
+
+import threading
+from concurrent.futures import Future
+from common.rules import parse_value
+from . import run_performance
+from . import schema
+
+
+class SingleFlight:
+    """Thread-safe registry of the computations in flight, by key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def call(self, key, function, *args):
+        """Returns function(*args), or the result of the call in flight with the same key.
+
+        A None key is never merged.
+        """
+        if key is None:
+            return function(*args)
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result = function(*args)
+        except BaseException as error:
+            self.forget(key, future)
+            future.set_exception(error)
+            raise
+        self.forget(key, future)
+        future.set_result(result)
+        return result
+
+    def submit(self, key, submit, *args):
+        """Returns the future of the call in flight with the same key, or submit(*args).
+
+        Args:
+            key: canonical key of the call, or None to never merge it.
+            submit: function that starts the call and returns its future
+                (e.g. BoundedExecutor.submit).
+        """
+        if key is None:
+            return submit(*args)
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._calls[key] = submit(*args)
+            self.leaders += 1
+        future.add_done_callback(lambda done: self.forget(key, done))
+        return future
+
+    def forget(self, key, future):
+        """Removes the call of key, if future is still the call in flight."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def stats(self):
+        """Returns the number of calls in flight, of leaders and of coalesced calls."""
+        with self._lock:
+            return {'in_flight': len(self._calls), 'leaders': self.leaders, 'coalesced': self.coalesced}
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight():
+    """Returns the process-wide SingleFlight used by the views."""
+    return _single_flight
+
+
+def canonical_key(input_data):
+    """Returns the canonical input of a scenario, or None if it has missing or invalid values.
+
+    The key holds the exact values (and types) that compute_performance
+    receives, e.g. 'G' and 'g' are different runway conditions for it, so
+    only identical scenarios are merged.
+    """
+    key = []
+    for (field, rule) in schema.SCHEMA.items():
+        value = input_data.get(field)
+        if parse_value(rule, value) is None:
+            return None
+        key.append((type(value), value))
+    try:
+        hash(tuple(key))
+    except TypeError:
+        return None
+    return tuple(key)
+
+
+def compute_performance(input_data):
+    """Returns the results of compute_performance, sharing the computation
+    with the concurrent calls for the same scenario."""
+    return dict(_single_flight.call(canonical_key(input_data), run_performance.compute_performance, input_data))
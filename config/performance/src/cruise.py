@@ -5,8 +5,12 @@ GitHub: luisrnandezc
 Date: 13/09/2023
 """
 
-import sys
-from. import helpers
+import numpy as np
+from . import helpers
+from . import interpolation
+from . import power_index
+from . import tables
+from .errors import PowerSettingError
 
 
 def compute_standard_temperature_difference(press_alt, temp):
@@ -38,11 +42,14 @@ def compute_standard_temperature_difference(press_alt, temp):
 
 
 def check_for_invalid_data(power_press_alt, rpm):
-    """Checks for invalid combinations of RPM and Pressure Altitude"""
+    """Checks for invalid combinations of RPM and Pressure Altitude.
+
+    Raises a PowerSettingError if the combination is invalid.
+    """
     invalid_combinations = [(2000, 2500), (4000, 2550), (6000, 2600), (8000, 2650)]
     data = (power_press_alt, rpm)
     if data in invalid_combinations:
-        sys.exit('ERROR: las RPM seleccionadas exceden el valor máximo para la altitud de crucero.')
+        raise PowerSettingError('ERROR: las RPM seleccionadas exceden el valor máximo para la altitud de crucero.')
     return None
 
 
@@ -60,10 +67,8 @@ def compute_cruise_power_setting(power_df, press_alt, rpm, std_temp_difference):
         velocity (int): cruise velocity in knots.
         fuel_flow (float): cruise fuel flow in gph.
     """
-    power_df = power_df[(power_df['press_alt'] == press_alt) & (power_df['rpm'] == rpm)]
-    power = int(power_df.iloc[0][std_temp_difference + '_bhp'])
-    velocity = int(power_df.iloc[0][std_temp_difference + '_ktas'])
-    fuel_flow = power_df.iloc[0][std_temp_difference + '_gph']
+    index = tables.get_compiled(power_df, power_index.compile_power_index)
+    power, velocity, fuel_flow = power_index.lookup_power_setting(index, press_alt, rpm, std_temp_difference)
     return power, velocity, fuel_flow
 
 
@@ -78,10 +83,7 @@ def compute_endurance(press_alt, power, df):
     Returns:
         endurance (float): aircraft flight endurance in hours.
     """
-    try:
-        endurance = df.loc[press_alt][str(power)]
-    except KeyError:
-        endurance = helpers.dataframe_interpolation(press_alt, power, df)
+    endurance = helpers.dataframe_interpolation(press_alt, power, df)
     return round(endurance, 1)
 
 
@@ -96,10 +98,7 @@ def compute_range(press_alt, power, df):
     Returns:
         rang (float): aircraft flight range in nautical miles.
     """
-    try:
-        rang = df.loc[press_alt][str(power)]
-    except KeyError:
-        rang = helpers.dataframe_interpolation(press_alt, power, df)
+    rang = helpers.dataframe_interpolation(press_alt, power, df)
     return round(rang, 0)
 
 
@@ -145,3 +144,65 @@ def compute_cruise_performance(input_data, power_df, range_df, endurance_df):
     wind_direction = input_data['cr_wind_direction']
     max_range = range_wind_correction(wind_speed, wind_direction, max_endurance, max_range)
     return max_endurance, max_range, ktas, fuel_flow
+
+
+def compute_standard_temperature_difference_batch(press_alt, temp):
+    """Array version of compute_standard_temperature_difference."""
+    std_temp = helpers.round_array(-0.002*press_alt + 15, 0).astype(np.int64)
+    delta_temp = temp - std_temp
+    std_temp_diff = np.where(delta_temp < -10, 'isa_m20', np.where(delta_temp > 5, 'isa_p20', 'isa'))
+    return std_temp_diff
+
+
+def compute_endurance_batch(press_alt, power, df):
+    """Array version of compute_endurance."""
+    grid = tables.get_compiled(df, interpolation.compile_table_grid)
+    return np.round(interpolation.interpolate(grid, press_alt, power), 1)
+
+
+def compute_range_batch(press_alt, power, df):
+    """Array version of compute_range."""
+    grid = tables.get_compiled(df, interpolation.compile_table_grid)
+    return np.round(interpolation.interpolate(grid, press_alt, power), 0)
+
+
+def range_wind_correction_batch(headwind, endurance, max_range):
+    """Array version of range_wind_correction, with the signed headwind component (see wind.py)."""
+    corr = endurance*np.abs(headwind)
+    corrected_range = np.round(np.where(headwind < 0, max_range + corr, max_range - corr), 0)
+    return np.where(headwind != 0, corrected_range, max_range)
+
+
+def compute_cruise_performance_batch(input_data, power_df, range_dfs, endurance_dfs):
+    """Array version of compute_cruise_performance.
+
+    The range and endurance tables are selected for each scenario by its
+    fuel capacity, so they are given as dictionaries keyed by capacity
+    (e.g. {40: range40_df, 50: range50_df}).
+    """
+    press_alt_500 = input_data['cr_press_alt_500']
+    press_alt_1000 = input_data['cr_press_alt_1000']
+    temp = input_data['cr_temp']
+    capacity = np.where(input_data['fuel_capacity'] == 40, 40, 50)
+    # Compute standard temperature difference.
+    std_temp_difference = compute_standard_temperature_difference_batch(press_alt_1000, temp)
+    # Compute values required by the cruise power setting table.
+    power_press_alt = input_data['cr_power_press_alt']
+    rpm = input_data['cr_power']
+    # Checks for invalid combinations of RPM and pressure altitude
+    cold = std_temp_difference == 'isa_m20'
+    if cold.any():
+        helpers.apply_to_unique(check_for_invalid_data, power_press_alt[cold], rpm[cold])
+    # Read the power setting from the table.
+    index = tables.get_compiled(power_df, power_index.compile_power_index)
+    power, ktas, fuel_flow = power_index.lookup_power_setting_array(index, power_press_alt, rpm, std_temp_difference)
+    # Compute the total endurance and range.
+    max_endurance = np.empty(len(power))
+    max_range = np.empty(len(power))
+    for fuel_capacity in endurance_dfs:
+        selected = capacity == fuel_capacity
+        max_endurance[selected] = compute_endurance_batch(press_alt_500[selected], power[selected], endurance_dfs[fuel_capacity])
+        max_range[selected] = compute_range_batch(press_alt_500[selected], power[selected], range_dfs[fuel_capacity])
+    # Range correction because of wind.
+    max_range = range_wind_correction_batch(input_data['cr_headwind'], max_endurance, max_range)
+    return max_endurance, max_range, ktas, fuel_flow
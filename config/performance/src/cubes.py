@@ -0,0 +1,116 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    cubes.py
+
+DESCRIPTION:
+    This module compiles the takeoff and landing tables into dense arrays.
+
+    The distance tables are complete grids: the takeoff table has a row for
+    every combination of weight and pressure altitude and a pair of columns
+    (ground roll and 50 ft roll) for every temperature. Instead of filtering
+    the dataframe and building the column name on each call, the tables are
+    compiled once into two arrays (a "cube") indexed by grid position:
+
+        takeoff: ground_roll[weight, press_alt, temp]
+        landing: ground_roll[press_alt, temp]
+
+    The position of a valid value in each axis is stored in a dictionary,
+    so a lookup is reduced to integer indexing. The arrays keep the dtype
+    of the table, hence the values are identical to the dataframe values.
+"""
+
+import re
+from collections import namedtuple
+import numpy as np
+
+DistanceCube = namedtuple('DistanceCube', ['axes', 'positions', 'ground_roll', 'fifty_ft_roll'])
+
+TEMP_COLUMN_PATTERN = re.compile(r'^(-?\d+)_celsius_gr_roll$')
+
+
+def compute_temperature_axis(df):
+    """Returns the sorted temperatures that have a column in the table."""
+    temps = [int(match.group(1)) for match in map(TEMP_COLUMN_PATTERN.match, df.columns) if match]
+    return sorted(temps)
+
+
+def compile_distance_cube(df, axis_columns):
+    """Returns the ground roll and 50 ft roll of the table as a DistanceCube.
+
+    Args:
+        df: takeoff or landing performance table (ArrayTable or dataframe).
+        axis_columns (list): columns that identify a row (e.g. weight, press_alt).
+
+    Returns:
+        cube (DistanceCube): axes, value positions and distance arrays.
+            The last axis is always the temperature.
+    """
+    temps = compute_temperature_axis(df)
+    keys = [np.asarray(df[column]) for column in axis_columns]
+    axes = [np.unique(key) for key in keys] + [np.array(temps)]
+    shape = tuple(len(axis) for axis in axes)
+    if len(df) != int(np.prod(shape[:-1])):
+        raise ValueError('The table is not a complete grid of ' + ', '.join(axis_columns) + '.')
+    # Sort the rows so that they follow the order of the axes.
+    order = np.lexsort(keys[::-1])
+    ground_roll = np.column_stack([np.asarray(df[str(temp) + '_celsius_gr_roll']) for temp in temps])[order].reshape(shape)
+    fifty_ft_roll = np.column_stack([np.asarray(df[str(temp) + '_celsius_50_ft']) for temp in temps])[order].reshape(shape)
+    ground_roll.flags.writeable = False
+    fifty_ft_roll.flags.writeable = False
+    positions = tuple({value.item(): index for (index, value) in enumerate(axis)} for axis in axes)
+    return DistanceCube(tuple(axes), positions, ground_roll, fifty_ft_roll)
+
+
+def compile_takeoff_cube(takeoff_df):
+    """Returns the takeoff distances indexed by (weight, press_alt, temp)."""
+    return compile_distance_cube(takeoff_df, ['weight', 'press_alt'])
+
+
+def compile_landing_cube(landing_df):
+    """Returns the landing distances indexed by (press_alt, temp)."""
+    return compile_distance_cube(landing_df, ['press_alt'])
+
+
+def lookup_distances(cube, *keys):
+    """Returns the ground roll and 50 ft roll stored at the given grid values.
+
+    Args:
+        cube (DistanceCube): compiled distance table.
+        *keys (int): one valid value per axis (e.g. weight, press_alt, temp).
+
+    Returns:
+        ground_roll (int): minimum required distance.
+        fifty_ft_roll (int): distance required to clear a 50 ft obstacle.
+    """
+    index = tuple(positions[key] for (positions, key) in zip(cube.positions, keys))
+    return cube.ground_roll[index], cube.fifty_ft_roll[index]
+
+
+def compute_grid_positions(axis, values):
+    """Returns the positions of values in axis. All the values must be in axis."""
+    values = np.asarray(values)
+    positions = np.searchsorted(axis, values)
+    valid = positions < len(axis)
+    valid[valid] = axis[positions[valid]] == values[valid]
+    if not valid.all():
+        raise KeyError(values[~valid].flat[0].item())
+    return positions
+
+
+def lookup_distances_array(cube, *keys):
+    """Array version of lookup_distances.
+
+    Args:
+        cube (DistanceCube): compiled distance table.
+        *keys (array): valid values for each axis, all with the same shape.
+
+    Returns:
+        ground_roll (array): minimum required distances.
+        fifty_ft_roll (array): distances required to clear a 50 ft obstacle.
+    """
+    index = tuple(compute_grid_positions(axis, key) for (axis, key) in zip(cube.axes, keys))
+    return cube.ground_roll[index], cube.fifty_ft_roll[index]
@@ -0,0 +1,350 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    envelope.py
+
+DESCRIPTION:
+    This module computes performance envelopes: the results of a phase over
+    a full grid of conditions, e.g. the takeoff distances for every
+    combination of pressure altitude, temperature and weight, or the range
+    and endurance for every combination of cruise altitude and rpm.
+
+    Each axis is validated and snapped once (see grids.py), and the table
+    values of the whole grid are read with a single array lookup on the
+    compiled tables (see cubes.py and power_index.py), so a 100x100x10
+    takeoff envelope takes a few milliseconds. The wind and runway
+    condition corrections are the array versions used by
+    compute_performance_batch, hence every point of an envelope is
+    identical to the result of compute_performance for that point.
+
+    An Envelope has the following fields:
+
+    > kind: 'takeoff', 'landing' or 'cruise'.
+    > axes: dict with the values of each axis, in order.
+    > values: dict with an array of results for each output, with one
+      dimension per axis. Points with invalid conditions (e.g. a weight
+      above the table or an rpm that is not available at an altitude)
+      are NaN.
+
+    to_table() converts an envelope to a tidy dataframe, with one row per
+    point. compute_envelope() caches envelopes in .npz files, which are
+    reused while the arguments and the performance tables do not change.
+"""
+
+import json
+from collections import namedtuple
+from pathlib import Path
+import numpy as np
+from common.rules import find_column_errors, parse_value
+from . import cruise
+from . import cubes
+from . import grids
+from . import helpers
+from . import interpolation
+from . import landing
+from . import power_index
+from . import schema
+from . import tables
+from . import takeoff
+from .errors import PowerSettingError
+
+FORMAT_VERSION = 1
+
+Envelope = namedtuple('Envelope', ['kind', 'axes', 'values'])
+
+
+def check_axis(rule, values):
+    """Returns False for the values of an envelope axis that break the input rule (see schema.py)."""
+    valid = np.ones(len(values), dtype=bool)
+    for (mask, _) in find_column_errors(rule, values):
+        valid &= ~mask
+    return valid
+
+
+def snap_axis(spec, rule, values):
+    """Returns the valid table values of an envelope axis.
+
+    Args:
+        spec (GridSpec): grid specification of the table axis.
+        rule (Rule): input rule of the axis values.
+        values (array): axis values.
+
+    Returns:
+        valid_values (array): grid value of each value (the first grid value
+            for the values without a valid value).
+        valid (array): False for the values that break the rule or have no
+            valid value in the grid.
+    """
+    values = np.asarray(values)
+    valid = check_axis(rule, values)
+    if not spec.clamp:
+        valid &= values - spec.threshold < spec.grid[-1]
+    return grids.snap_array(spec, np.where(valid, values, spec.grid[0])), valid
+
+
+def check_conditions(headwind, condition):
+    """Returns the runway condition in lower case, raising an InputError (see errors.py) if it is invalid."""
+    schema.check_value(schema.WIND_SPEED, abs(headwind))
+    schema.check_value(schema.RUNWAY_CONDITION, condition)
+    return condition.lower()
+
+
+def takeoff_envelope(press_alts, temps, weights, headwind=0, condition='p'):
+    """Returns the takeoff distances over a grid of conditions.
+
+    Args:
+        press_alts (array): takeoff pressure altitudes.
+        temps (array): takeoff temperatures.
+        weights (array): takeoff weights.
+        headwind (float): signed headwind component in knots (negative for
+            a tailwind, see wind.compute_wind_components).
+        condition (str): runway condition, 'p' (paved) or 'g' (grass).
+
+    Returns:
+        envelope (Envelope): 'to_roll' and 'to_50_roll' over the
+            ('to_press_alt', 'to_temp', 'to_weight') axes.
+    """
+    condition = check_conditions(headwind, condition)
+    press_alts, temps, weights = np.asarray(press_alts), np.asarray(temps), np.asarray(weights)
+    valid_press_alts, valid_press_alt = snap_axis(grids.TAKEOFF_PRESS_ALT, schema.PRESSURE_ALTITUDE, press_alts)
+    valid_temps, valid_temp = snap_axis(grids.TAKEOFF_TEMP, schema.TEMPERATURE, temps)
+    valid_weights, valid_weight = snap_axis(grids.TAKEOFF_WEIGHT, schema.TAKEOFF_WEIGHT, weights)
+    # The cube is indexed by [weight, press_alt, temp].
+    cube = tables.get_compiled(tables.get_array_table('takeoff'), cubes.compile_takeoff_cube)
+    index = np.ix_(*(cubes.compute_grid_positions(axis, values)
+                     for (axis, values) in zip(cube.axes, (valid_weights, valid_press_alts, valid_temps))))
+    ground_roll = cube.ground_roll[index].transpose(1, 2, 0)
+    fifty_ft_roll = cube.fifty_ft_roll[index].transpose(1, 2, 0)
+    ground_roll, fifty_ft_roll = takeoff.correct_distance_for_wind_batch(ground_roll, fifty_ft_roll,
+                                                                         np.full(ground_roll.shape, np.float64(headwind)))
+    ground_roll, fifty_ft_roll = takeoff.correct_distance_for_runway_condition_batch(ground_roll, fifty_ft_roll, condition)
+    valid = valid_press_alt[:, None, None] & valid_temp[None, :, None] & valid_weight[None, None, :]
+    axes = {'to_press_alt': press_alts, 'to_temp': temps, 'to_weight': weights}
+    values = {'to_roll': np.where(valid, ground_roll, np.nan), 'to_50_roll': np.where(valid, fifty_ft_roll, np.nan)}
+    return Envelope('takeoff', axes, values)
+
+
+def landing_envelope(press_alts, temps, headwind=0, condition='p'):
+    """Returns the landing distances over a grid of conditions.
+
+    Args:
+        press_alts (array): landing pressure altitudes.
+        temps (array): landing temperatures.
+        headwind (float): signed headwind component in knots.
+        condition (str): runway condition, 'p' (paved) or 'g' (grass).
+
+    Returns:
+        envelope (Envelope): 'land_roll' and 'land_50_roll' over the
+            ('land_press_alt', 'land_temp') axes.
+    """
+    condition = check_conditions(headwind, condition)
+    press_alts, temps = np.asarray(press_alts), np.asarray(temps)
+    valid_press_alts, valid_press_alt = snap_axis(grids.LANDING_PRESS_ALT, schema.PRESSURE_ALTITUDE, press_alts)
+    valid_temps, valid_temp = snap_axis(grids.LANDING_TEMP, schema.TEMPERATURE, temps)
+    cube = tables.get_compiled(tables.get_array_table('landing'), cubes.compile_landing_cube)
+    index = np.ix_(*(cubes.compute_grid_positions(axis, values)
+                     for (axis, values) in zip(cube.axes, (valid_press_alts, valid_temps))))
+    ground_roll, fifty_ft_roll = cube.ground_roll[index], cube.fifty_ft_roll[index]
+    ground_roll, fifty_ft_roll = landing.correct_distance_for_wind_batch(ground_roll, fifty_ft_roll,
+                                                                          np.full(ground_roll.shape, np.float64(headwind)))
+    ground_roll, fifty_ft_roll = landing.correct_distance_for_runway_condition_batch(ground_roll, fifty_ft_roll, condition)
+    valid = valid_press_alt[:, None] & valid_temp[None, :]
+    axes = {'land_press_alt': press_alts, 'land_temp': temps}
+    values = {'land_roll': np.where(valid, ground_roll, np.nan), 'land_50_roll': np.where(valid, fifty_ft_roll, np.nan)}
+    return Envelope('landing', axes, values)
+
+
+def is_valid_power_setting(power_press_alt, rpm):
+    """Returns False if check_for_invalid_data (see cruise.py) rejects the combination."""
+    try:
+        cruise.check_for_invalid_data(power_press_alt, rpm)
+    except PowerSettingError:
+        return False
+    return True
+
+
+def snap_cruise_points(press_alt, temp, rpm, fuel_capacity):
+    """Returns the valid cruise table values of many points and the points that have a result.
+
+    The points without a result are those that compute_cruise_performance
+    rejects with a PerformanceError (see errors.py): an rpm below the
+    lowest valid rpm, a power setting that is not available at the
+    altitude and temperature, or a power beyond the range and endurance
+    tables.
+
+    Args:
+        press_alt (array): cruise pressure altitudes.
+        temp (array): cruise temperatures.
+        rpm (array): cruise rpm, as integers.
+        fuel_capacity (int): 40 or 50 gallons.
+
+    Returns:
+        input_data (dict): 'cr_press_alt_500', 'cr_press_alt_1000',
+            'cr_power_press_alt', 'cr_temp' and 'cr_power' (valid rpm) arrays.
+        valid (array): False for the points without a result.
+    """
+    input_data = {'cr_press_alt_500': grids.snap_array(grids.CRUISE_PRESS_ALT_500, press_alt),
+                  'cr_press_alt_1000': grids.snap_array(grids.CRUISE_PRESS_ALT_1000, press_alt),
+                  'cr_power_press_alt': grids.snap_array(grids.CRUISE_POWER_PRESS_ALT, press_alt),
+                  'cr_temp': temp}
+    index = tables.get_compiled(tables.get_array_table('power'), power_index.compile_power_index)
+    positions = cubes.compute_grid_positions(index.altitudes, input_data['cr_power_press_alt'])
+    offsets = np.clip(rpm - index.rpm_range[0], 0, index.snapped_rpm.shape[1] - 1)
+    valid_power = index.snapped_rpm[positions, offsets]
+    valid = (valid_power >= 0) & (rpm >= index.rpm_range[0])
+    input_data['cr_power'] = valid_power
+    # Discard the combinations rejected by compute_cruise_performance.
+    std_temp_difference = cruise.compute_standard_temperature_difference_batch(input_data['cr_press_alt_1000'], temp)
+    cold = valid & (std_temp_difference == 'isa_m20')
+    if cold.any():
+        valid[cold] = helpers.apply_to_unique(is_valid_power_setting, input_data['cr_power_press_alt'][cold],
+                                              valid_power[cold])
+    k = np.select([std_temp_difference == value for value in power_index.STD_TEMP_DIFFERENCES],
+                  range(len(power_index.STD_TEMP_DIFFERENCES)), -1)
+    j = np.searchsorted(index.rpm_levels, valid_power).clip(0, len(index.rpm_levels) - 1)
+    power = index.bhp[positions, j, k]
+    valid &= power >= 0
+    # The range and endurance tables are not extrapolated beyond their last row and column (see interpolation.py).
+    for name in ('range{}'.format(fuel_capacity), 'endurance{}'.format(fuel_capacity)):
+        grid = tables.get_compiled(tables.get_array_table(name), interpolation.compile_table_grid)
+        valid &= (input_data['cr_press_alt_500'] <= grid.rows[-1]) & (power <= grid.columns[-1])
+    return input_data, valid
+
+
+def cruise_envelope(press_alts, rpms, temps=None, fuel_capacity=50, headwind=0):
+    """Returns the cruise performance over a grid of altitudes and rpm.
+
+    Args:
+        press_alts (array): cruise pressure altitudes.
+        rpms (array): cruise rpm, as integers.
+        temps: cruise temperature, either one value or one value per
+            altitude. By default, the standard temperature of each altitude.
+        fuel_capacity (int): 40 or 50 gallons.
+        headwind (float): signed headwind component in knots.
+
+    Returns:
+        envelope (Envelope): 'max_endurance', 'max_range', 'ktas' and
+            'fuel_flow' over the ('cr_press_alt', 'cr_power') axes.
+    """
+    schema.check_value(schema.FUEL_CAPACITY, fuel_capacity)
+    schema.check_value(schema.WIND_SPEED, abs(headwind))
+    fuel_capacity = parse_value(schema.FUEL_CAPACITY, fuel_capacity)
+    press_alts, rpms = np.asarray(press_alts), np.asarray(rpms)
+    if temps is None:
+        temps = helpers.round_array(-0.002*press_alts + 15, 0).astype(np.int64)
+    temps = np.broadcast_to(temps, press_alts.shape)
+    # Validate the altitudes and temperatures, and then the rpm at each altitude.
+    valid_press_alt = check_axis(schema.PRESSURE_ALTITUDE, press_alts)
+    valid_temp = check_axis(schema.TEMPERATURE, temps)
+    valid_rpm = check_axis(schema.CRUISE_RPM, rpms)
+    shape = (len(press_alts), len(rpms))
+    press_alt = np.repeat(np.where(valid_press_alt, press_alts, 0), len(rpms))
+    temp = np.repeat(np.where(valid_temp, temps, 0), len(rpms))
+    rpm = np.tile(np.where(valid_rpm, rpms, schema.CRUISE_RPM.max_value), len(press_alts))
+    valid = (valid_press_alt[:, None] & valid_temp[:, None] & valid_rpm[None, :]).ravel()
+    input_data, valid_point = snap_cruise_points(press_alt, temp, rpm, fuel_capacity)
+    valid &= valid_point
+    # Compute the valid points.
+    rows = np.flatnonzero(valid)
+    input_data = {key: value[rows] for (key, value) in input_data.items()}
+    input_data['fuel_capacity'] = np.full(len(rows), fuel_capacity)
+    input_data['cr_headwind'] = np.full(len(rows), np.float64(headwind))
+    range_dfs = {40: tables.get_array_table('range40'), 50: tables.get_array_table('range50')}
+    endurance_dfs = {40: tables.get_array_table('endurance40'), 50: tables.get_array_table('endurance50')}
+    outputs = cruise.compute_cruise_performance_batch(input_data, tables.get_array_table('power'), range_dfs, endurance_dfs)
+    values = {}
+    for (key, output) in zip(('max_endurance', 'max_range', 'ktas', 'fuel_flow'), outputs):
+        values[key] = np.full(len(valid), np.nan)
+        values[key][rows] = output
+        values[key] = values[key].reshape(shape)
+    axes = {'cr_press_alt': press_alts, 'cr_power': rpms}
+    return Envelope('cruise', axes, values)
+
+
+ENVELOPES = {'takeoff': takeoff_envelope, 'landing': landing_envelope, 'cruise': cruise_envelope}
+
+
+def to_table(envelope):
+    """Returns the envelope as a tidy dataframe, with one row per point.
+
+    The dataframe has a column for each axis and for each output.
+    """
+    import pandas as pd
+    grid = np.meshgrid(*envelope.axes.values(), indexing='ij')
+    columns = {name: values.ravel() for (name, values) in zip(envelope.axes, grid)}
+    columns.update((name, values.ravel()) for (name, values) in envelope.values.items())
+    return pd.DataFrame(columns)
+
+
+def format_arguments(kind, arguments):
+    """Returns the cache key of an envelope: its kind and arguments as JSON."""
+    arguments = {name: np.asarray(value).tolist() for (name, value) in arguments.items()}
+    return json.dumps({'kind': kind, 'arguments': arguments}, sort_keys=True)
+
+
+def save_envelope(path, envelope, key=''):
+    """Writes an envelope to a .npz file.
+
+    Args:
+        path: output .npz file.
+        envelope (Envelope): envelope to save.
+        key (str): cache key of the envelope (see format_arguments).
+
+    Returns:
+        path: the output file.
+    """
+    arrays = {'version': np.array(FORMAT_VERSION), 'digest': np.array(tables.compute_source_digest()),
+              'kind': np.array(envelope.kind), 'key': np.array(key),
+              'axis_names': np.array(list(envelope.axes)), 'value_names': np.array(list(envelope.values))}
+    for (name, values) in envelope.axes.items():
+        arrays['axis_' + name] = values
+    for (name, values) in envelope.values.items():
+        arrays['value_' + name] = values
+    with open(path, 'wb') as file:
+        np.savez_compressed(file, **arrays)
+    return path
+
+
+def load_envelope(path, key=None):
+    """Returns the envelope stored in a .npz file.
+
+    Returns None if the file does not exist, has another format version,
+    was computed from tables that differ from the current .csv files, or
+    was saved with a cache key other than key (if given).
+    """
+    if not Path(path).exists():
+        return None
+    with np.load(path) as arrays:
+        if (int(arrays['version']) != FORMAT_VERSION or str(arrays['digest']) != tables.compute_source_digest()
+                or (key is not None and str(arrays['key']) != key)):
+            return None
+        axes = {name: arrays['axis_' + name] for name in arrays['axis_names'].tolist()}
+        values = {name: arrays['value_' + name] for name in arrays['value_names'].tolist()}
+        return Envelope(str(arrays['kind']), axes, values)
+
+
+def compute_envelope(kind, cache_path=None, **arguments):
+    """Returns an envelope, reusing the one cached in cache_path if it is up to date.
+
+    Args:
+        kind (str): 'takeoff', 'landing' or 'cruise'.
+        cache_path: .npz file where the envelope is cached, or None.
+        **arguments: arguments of the envelope function (e.g. press_alts,
+            temps and weights for takeoff_envelope).
+
+    Returns:
+        envelope (Envelope): the envelope.
+    """
+    if kind not in ENVELOPES:
+        raise ValueError('Unknown envelope {!r}, expected one of: {}.'.format(kind, ', '.join(ENVELOPES)))
+    if cache_path is None:
+        return ENVELOPES[kind](**arguments)
+    key = format_arguments(kind, arguments)
+    envelope = load_envelope(cache_path, key)
+    if envelope is None:
+        envelope = ENVELOPES[kind](**arguments)
+        save_envelope(cache_path, envelope, key)
+    return envelope
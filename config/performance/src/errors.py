@@ -0,0 +1,59 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    errors.py
+
+DESCRIPTION:
+    This module defines the errors raised by the performance calculator.
+
+    Invalid input data used to stop the program with sys.exit, which also
+    stops the web server worker or the process pool that runs the
+    computation. These errors are ordinary exceptions, so the callers can
+    report the error of a single scenario and carry on with the others:
+
+    > PerformanceError: base class of every error of the calculator.
+    > InputError: a value of the input data is invalid or out of limits.
+    > PowerSettingError: the cruise power setting table has no entry for
+      the cruise rpm, pressure altitude and temperature.
+    > TableRangeError: a value is beyond the last row or column of a
+      performance table.
+
+    The string of an error is the message previously passed to sys.exit.
+"""
+
+
+class PerformanceError(Exception):
+    """Base class of the errors of the performance calculator."""
+
+
+class InputError(PerformanceError, ValueError):
+    """Raised when a value of the input data is invalid or out of limits.
+
+    Args:
+        label (str): name of the value in the error message, e.g. 'Takeoff weight'.
+        message (str): error message.
+    """
+
+    def __init__(self, label, message):
+        super().__init__('{} | {}'.format(label, message))
+        self.label = label
+        self.message = message
+
+
+class PowerSettingError(PerformanceError, IndexError):
+    """Raised when the cruise rpm is not valid for the cruise pressure altitude and temperature.
+
+    It is also an IndexError, the error raised by the table lookups before
+    this module existed.
+    """
+
+
+class TableRangeError(PerformanceError, IndexError):
+    """Raised when a value is beyond the last row or column of a performance table.
+
+    It is also an IndexError, the error raised by the table lookups before
+    this module existed.
+    """
@@ -5,6 +5,10 @@ GitHub: luisrnandezc
 Date: 13/09/2023
 """
 
+import functools
+import numpy as np
+from . import helpers
+
 
 def compute_climb_time(press_alt, df):
     """Returns the time required to climb from sea level to press_alt.
@@ -16,7 +20,7 @@ def compute_climb_time(press_alt, df):
     Returns:
         time (float): time required to reach press_alt in minutes.
     """
-    time = df.loc[press_alt]['time']
+    time = helpers.dataframe_lookup(press_alt, 'time', df)
     return time
 
 
@@ -30,7 +34,7 @@ def compute_climb_fuel(press_alt, df):
     Returns:
         fuel (float): fuel required to reach press_alt in US gallons.
     """
-    fuel = df.loc[press_alt]['fuel']
+    fuel = helpers.dataframe_lookup(press_alt, 'fuel', df)
     return fuel
 
 
@@ -45,7 +49,7 @@ def compute_climb_distance(press_alt, df):
     Returns:
         distance (float): horizontal distance in nautical miles.
     """
-    distance = df.loc[press_alt]['distance']
+    distance = helpers.dataframe_lookup(press_alt, 'distance', df)
     return distance
 
 
@@ -65,7 +69,7 @@ def apply_temperature_correction(time, fuel, distance, press_alt, temp, df):
         fuel (float): corrected fuel required to reach press_alt in US gallons.
         distance (float): corrected horizontal distance in nautical miles.
     """
-    std_temp = df.loc[press_alt]['temp']
+    std_temp = helpers.dataframe_lookup(press_alt, 'temp', df)
     delta_temp = temp - std_temp
     if delta_temp > 0:
         correction = round(delta_temp/100, 2)
@@ -125,3 +129,46 @@ def compute_fuel_required(input_data, climb_df, ktas, fuel_flow):
     total_fuel_required = round(1.1 + climb_data[1] + cruise_fuel, 1)
     fuel_reserve = round(int(input_data['fuel_capacity']) - total_fuel_required, 1)
     return total_fuel_required, fuel_reserve
+
+
+def compute_ground_speed_batch(ktas, headwind):
+    """Array version of compute_ground_speed, with the signed headwind component (see wind.py)."""
+    return np.where(headwind != 0, ktas - headwind, ktas)
+
+
+def compute_fuel_required_batch(input_data, climb_df, ktas, fuel_flow):
+    """Array version of compute_fuel_required."""
+    total_fuel_required, fuel_reserve, _, _ = compute_trip_batch(input_data, climb_df, ktas, fuel_flow)
+    return total_fuel_required, fuel_reserve
+
+
+def compute_trip_batch(input_data, climb_df, ktas, fuel_flow):
+    """Returns the results of compute_fuel_required_batch and the climb and cruise data.
+
+    Returns:
+        total_fuel_required (array): fuel required in US gallons.
+        fuel_reserve (array): fuel reserve in US gallons.
+        climb_data (tuple): time (minutes), fuel (US gallons) and distance
+            (nautical miles) to climb from the takeoff to the cruise altitude.
+        cruise_time (array): cruise time in hours.
+    """
+    climb_data_at = functools.partial(compute_climb_data, df=climb_df)
+    # First we need to compute the time, fuel and distance to climb from SL.
+    takeoff_press_alt = input_data['to_press_alt']
+    takeoff_temp = input_data['real_to_temp']
+    takeoff_climb_data = helpers.apply_to_unique(climb_data_at, takeoff_press_alt, takeoff_temp)
+    cruise_press_alt = input_data['cr_press_alt_1000']
+    cruise_temp = input_data['cr_temp']
+    cruise_climb_data = helpers.apply_to_unique(climb_data_at, cruise_press_alt, cruise_temp)
+    # Now the climb data from takeoff to cruise altitude can be computed.
+    climb_data = tuple(map(lambda i, j: np.round(i - j, 1), cruise_climb_data, takeoff_climb_data))
+    # Computation of the total fuel required.
+    cruise_distance = np.round(input_data['travel_dist'] - climb_data[2], 0).astype(np.int64)
+    ground_speed = compute_ground_speed_batch(ktas, input_data['cr_headwind'])
+    # The cruise time can be now computed using the cruise distance and the ground speed.
+    cruise_time = helpers.round_array(cruise_distance/ground_speed, 1)
+    # Finally, the total fuel consumption is computed.
+    cruise_fuel = np.round(cruise_time*fuel_flow, 1)
+    total_fuel_required = np.round(1.1 + climb_data[1] + cruise_fuel, 1)
+    fuel_reserve = np.round(input_data['fuel_capacity'].astype(np.int64) - total_fuel_required, 1)
+    return total_fuel_required, fuel_reserve, climb_data, cruise_time
@@ -0,0 +1,73 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    grids.py
+
+DESCRIPTION:
+    This module declares the valid values of every table axis and snaps
+    user values to them (see data.py for the approximation criteria).
+
+    Each axis is described by a GridSpec:
+
+    > grid: valid values present in the table, in increasing order.
+    > threshold: a value X between two valid values A < B is approximated
+      to A if X < A + threshold, and to B otherwise.
+    > clamp: if True, values above the last valid value are approximated
+      to it. If False, they have no valid value (None).
+
+    Values below the first valid value are always approximated to it.
+    Scalars are snapped with bisect and arrays with numpy.searchsorted, so
+    the cost does not depend on the number of valid values.
+"""
+
+import bisect
+from collections import namedtuple
+import numpy as np
+
+GridSpec = namedtuple('GridSpec', ['grid', 'threshold', 'clamp'])
+
+# Takeoff and landing distance tables.
+TAKEOFF_WEIGHT = GridSpec(tuple(range(1900, 2500, 200)), 50, False)
+TAKEOFF_PRESS_ALT = GridSpec(tuple(range(0, 9000, 1000)), 250, True)
+TAKEOFF_TEMP = GridSpec(tuple(range(0, 50, 10)), 5, False)
+LANDING_PRESS_ALT = GridSpec(tuple(range(0, 9000, 1000)), 250, True)
+LANDING_TEMP = GridSpec(tuple(range(0, 50, 10)), 5, False)
+# Rate of climb table.
+ROC_PRESS_ALT = GridSpec(tuple(range(0, 14000, 2000)), 500, True)
+ROC_TEMP = GridSpec(tuple(range(-20, 60, 20)), 10, False)
+# Range and endurance tables (500 ft), climb table (1000 ft) and cruise power table.
+CRUISE_PRESS_ALT_500 = GridSpec(tuple(range(0, 13000, 500)), 250, True)
+CRUISE_PRESS_ALT_1000 = GridSpec(tuple(range(0, 13000, 1000)), 250, True)
+CRUISE_POWER_PRESS_ALT = GridSpec(tuple(range(2000, 14000, 2000)), 500, True)
+
+
+def snap(spec, value):
+    """Returns the valid value of the grid that corresponds to value.
+
+    Args:
+        spec (GridSpec): grid specification of the table axis.
+        value (int): user value.
+
+    Returns:
+        valid_value (int): grid value, or None if there is no valid value.
+    """
+    index = bisect.bisect_right(spec.grid, value - spec.threshold)
+    if index == len(spec.grid):
+        return spec.grid[-1] if spec.clamp else None
+    return spec.grid[index]
+
+
+def snap_array(spec, values):
+    """Array version of snap.
+
+    Raises a ValueError if a value has no valid value in the grid.
+    """
+    grid = np.array(spec.grid)
+    indices = np.searchsorted(grid, np.asarray(values) - spec.threshold, side='right')
+    beyond = indices == len(grid)
+    if beyond.any() and not spec.clamp:
+        raise ValueError('{} is above the last valid value {}.'.format(np.asarray(values)[beyond].flat[0], grid[-1]))
+    return grid[np.minimum(indices, len(grid) - 1)]
@@ -5,7 +5,11 @@ GitHub: luisrnandezc
 Date: 13/09/2023
 """
 
-import bisect
+import sys
+import numpy as np
+from . import interpolation
+from . import row_index
+from . import tables
 
 
 def linear_interpolation(x1, y1, x2, y2, xi):
@@ -14,17 +18,11 @@ def linear_interpolation(x1, y1, x2, y2, xi):
     return yi
 
 
-def compute_sorted_index(values, v):
-    """Returns the correct index of v when inserted in values."""
-    bisect.insort(values, v)
-    return values.index(v)
-
-
 def dataframe_interpolation(row, column, df):
     """Returns the dataframe value located at the position [row][column].
 
     If the row or/and column are not present in the dataframe the value
-    is estimated by means of interpolation.
+    is estimated by means of interpolation (see interpolation.py).
 
     Args:
         row (int): cruise pressure altitude in feets.
@@ -34,41 +32,69 @@ def dataframe_interpolation(row, column, df):
     Returns:
         interpolated_value (float): dataframe value located at [row][column].
     """
-    row_indices = df.index.tolist()
-    column_names = list(reversed([int(i) for i in df.columns.tolist()]))
-    if row in row_indices and column not in column_names:
-        index = compute_sorted_index(column_names, column)
-        prev_col = column_names[index - 1]
-        next_col = column_names[index + 1]
-        prev_col_value = df.loc[row][str(prev_col)]
-        next_col_value = df.loc[row][str(next_col)]
-        interpolated_value = linear_interpolation(prev_col, prev_col_value, next_col, next_col_value, column)
-        return interpolated_value
-    elif row not in row_indices and column in column_names:
-        index = compute_sorted_index(row_indices, row)
-        prev_row = row_indices[index - 1]
-        next_row = row_indices[index + 1]
-        prev_row_value = df.loc[prev_row][str(column)]
-        next_row_value = df.loc[next_row][str(column)]
-        interpolated_value = linear_interpolation(prev_row, prev_row_value, next_row, next_row_value, row)
-        return interpolated_value
-    else:
-        # If both the row and column are not present in the dataframe, then a
-        # bilinear interpolation is required.
-        col_index = compute_sorted_index(column_names, column)
-        prev_col = column_names[col_index - 1]
-        next_col = column_names[col_index + 1]
-        row_index = compute_sorted_index(row_indices, row)
-        prev_row = row_indices[row_index - 1]
-        next_row = row_indices[row_index + 1]
-        # Interpolation for the previous row and the unknown column.
-        prev_col_prev_row = df.loc[prev_row][str(prev_col)]
-        next_col_prev_row = df.loc[prev_row][str(next_col)]
-        prev_row_value = linear_interpolation(prev_col, prev_col_prev_row, next_col, next_col_prev_row, column)
-        # Interpolation for the next row and the unknown column.
-        prev_col_next_row = df.loc[next_row][str(prev_col)]
-        next_col_next_row = df.loc[next_row][str(next_col)]
-        next_row_value = linear_interpolation(prev_col, prev_col_next_row, next_col, next_col_next_row, column)
-        # Final interpolation using the values for the unknown column.
-        interpolated_value = linear_interpolation(prev_row, prev_row_value, next_row, next_row_value, row)
-        return interpolated_value
+    grid = tables.get_compiled(df, interpolation.compile_table_grid)
+    return interpolation.interpolate(grid, row, column)[()]
+
+
+def dataframe_lookup(row, column, df):
+    """Returns the dataframe value located at the position [row][column].
+
+    The result is the same as df.loc[row][column] (see row_index.py).
+
+    Args:
+        row (int): index value, e.g. pressure altitude in feets.
+        column (str): column name.
+        df: performance dataframe.
+
+    Returns:
+        value: dataframe value located at [row][column].
+    """
+    index = tables.get_compiled(df, row_index.compile_row_index)
+    return row_index.lookup(index, row, column)
+
+
+def is_dataframe(value):
+    """Returns True if value is a pandas DataFrame, without importing pandas."""
+    pandas = sys.modules.get('pandas')
+    return pandas is not None and isinstance(value, pandas.DataFrame)
+
+
+def apply_to_unique(function, *arrays):
+    """Returns function applied element-wise to arrays.
+
+    The function is evaluated only once for each distinct combination of
+    values, and the results are broadcast back to every element. This makes
+    it possible to reuse the scalar functions on large arrays whose values
+    are taken from a small set (e.g. valid altitudes or power settings).
+
+    Args:
+        function: scalar function of len(arrays) arguments.
+        *arrays (array): arguments of the function, all with the same length.
+
+    Returns:
+        results (array or tuple of arrays): function values for each element.
+    """
+    codes = np.zeros(len(arrays[0]), dtype=np.int64)
+    for array in arrays:
+        values, inverse = np.unique(array, return_inverse=True)
+        codes = codes*len(values) + inverse
+    _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    results = [function(*(array[i].item() for array in arrays)) for i in first]
+    if results and isinstance(results[0], tuple):
+        return tuple(np.array(values)[inverse] for values in zip(*results))
+    return np.array(results)[inverse]
+
+
+def round_array(values, digits=0):
+    """Returns the values rounded exactly as the built-in round() does.
+
+    numpy.round scales the values before rounding, so it may round a value
+    that is very close to a tie (e.g. 2.25 to 1 digit) in the opposite
+    direction than round(). Those values are rounded again with round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, digits)
+    scaled = values*10.0**digits
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded[ties] = [round(value, digits) for value in values[ties].tolist()]
+    return rounded
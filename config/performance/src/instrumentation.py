@@ -0,0 +1,263 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    instrumentation.py
+
+DESCRIPTION:
+    This module measures where the time goes inside compute_performance.
+
+    The instrumentation is disabled by default. Once enabled, every call
+    to compute_performance records the wall time of each of its stages
+    (input check, table loading, data snapping, wind, result cache,
+    takeoff, cruise, fuel and landing) and of the whole call ('total') in
+    process-local histograms. compute_performance_batch records its stages
+    with a 'batch.' prefix. When disabled, compute_performance only pays
+    for a few calls to the methods of a timer that does nothing.
+
+    A fraction of the calls (sample_rate) can also be profiled with
+    cProfile or tracemalloc, or with any other profiler hook: a callable
+    that returns an object with start() and stop() methods, whose stop()
+    result is kept in the profiles list.
+
+    Python API:
+
+        instrumentation.enable(sample_rate=0.01, profiler='cprofile')
+        ...
+        print(instrumentation.format_stats(instrumentation.get_stats()))
+
+    The same statistics are printed by the performance_stats management
+    command, which computes a scenarios file with the instrumentation
+    enabled.
+"""
+
+import bisect
+import cProfile
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+# Upper bounds of the histogram buckets, in seconds (1 us to 16 s, doubling).
+BUCKET_BOUNDS = tuple(1e-6*2**i for i in range(25))
+# Maximum number of profiles kept in memory.
+MAX_PROFILES = 20
+PERCENTILES = (50, 90, 99)
+
+
+class StageHistogram:
+    """Histogram of the wall time of a stage."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0]*(len(BUCKET_BOUNDS) + 1)
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def percentile(self, q):
+        """Returns an upper estimate of the q-th percentile, in seconds."""
+        if self.count == 0:
+            return 0.0
+        target = q/100*self.count
+        cumulative = 0
+        for (bound, count) in zip(BUCKET_BOUNDS + (self.max,), self.buckets):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        """Returns the histogram as a dict of plain values."""
+        stats = {'count': self.count, 'total': self.total, 'mean': self.total/self.count if self.count else 0.0,
+                 'min': self.min if self.count else 0.0, 'max': self.max,
+                 'buckets': [[bound, count] for (bound, count) in zip(BUCKET_BOUNDS + (None,), self.buckets) if count]}
+        for q in PERCENTILES:
+            stats['p{}'.format(q)] = self.percentile(q)
+        return stats
+
+
+class CProfileHook:
+    """Profiler hook that runs cProfile. stop() returns the cProfile.Profile."""
+
+    def start(self):
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        return self.profile
+
+
+class TracemallocHook:
+    """Profiler hook that traces the memory allocations.
+
+    stop() returns a dict with the peak traced memory in bytes and a
+    tracemalloc snapshot.
+    """
+
+    def start(self):
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    def stop(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot()
+        if self.started:
+            tracemalloc.stop()
+        return {'peak': peak, 'snapshot': snapshot}
+
+
+PROFILERS = {'cprofile': CProfileHook, 'tracemalloc': TracemallocHook}
+
+
+class StageTimer:
+    """Measures the stages of a single computation.
+
+    Args:
+        prefix (str): prefix of the stage names.
+        hook: started profiler hook, or None.
+    """
+
+    def __init__(self, prefix='', hook=None):
+        self.prefix = prefix
+        self.hook = hook
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, stage):
+        """Records the time elapsed since the previous lap as stage."""
+        now = time.perf_counter()
+        record(self.prefix + stage, now - self.last)
+        self.last = now
+
+    def finish(self):
+        """Records the total time and stops the profiler hook."""
+        record(self.prefix + 'total', time.perf_counter() - self.start)
+        if self.hook is not None:
+            result = self.hook.stop()
+            with _lock:
+                _profiles.append(result)
+
+
+class NullTimer:
+    """Timer used when the instrumentation is disabled."""
+
+    def lap(self, stage):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+_enabled = False
+_sample_rate = 0.0
+_profiler = None
+_histograms = {}
+_profiles = deque(maxlen=MAX_PROFILES)
+_lock = threading.Lock()
+
+
+def enable(sample_rate=0.0, profiler=None):
+    """Enables the instrumentation.
+
+    Args:
+        sample_rate (float): fraction of the computations that are profiled.
+        profiler: 'cprofile', 'tracemalloc', a profiler hook factory, or None.
+    """
+    global _enabled, _sample_rate, _profiler
+    if profiler is not None and not callable(profiler):
+        if profiler not in PROFILERS:
+            raise ValueError('Unknown profiler {!r}, expected one of {}.'.format(profiler, sorted(PROFILERS)))
+        profiler = PROFILERS[profiler]
+    _sample_rate = sample_rate if profiler is not None else 0.0
+    _profiler = profiler
+    _enabled = True
+    return None
+
+
+def disable():
+    """Disables the instrumentation, keeping the recorded statistics."""
+    global _enabled
+    _enabled = False
+    return None
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Removes the recorded statistics and profiles."""
+    with _lock:
+        _histograms.clear()
+        _profiles.clear()
+    return None
+
+
+def record(stage, seconds):
+    """Adds a wall time measurement to the histogram of stage."""
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = StageHistogram()
+        histogram.record(seconds)
+    return None
+
+
+def record_stages(timings, prefix=''):
+    """Adds the seconds spent in each stage (e.g. batch timings) to the histograms."""
+    for (stage, seconds) in timings.items():
+        record(prefix + stage, seconds)
+    return None
+
+
+def start_timer(prefix=''):
+    """Returns the timer of a new computation (NULL_TIMER if disabled).
+
+    A sampled fraction of the computations is profiled with the profiler hook.
+    """
+    if not _enabled:
+        return NULL_TIMER
+    hook = None
+    if _sample_rate > 0 and random.random() < _sample_rate:
+        hook = _profiler()
+        hook.start()
+    return StageTimer(prefix, hook)
+
+
+def get_stats():
+    """Returns the statistics of every stage: count, total, mean, min, max,
+    percentiles and non-empty buckets (seconds)."""
+    with _lock:
+        return {stage: histogram.snapshot() for (stage, histogram) in _histograms.items()}
+
+
+def get_profiles():
+    """Returns the results of the most recent profiler hooks, oldest first."""
+    with _lock:
+        return list(_profiles)
+
+
+def format_stats(stats):
+    """Returns the statistics of get_stats as a printable table."""
+    lines = ['{:<16} {:>8} {:>10} {:>10} {:>10} {:>10} {:>10}'.format('stage', 'count', 'total ms', 'mean us',
+                                                                   'p50 us', 'p99 us', 'max us')]
+    for (stage, values) in stats.items():
+        lines.append('{:<16} {:>8} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f}'.format(
+            stage, values['count'], values['total']*1e3, values['mean']*1e6, values['p50']*1e6,
+            values['p99']*1e6, values['max']*1e6))
+    return '\n'.join(lines)
@@ -0,0 +1,110 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    interpolation.py
+
+DESCRIPTION:
+    This module interpolates the range and endurance tables.
+
+    The rows of these tables are pressure altitudes and the columns are
+    engine power settings (45, 55, 65 and 75 %). Each table is compiled
+    once into a TableGrid: the sorted row values, the sorted column values
+    and the table values as an array. The neighbours of any number of
+    (altitude, power) points are then found with numpy.searchsorted and
+    all the points are interpolated in a single call.
+
+    The results are identical to the ones obtained with the original
+    procedure (see helpers.linear_interpolation):
+
+    > If the point is in the table, the table value is returned.
+    > If only the row or the column is missing, the value is linearly
+      interpolated between the neighbouring columns or rows, and rounded
+      to 2 decimals.
+    > If both are missing, the value is interpolated between the
+      neighbouring columns for the previous and next rows (each result
+      rounded to 2 decimals), and then between these two rows.
+
+    Points below the first row or column are interpolated between the last
+    and first values. Points beyond the last row or column raise a
+    TableRangeError (see errors.py).
+"""
+
+from collections import namedtuple
+import numpy as np
+from .errors import TableRangeError
+
+TableGrid = namedtuple('TableGrid', ['rows', 'columns', 'values'])
+
+
+def compile_table_grid(df):
+    """Returns the axes and values of a range or endurance table.
+
+    Args:
+        df: performance table (ArrayTable or dataframe) indexed by pressure
+            altitude, with one column per power setting.
+
+    Returns:
+        grid (TableGrid): sorted rows, sorted columns and table values.
+    """
+    columns = np.array([int(column) for column in df.columns])
+    order = np.argsort(columns)
+    rows = np.asarray(df.index)
+    values = df.to_numpy()[:, order]
+    values.flags.writeable = False
+    return TableGrid(rows, columns[order], values)
+
+
+def linear_interpolation(x1, y1, x2, y2, xi):
+    """Array version of helpers.linear_interpolation."""
+    return np.round(((xi - x2)*y1 - (xi - x1)*y2)/(x1 - x2), 2)
+
+
+def find_neighbours(axis, values):
+    """Returns the position of values in axis and whether they are present.
+
+    For the values that are not present, the returned position is the
+    position of the next value in axis, so the previous one is position - 1.
+    """
+    positions = np.searchsorted(axis, values)
+    found = axis[np.minimum(positions, len(axis) - 1)] == values
+    if np.any(~found & (positions == len(axis))):
+        raise TableRangeError('ERROR: The value is beyond the last row or column of the performance table.')
+    return positions, found
+
+
+def interpolate(grid, rows, columns):
+    """Returns the table values located at the given rows and columns.
+
+    Args:
+        grid (TableGrid): compiled range or endurance table.
+        rows (array): cruise pressure altitudes in feets.
+        columns (array): cruise power settings in % (e.g. 65 = 65%).
+
+    Returns:
+        values (array): table values, interpolated when necessary.
+    """
+    rows = np.asarray(rows)
+    columns = np.asarray(columns)
+    row_index, row_found = find_neighbours(grid.rows, rows)
+    col_index, col_found = find_neighbours(grid.columns, columns)
+    # Previous and next rows and columns. In the table, the previous row or
+    # column of the first one is the last one.
+    prev_row, next_row = grid.rows[row_index - 1], grid.rows[np.minimum(row_index, len(grid.rows) - 1)]
+    prev_col, next_col = grid.columns[col_index - 1], grid.columns[np.minimum(col_index, len(grid.columns) - 1)]
+    row_index = np.minimum(row_index, len(grid.rows) - 1)
+    col_index = np.minimum(col_index, len(grid.columns) - 1)
+    values = grid.values
+    # Interpolation between columns for the previous and next rows.
+    prev_row_value = linear_interpolation(prev_col, values[row_index - 1, col_index - 1],
+                                          next_col, values[row_index - 1, col_index], columns)
+    next_row_value = linear_interpolation(prev_col, values[row_index, col_index - 1],
+                                          next_col, values[row_index, col_index], columns)
+    # Interpolation between rows for a known column.
+    column_value = linear_interpolation(prev_row, values[row_index - 1, col_index],
+                                        next_row, values[row_index, col_index], rows)
+    bilinear_value = linear_interpolation(prev_row, prev_row_value, next_row, next_row_value, rows)
+    interpolated_value = np.where(row_found, next_row_value, np.where(col_found, column_value, bilinear_value))
+    return np.where(row_found & col_found, values[row_index, col_index], interpolated_value)
@@ -20,6 +20,10 @@ DESCRIPTION:
 
 
 import math
+import numpy as np
+from . import cubes
+from . import helpers
+from . import tables
 
 
 def compute_landing_ground_roll(press_alt, temp, landing_df):
@@ -37,9 +41,8 @@ def compute_landing_ground_roll(press_alt, temp, landing_df):
         ground_roll (int): minimum required landing distance.
         fifty_ft_roll (int): distance required to clear a 50 ft obstacle.
     """
-    takeoff_df = landing_df[(landing_df['press_alt'] == press_alt)]
-    ground_roll = takeoff_df.iloc[0][str(temp) + '_celsius_gr_roll']
-    fifty_ft_roll = takeoff_df.iloc[0][str(temp) + '_celsius_50_ft']
+    landing_cube = tables.get_compiled(landing_df, cubes.compile_landing_cube)
+    ground_roll, fifty_ft_roll = cubes.lookup_distances(landing_cube, press_alt, temp)
     return ground_roll, fifty_ft_roll
 
 
@@ -101,3 +104,43 @@ def compute_landing_performance(input_data, landing_df):
     condition = input_data['land_condition']
     ground_roll, fifty_ft_roll = correct_distance_for_runway_condition(ground_roll, fifty_ft_roll, condition)
     return int(ground_roll), int(fifty_ft_roll)
+
+
+def correct_distance_for_wind_batch(ground_roll, fifty_ft_roll, headwind):
+    """Array version of correct_distance_for_wind.
+
+    The wind is given by its signed headwind component (see
+    wind.compute_wind_components) instead of its speed and direction.
+    """
+    wind_speed = np.abs(headwind)
+    corr = np.where(headwind > 0,
+                    -1*helpers.round_array((wind_speed*0.1)/9, 2),
+                    helpers.round_array((wind_speed*0.1)/2, 2))
+    windy = headwind != 0
+    ground_roll = np.where(windy, np.ceil(ground_roll + ground_roll*corr), ground_roll)
+    fifty_ft_roll = np.where(windy, np.ceil(fifty_ft_roll + fifty_ft_roll*corr), fifty_ft_roll)
+    return ground_roll, fifty_ft_roll
+
+
+def correct_distance_for_runway_condition_batch(ground_roll, fifty_ft_roll, condition):
+    """Array version of correct_distance_for_runway_condition."""
+    corr = helpers.round_array(ground_roll*0.45, 2)
+    grass = condition == 'g'
+    ground_roll = np.where(grass, np.ceil(ground_roll + corr), ground_roll)
+    fifty_ft_roll = np.where(grass, np.ceil(fifty_ft_roll + corr), fifty_ft_roll)
+    return ground_roll, fifty_ft_roll
+
+
+def compute_landing_performance_batch(input_data, landing_df):
+    """Array version of compute_landing_performance."""
+    press_alt = input_data['land_press_alt']
+    temp = input_data['land_temp']
+    # Read the landing distances from the compiled table.
+    landing_cube = tables.get_compiled(landing_df, cubes.compile_landing_cube)
+    ground_roll, fifty_ft_roll = cubes.lookup_distances_array(landing_cube, press_alt, temp)
+    # Correct landing distance for wind.
+    ground_roll, fifty_ft_roll = correct_distance_for_wind_batch(ground_roll, fifty_ft_roll, input_data['land_headwind'])
+    # Correct landing distance for runway condition.
+    condition = input_data['land_condition']
+    ground_roll, fifty_ft_roll = correct_distance_for_runway_condition_batch(ground_roll, fifty_ft_roll, condition)
+    return ground_roll.astype(np.int64), fifty_ft_roll.astype(np.int64)
@@ -0,0 +1,222 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    montecarlo.py
+
+DESCRIPTION:
+    This module estimates the effect of weather uncertainty on the
+    performance of a scenario (Monte Carlo analysis).
+
+    The forecast temperature, wind and pressure altitude of a scenario are
+    uncertain, so instead of a single result, run_monte_carlo() draws many
+    samples of the uncertain fields and returns the percentiles of every
+    result (e.g. the P90 takeoff distance) and exceedance probabilities
+    (e.g. the probability that the 50 ft roll exceeds the runway length).
+
+    The uncertainty of each field is given by a Distribution of the
+    deviation from the scenario value (see normal, uniform and
+    triangular). The samples are rounded to the resolution of the field
+    (1 unit, or 5 degrees for the wind directions), the angles wrap around
+    between 1 and 360 degrees and the wind speeds below 0 are calm. The
+    samples are drawn from a seeded generator, so the same seed gives the
+    same samples regardless of the number of processes.
+
+    The samples are evaluated in chunks with pipeline.what_if_columns, which
+    reuses the state of the scenario and only runs the stages affected by
+    the uncertain fields, and the chunks are distributed across a pool of
+    processes (one per available core by default, see runner.py).
+
+    Samples with invalid values (e.g. a temperature above the limits of
+    the tables) have no results: they are counted in MonteCarloResult.valid
+    and excluded from the percentiles and probabilities.
+"""
+
+import itertools
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from common.rules import parse_value
+from . import pipeline
+from . import runner
+from . import schema
+from .run_performance import OUTPUT_FIELDS
+
+DEFAULT_CHUNK_SIZE = 16384
+DEFAULT_PERCENTILES = (50, 90, 99)
+# Results compared with a limit of the scenario: P(result > limit).
+LIMITS = [('to_roll', 'to_length'), ('to_50_roll', 'to_length'), ('land_roll', 'land_length'),
+          ('land_50_roll', 'land_length')]
+WIND_SPEED_FIELDS = ('to_wind_speed', 'cr_wind_speed', 'land_wind_speed')
+
+Distribution = namedtuple('Distribution', ['kind', 'parameters'])
+MonteCarloResult = namedtuple('MonteCarloResult', ['samples', 'results', 'valid', 'percentiles', 'exceedance'])
+
+
+def normal(sd, mean=0):
+    """Returns a normal distribution of the deviation from the scenario value."""
+    return Distribution('normal', (mean, sd))
+
+
+def uniform(low, high):
+    """Returns a uniform distribution of the deviation from the scenario value."""
+    return Distribution('uniform', (low, high))
+
+
+def triangular(low, mode, high):
+    """Returns a triangular distribution of the deviation from the scenario value."""
+    return Distribution('triangular', (low, mode, high))
+
+
+def draw_deviations(distribution, rng, size):
+    """Returns size deviations drawn from a distribution."""
+    if distribution.kind == 'normal':
+        return rng.normal(*distribution.parameters, size)
+    if distribution.kind == 'uniform':
+        return rng.uniform(*distribution.parameters, size)
+    if distribution.kind == 'triangular':
+        return rng.triangular(*distribution.parameters, size)
+    raise ValueError('Unknown distribution {!r}.'.format(distribution.kind))
+
+
+def draw_samples(state, distributions, size, seed=None):
+    """Returns samples of the uncertain fields of a scenario.
+
+    Args:
+        state (dict): state of the scenario (see pipeline.evaluate).
+        distributions (dict): Distribution of each uncertain numeric field.
+        size (int): number of samples.
+        seed (int): seed of the random generator.
+
+    Returns:
+        samples (dict): integer array of each uncertain field, in SCHEMA order.
+    """
+    unknown = set(distributions).difference(field for (field, rule) in schema.SCHEMA.items() if rule.kind != 'str')
+    if unknown:
+        raise ValueError('Unknown or non numeric input fields: {}.'.format(', '.join(sorted(unknown))))
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for (field, rule) in schema.SCHEMA.items():
+        if field not in distributions:
+            continue
+        step = rule.step or 1
+        values = parse_value(rule, state[field]) + draw_deviations(distributions[field], rng, size)
+        values = (np.round(values/step)*step).astype(np.int64)
+        if field in pipeline.ANGLE_FIELDS:
+            values = (values - 1) % 360 + 1
+        elif field in WIND_SPEED_FIELDS:
+            values = np.maximum(values, 0)
+        samples[field] = values
+    return samples
+
+
+def evaluate_chunk(state, samples):
+    """Returns the results of a chunk of samples.
+
+    Returns:
+        results (dict): float array of each result, NaN for invalid samples.
+        valid (array): False for the invalid samples.
+    """
+    size = len(next(iter(samples.values()))) if samples else 0
+    outputs = pipeline.what_if_columns(state, samples, size)
+    valid = np.array([message is None for message in outputs['error'].tolist()], dtype=bool)
+    results = {}
+    for key in OUTPUT_FIELDS:
+        results[key] = np.full(size, np.nan)
+        results[key][valid] = outputs[key][valid].astype(np.float64)
+    return results, valid
+
+
+def iter_chunks(samples, size, chunk_size):
+    """Yields the samples in chunks of chunk_size."""
+    for start in range(0, size, chunk_size):
+        yield {field: values[start:start + chunk_size] for (field, values) in samples.items()}
+
+
+def evaluate_samples(state, samples, size, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """Returns the results of every sample, evaluated in chunks across a pool of processes.
+
+    Args:
+        state (dict): state of the scenario.
+        samples (dict): array of each uncertain field.
+        size (int): number of samples.
+        chunk_size (int): number of samples sent to a process at a time.
+        workers (int): number of processes. By default, the available cores.
+            With 1 worker or a single chunk, the samples are evaluated in
+            this process.
+
+    Returns:
+        results (dict): float array of each result, NaN for invalid samples.
+        valid (array): False for the invalid samples.
+    """
+    workers = workers or runner.available_cores()
+    chunks = list(iter_chunks(samples, size, chunk_size))
+    if workers == 1 or len(chunks) <= 1:
+        outputs = [evaluate_chunk(state, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(min(workers, len(chunks))) as executor:
+            outputs = list(executor.map(evaluate_chunk, itertools.repeat(state), chunks))
+    if not outputs:
+        return {key: np.array([]) for key in OUTPUT_FIELDS}, np.array([], dtype=bool)
+    results = {key: np.concatenate([chunk_results[key] for (chunk_results, _) in outputs]) for key in OUTPUT_FIELDS}
+    return results, np.concatenate([valid for (_, valid) in outputs])
+
+
+def compute_exceedance(state, samples, results, valid, thresholds=None):
+    """Returns exceedance probabilities among the valid samples.
+
+    Args:
+        state (dict): state of the scenario.
+        samples (dict): array of each uncertain field.
+        results (dict): float array of each result.
+        valid (array): False for the invalid samples.
+        thresholds (dict): additional threshold of each result.
+
+    Returns:
+        exceedance (dict): probability of each event, e.g.
+            'to_50_roll > to_length' or 'fuel_reserve < 0'.
+    """
+    count = valid.sum()
+    events = {}
+    for (key, limit) in LIMITS:
+        events['{} > {}'.format(key, limit)] = results[key] > samples.get(limit, state[limit])
+    events['fuel_reserve < 0'] = results['fuel_reserve'] < 0
+    for (key, threshold) in (thresholds or {}).items():
+        events['{} > {}'.format(key, threshold)] = results[key] > threshold
+    return {name: float((event & valid).sum()/count) if count else np.nan for (name, event) in events.items()}
+
+
+def run_monte_carlo(input_data, distributions, size=100000, seed=None, percentiles=DEFAULT_PERCENTILES,
+                    thresholds=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """Returns the distribution of the results of a scenario with uncertain fields.
+
+    Args:
+        input_data (dict): the input data of compute_performance.
+        distributions (dict): Distribution of each uncertain numeric field,
+            e.g. {'to_temp': normal(3), 'to_wind_direction': uniform(-30, 30)}.
+        size (int): number of samples.
+        seed (int): seed of the random generator.
+        percentiles (tuple): percentiles of the results.
+        thresholds (dict): additional exceedance threshold of each result,
+            e.g. {'to_50_roll': 1500}.
+        chunk_size (int): number of samples sent to a process at a time.
+        workers (int): number of processes (see evaluate_samples).
+
+    Returns:
+        result (MonteCarloResult): the samples, the results of each sample
+            (NaN for invalid samples), the valid samples, the percentiles
+            of each result ({result: {percentile: value}}) and the
+            exceedance probabilities (see compute_exceedance).
+    """
+    state = pipeline.evaluate(dict(input_data))
+    samples = draw_samples(state, distributions, size, seed)
+    results, valid = evaluate_samples(state, samples, size, chunk_size, workers)
+    summary = {}
+    for key in OUTPUT_FIELDS:
+        values = results[key][valid]
+        points = np.percentile(values, percentiles) if len(values) else np.full(len(percentiles), np.nan)
+        summary[key] = dict(zip(percentiles, points.tolist()))
+    exceedance = compute_exceedance(state, samples, results, valid, thresholds)
+    return MonteCarloResult(samples, results, valid, summary, exceedance)
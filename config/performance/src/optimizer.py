@@ -0,0 +1,175 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    optimizer.py
+
+DESCRIPTION:
+    This module searches the cruise altitude and rpm of a trip.
+
+    Every (pressure altitude, rpm) pair of the cruise power setting table
+    (power.csv, see power_index.py) is a candidate. The candidates are
+    evaluated at once with the array versions of the cruise and fuel
+    computations, with the temperature and the wind of each altitude, and
+    the result is the Pareto set of the fuel required and the trip time
+    (climb time plus cruise time): the candidates for which no other
+    candidate needs less fuel without taking longer, or is faster without
+    needing more fuel.
+
+    The other values of the trip (takeoff pressure altitude and
+    temperature, travel distance, cruise heading and fuel capacity) are
+    taken from a scenario, which must be valid. By default, the temperature
+    of each altitude is the cruise temperature of the scenario corrected
+    with the standard lapse rate (2 degrees Celsius per 1000 ft), and the
+    wind is the cruise wind of the scenario. The altitudes whose lapse-rate
+    temperature is outside the limits of the tables are not candidates
+    (their results would be extrapolated), while a temperature given for
+    an altitude must be within the limits.
+
+    Candidates without a result (see envelope.snap_cruise_points), whose
+    climb distance exceeds the travel distance, or whose ground speed is
+    not positive are discarded.
+"""
+
+import numpy as np
+from common.rules import parse_value
+from . import cruise
+from . import envelope
+from . import fuel
+from . import pipeline
+from . import power_index
+from . import schema
+from . import tables
+from . import wind
+
+OPTION_FIELDS = ['cr_press_alt', 'cr_power', 'cr_temp', 'cr_headwind', 'ktas', 'fuel_flow', 'max_endurance',
+                 'max_range', 'fuel_required', 'fuel_reserve', 'trip_time']
+
+
+def list_power_settings(index):
+    """Returns every (pressure altitude, rpm) pair of a PowerIndex, as two arrays."""
+    press_alts = np.concatenate([np.full(len(index.valid_rpm[press_alt]), press_alt) for press_alt in index.altitudes.tolist()])
+    rpms = np.concatenate([index.valid_rpm[press_alt] for press_alt in index.altitudes.tolist()])
+    return press_alts.astype(np.int64), rpms.astype(np.int64)
+
+
+def find_altitude_conditions(scenario, press_alts, temps=None, winds=None):
+    """Returns the temperature and the wind of each candidate altitude.
+
+    Args:
+        scenario (dict): parsed input fields of the scenario.
+        press_alts (array): candidate pressure altitudes.
+        temps (dict): temperature of each altitude.
+        winds (dict): (speed, direction) of the wind at each altitude.
+
+    Returns:
+        temp (array): temperature of each candidate.
+        wind_speed (array): wind speed of each candidate.
+        wind_direction (array): wind direction of each candidate.
+        in_range (array): False for the candidates whose lapse-rate
+            temperature is outside the limits of the tables.
+    """
+    temps, winds = temps or {}, winds or {}
+    conditions = {}
+    for press_alt in np.unique(press_alts).tolist():
+        default_temp = round(scenario['cr_temp'] - 0.002*(press_alt - scenario['cr_press_alt']))
+        in_range = schema.TEMPERATURE.min_value <= default_temp <= schema.TEMPERATURE.max_value
+        if press_alt in temps:
+            temp, in_range = temps[press_alt], True
+            schema.check_value(schema.TEMPERATURE, temp)
+        else:
+            temp = default_temp
+        wind_speed, wind_direction = winds.get(press_alt, (scenario['cr_wind_speed'], scenario['cr_wind_direction']))
+        schema.check_value(schema.WIND_SPEED, wind_speed)
+        schema.check_value(schema.WIND_DIRECTION, wind_direction)
+        conditions[press_alt] = (temp, wind_speed, wind_direction, in_range)
+    return tuple(np.array([conditions[press_alt][i] for press_alt in press_alts.tolist()]) for i in range(4))
+
+
+def find_pareto_front(fuel_required, trip_time):
+    """Returns True for the options that no other option improves in both values.
+
+    An option is dominated if another option needs no more fuel and takes
+    no longer, and is better in at least one of them. Of several identical
+    options, only the first one is kept.
+    """
+    order = np.lexsort((fuel_required, trip_time))
+    front = np.zeros(len(order), dtype=bool)
+    best_fuel = np.inf
+    for i in order.tolist():
+        if fuel_required[i] < best_fuel:
+            front[i] = True
+            best_fuel = fuel_required[i]
+    return front
+
+
+def evaluate_cruise_options(input_data, temps=None, winds=None):
+    """Returns the results of every cruise altitude and rpm of the power setting table.
+
+    Args:
+        input_data (dict): the input data of compute_performance.
+        temps (dict): temperature of each pressure altitude of the table.
+        winds (dict): (speed, direction) of the wind at each pressure
+            altitude of the table.
+
+    Returns:
+        options (dict): arrays with the OPTION_FIELDS of each valid
+            candidate, plus a 'pareto' field that is True for the Pareto
+            set of the fuel required and the trip time.
+    """
+    state = pipeline.evaluate(dict(input_data))
+    scenario = {field: parse_value(rule, state[field]) for (field, rule) in schema.SCHEMA.items()}
+    index = tables.get_compiled(tables.get_array_table('power'), power_index.compile_power_index)
+    press_alt, rpm = list_power_settings(index)
+    temp, wind_speed, wind_direction, in_range = find_altitude_conditions(scenario, press_alt, temps, winds)
+    # Discard the altitudes whose temperature is outside the tables.
+    press_alt, rpm, temp, wind_speed, wind_direction = (
+        values[in_range] for values in (press_alt, rpm, temp, wind_speed, wind_direction))
+    headwind, _ = wind.compute_wind_components(np.full(len(press_alt), scenario['cr_heading']), wind_speed, wind_direction)
+    # Discard the candidates that compute_cruise_performance rejects.
+    cruise_data, valid = envelope.snap_cruise_points(press_alt, temp, rpm, scenario['fuel_capacity'])
+    rows = np.flatnonzero(valid)
+    cruise_data = {key: values[rows] for (key, values) in cruise_data.items()}
+    cruise_data.update({'cr_headwind': headwind[rows], 'fuel_capacity': np.full(len(rows), scenario['fuel_capacity']),
+                        'to_press_alt': np.full(len(rows), state['valid_to_press_alt']),
+                        'real_to_temp': np.full(len(rows), scenario['to_temp']),
+                        'travel_dist': np.full(len(rows), scenario['travel_dist'])})
+    range_dfs = {40: tables.get_array_table('range40'), 50: tables.get_array_table('range50')}
+    endurance_dfs = {40: tables.get_array_table('endurance40'), 50: tables.get_array_table('endurance50')}
+    max_endurance, max_range, ktas, fuel_flow = cruise.compute_cruise_performance_batch(
+        cruise_data, tables.get_array_table('power'), range_dfs, endurance_dfs)
+    climb_df = tables.get_array_table('climb')
+    fuel_required, fuel_reserve, climb_data, cruise_time = fuel.compute_trip_batch(cruise_data, climb_df, ktas, fuel_flow)
+    # The climb time is in minutes.
+    trip_time = np.round(climb_data[0]/60 + cruise_time, 2)
+    options = {'cr_press_alt': press_alt[rows], 'cr_power': rpm[rows], 'cr_temp': temp[rows],
+               'cr_headwind': cruise_data['cr_headwind'], 'ktas': ktas, 'fuel_flow': fuel_flow,
+               'max_endurance': max_endurance, 'max_range': max_range, 'fuel_required': fuel_required,
+               'fuel_reserve': fuel_reserve, 'trip_time': trip_time}
+    # Discard the candidates that cannot reach their altitude within the trip or cannot make progress.
+    reachable = fuel.compute_ground_speed_batch(ktas, cruise_data['cr_headwind']) > 0
+    reachable &= climb_data[2] <= cruise_data['travel_dist']
+    options = {key: values[reachable] for (key, values) in options.items()}
+    options['pareto'] = find_pareto_front(options['fuel_required'], options['trip_time'])
+    return options
+
+
+def optimize_cruise(input_data, temps=None, winds=None):
+    """Returns the Pareto set of cruise altitudes and rpm of a trip, sorted by trip time.
+
+    Args:
+        input_data (dict): the input data of compute_performance.
+        temps (dict): temperature of each pressure altitude of the table.
+        winds (dict): (speed, direction) of the wind at each pressure
+            altitude of the table.
+
+    Returns:
+        options (dict): arrays with the OPTION_FIELDS of each option of the
+            Pareto set, from the fastest to the most economical.
+    """
+    options = evaluate_cruise_options(input_data, temps, winds)
+    front = np.flatnonzero(options['pareto'])
+    front = front[np.argsort(options['trip_time'][front], kind='stable')]
+    return {key: options[key][front] for key in OPTION_FIELDS}
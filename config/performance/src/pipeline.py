@@ -0,0 +1,467 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    pipeline.py
+
+DESCRIPTION:
+    This module describes compute_performance as an explicit graph of
+    stages, so that a scenario can be edited without recomputing the
+    stages the edit does not affect ("what-if" computations).
+
+    Every Stage declares the values it reads and the values it writes.
+    The values are kept in a flat state dict: the input fields of
+    compute_performance, unchanged, plus the values written by the stages.
+    The stages, in execution order, are:
+
+    > takeoff_data, cruise_data, landing_data: the valid table values of
+      each phase (see data.py).
+    > takeoff_wind, cruise_wind, landing_wind: the wind component of each
+      phase (see wind.py).
+    > takeoff, cruise, fuel, landing: the performance results.
+
+    compute_performance runs these stages (see run_performance.py), so
+    both always give the same results.
+
+    evaluate() runs every stage and returns the state of a scenario.
+    what_if() takes a previous state and the changed input fields, checks
+    only the changed fields, and runs only the stages that read a changed
+    value, directly or through another stage. For example, a new landing
+    temperature only runs landing_data and landing, so the result is
+    available in a few microseconds, while a new cruise altitude runs the
+    cruise and fuel stages too. The results are identical to those of
+    compute_performance for the edited scenario.
+
+    what_if_batch() evaluates many variants of one scenario at once, given
+    as deltas from the scenario (e.g. 5 degrees hotter, 100 pounds heavier
+    or a wind that backs 30 degrees). The variants share the state of the
+    scenario: only the stages affected by the changed fields are run, with
+    their array versions, and the values they read from unchanged fields
+    (e.g. the snapped table values or the wind of the other phases) are
+    taken from the scenario instead of being recomputed. what_if_columns()
+    does the same for variants given as arrays of field values (e.g. the
+    samples of montecarlo.py).
+"""
+
+import functools
+from collections import namedtuple
+import numpy as np
+from common.rules import parse_value
+from . import data
+from . import grids
+from . import power_index
+from . import wind
+from . import takeoff
+from . import cruise
+from . import fuel
+from . import landing
+from . import tables
+from . import errors
+from . import input_check
+from . import schema
+from . import run_performance
+
+Stage = namedtuple('Stage', ['name', 'reads', 'writes', 'function', 'batch_function'])
+
+# Input fields in degrees, which wrap around when a delta is applied.
+ANGLE_FIELDS = ('to_heading', 'to_wind_direction', 'cr_heading', 'cr_wind_direction', 'land_heading', 'land_wind_direction')
+
+
+def compute_takeoff_data(state):
+    return {'valid_to_weight': data.valid_takeoff_weight(state['to_weight']),
+            'valid_to_press_alt': data.valid_takeoff_press_alt(state['to_press_alt']),
+            'valid_to_temp': data.valid_takeoff_temp(state['to_temp']),
+            'roc_press_alt': data.valid_roc_press_alt(state['to_press_alt']),
+            'roc_temp': data.valid_roc_temp(state['to_temp'])}
+
+
+def compute_takeoff_data_batch(state):
+    """Array version of compute_takeoff_data."""
+    return {'valid_to_weight': grids.snap_array(grids.TAKEOFF_WEIGHT, state['to_weight']),
+            'valid_to_press_alt': grids.snap_array(grids.TAKEOFF_PRESS_ALT, state['to_press_alt']),
+            'valid_to_temp': grids.snap_array(grids.TAKEOFF_TEMP, state['to_temp']),
+            'roc_press_alt': grids.snap_array(grids.ROC_PRESS_ALT, state['to_press_alt']),
+            'roc_temp': grids.snap_array(grids.ROC_TEMP, state['to_temp'])}
+
+
+def compute_cruise_data(state):
+    press_alt = state['cr_press_alt']
+    power_press_alt = data.valid_cruise_power_press_alt(press_alt)
+    return {'cr_press_alt_500': data.valid_cruise_press_alt_500(press_alt),
+            'cr_press_alt_1000': data.valid_cruise_press_alt_1000(press_alt),
+            'cr_power_press_alt': power_press_alt,
+            'valid_cr_power': data.valid_cruise_rpm(tables.get_array_table('power'), power_press_alt, state['cr_power'])}
+
+
+def compute_cruise_data_batch(state):
+    """Array version of compute_cruise_data."""
+    press_alt = state['cr_press_alt']
+    power_press_alt = grids.snap_array(grids.CRUISE_POWER_PRESS_ALT, press_alt)
+    index = tables.get_compiled(tables.get_array_table('power'), power_index.compile_power_index)
+    return {'cr_press_alt_500': grids.snap_array(grids.CRUISE_PRESS_ALT_500, press_alt),
+            'cr_press_alt_1000': grids.snap_array(grids.CRUISE_PRESS_ALT_1000, press_alt),
+            'cr_power_press_alt': power_press_alt,
+            'valid_cr_power': power_index.snap_rpm_array(index, power_press_alt, state['cr_power'])}
+
+
+def compute_landing_data(state):
+    return {'valid_land_press_alt': data.valid_landing_press_alt(state['land_press_alt']),
+            'valid_land_temp': data.valid_landing_temp(state['land_temp'])}
+
+
+def compute_landing_data_batch(state):
+    """Array version of compute_landing_data."""
+    return {'valid_land_press_alt': grids.snap_array(grids.LANDING_PRESS_ALT, state['land_press_alt']),
+            'valid_land_temp': grids.snap_array(grids.LANDING_TEMP, state['land_temp'])}
+
+
+def wind_stage(phase):
+    """Returns the functions of the wind stage of a phase ('to', 'cr' or 'land').
+
+    The scalar function writes the wind component of compute_wind_component
+    and the equivalent signed headwind (see wind.py), the array function
+    only the signed headwind.
+    """
+    def compute_wind(state):
+        component = wind.compute_wind_component(state[phase + '_heading'], state[phase + '_wind_speed'],
+                                                state[phase + '_wind_direction'])
+        headwind = {'H': component[0], 'T': -component[0]}.get(component[1], 0.0)
+        return {phase + '_wind_component': component, phase + '_headwind': headwind}
+
+    def compute_wind_batch(state):
+        headwind, _ = wind.compute_wind_components(state[phase + '_heading'], state[phase + '_wind_speed'],
+                                                   state[phase + '_wind_direction'])
+        return {phase + '_headwind': headwind}
+
+    return compute_wind, compute_wind_batch
+
+
+def compute_takeoff(state):
+    speed, direction = state['to_wind_component']
+    input_data = {'to_weight': state['valid_to_weight'], 'to_press_alt': state['valid_to_press_alt'],
+                  'to_temp': state['valid_to_temp'], 'to_wind_speed': speed, 'to_wind_direction': direction,
+                  'to_condition': state['to_condition'], 'roc_press_alt': state['roc_press_alt'],
+                  'roc_temp': state['roc_temp']}
+    values = takeoff.compute_takeoff_performance(input_data, tables.get_array_table('takeoff'), tables.get_array_table('roc'))
+    return dict(zip(('to_roll', 'to_50_roll', 'to_roc'), values))
+
+
+def compute_takeoff_batch(state):
+    """Array version of compute_takeoff."""
+    input_data = {'to_weight': state['valid_to_weight'], 'to_press_alt': state['valid_to_press_alt'],
+                  'to_temp': state['valid_to_temp'], 'to_headwind': state['to_headwind'],
+                  'to_condition': state['to_condition'], 'roc_press_alt': state['roc_press_alt'],
+                  'roc_temp': state['roc_temp']}
+    values = takeoff.compute_takeoff_performance_batch(input_data, tables.get_array_table('takeoff'),
+                                                       tables.get_array_table('roc'))
+    return dict(zip(('to_roll', 'to_50_roll', 'to_roc'), values))
+
+
+def compute_cruise(state):
+    speed, direction = state['cr_wind_component']
+    input_data = {'cr_press_alt_500': state['cr_press_alt_500'], 'cr_press_alt_1000': state['cr_press_alt_1000'],
+                  'cr_temp': state['cr_temp'], 'cr_power_press_alt': state['cr_power_press_alt'],
+                  'cr_power': state['valid_cr_power'], 'cr_wind_speed': speed, 'cr_wind_direction': direction}
+    capacity = 40 if state['fuel_capacity'] == 40 else 50
+    values = cruise.compute_cruise_performance(input_data, tables.get_array_table('power'),
+                                               tables.get_array_table('range{}'.format(capacity)),
+                                               tables.get_array_table('endurance{}'.format(capacity)))
+    return dict(zip(('max_endurance', 'max_range', 'ktas', 'fuel_flow'), values))
+
+
+def compute_cruise_batch(state):
+    """Array version of compute_cruise."""
+    input_data = {'cr_press_alt_500': state['cr_press_alt_500'], 'cr_press_alt_1000': state['cr_press_alt_1000'],
+                  'cr_temp': state['cr_temp'], 'cr_power_press_alt': state['cr_power_press_alt'],
+                  'cr_power': state['valid_cr_power'], 'cr_headwind': state['cr_headwind'],
+                  'fuel_capacity': state['fuel_capacity']}
+    range_dfs = {40: tables.get_array_table('range40'), 50: tables.get_array_table('range50')}
+    endurance_dfs = {40: tables.get_array_table('endurance40'), 50: tables.get_array_table('endurance50')}
+    values = cruise.compute_cruise_performance_batch(input_data, tables.get_array_table('power'), range_dfs, endurance_dfs)
+    return dict(zip(('max_endurance', 'max_range', 'ktas', 'fuel_flow'), values))
+
+
+def compute_fuel(state):
+    speed, direction = state['cr_wind_component']
+    input_data = {'to_press_alt': state['valid_to_press_alt'], 'real_to_temp': state['to_temp'],
+                  'cr_press_alt_1000': state['cr_press_alt_1000'], 'cr_temp': state['cr_temp'],
+                  'travel_dist': state['travel_dist'], 'cr_wind_speed': speed, 'cr_wind_direction': direction,
+                  'fuel_capacity': state['fuel_capacity']}
+    values = fuel.compute_fuel_required(input_data, tables.get_array_table('climb'), state['ktas'], state['fuel_flow'])
+    return dict(zip(('fuel_required', 'fuel_reserve'), values))
+
+
+def compute_fuel_batch(state):
+    """Array version of compute_fuel."""
+    input_data = {'to_press_alt': state['valid_to_press_alt'], 'real_to_temp': state['to_temp'],
+                  'cr_press_alt_1000': state['cr_press_alt_1000'], 'cr_temp': state['cr_temp'],
+                  'travel_dist': state['travel_dist'], 'cr_headwind': state['cr_headwind'],
+                  'fuel_capacity': state['fuel_capacity']}
+    values = fuel.compute_fuel_required_batch(input_data, tables.get_array_table('climb'), state['ktas'], state['fuel_flow'])
+    return dict(zip(('fuel_required', 'fuel_reserve'), values))
+
+
+def compute_landing(state):
+    speed, direction = state['land_wind_component']
+    input_data = {'land_press_alt': state['valid_land_press_alt'], 'land_temp': state['valid_land_temp'],
+                  'land_wind_speed': speed, 'land_wind_direction': direction, 'land_condition': state['land_condition']}
+    values = landing.compute_landing_performance(input_data, tables.get_array_table('landing'))
+    return dict(zip(('land_roll', 'land_50_roll'), values))
+
+
+def compute_landing_batch(state):
+    """Array version of compute_landing."""
+    input_data = {'land_press_alt': state['valid_land_press_alt'], 'land_temp': state['valid_land_temp'],
+                  'land_headwind': state['land_headwind'], 'land_condition': state['land_condition']}
+    values = landing.compute_landing_performance_batch(input_data, tables.get_array_table('landing'))
+    return dict(zip(('land_roll', 'land_50_roll'), values))
+
+
+# Stages in execution order: every value is written before it is read.
+STAGES = [
+    Stage('takeoff_data', ('to_weight', 'to_press_alt', 'to_temp'),
+          ('valid_to_weight', 'valid_to_press_alt', 'valid_to_temp', 'roc_press_alt', 'roc_temp'),
+          compute_takeoff_data, compute_takeoff_data_batch),
+    Stage('cruise_data', ('cr_press_alt', 'cr_power'),
+          ('cr_press_alt_500', 'cr_press_alt_1000', 'cr_power_press_alt', 'valid_cr_power'),
+          compute_cruise_data, compute_cruise_data_batch),
+    Stage('landing_data', ('land_press_alt', 'land_temp'), ('valid_land_press_alt', 'valid_land_temp'),
+          compute_landing_data, compute_landing_data_batch),
+    Stage('takeoff_wind', ('to_heading', 'to_wind_speed', 'to_wind_direction'), ('to_wind_component', 'to_headwind'),
+          *wind_stage('to')),
+    Stage('cruise_wind', ('cr_heading', 'cr_wind_speed', 'cr_wind_direction'), ('cr_wind_component', 'cr_headwind'),
+          *wind_stage('cr')),
+    Stage('landing_wind', ('land_heading', 'land_wind_speed', 'land_wind_direction'),
+          ('land_wind_component', 'land_headwind'), *wind_stage('land')),
+    Stage('takeoff', ('valid_to_weight', 'valid_to_press_alt', 'valid_to_temp', 'roc_press_alt', 'roc_temp',
+                      'to_headwind', 'to_condition'), ('to_roll', 'to_50_roll', 'to_roc'),
+          compute_takeoff, compute_takeoff_batch),
+    Stage('cruise', ('cr_press_alt_500', 'cr_press_alt_1000', 'cr_temp', 'cr_power_press_alt', 'valid_cr_power',
+                     'cr_headwind', 'fuel_capacity'), ('max_endurance', 'max_range', 'ktas', 'fuel_flow'),
+          compute_cruise, compute_cruise_batch),
+    Stage('fuel', ('valid_to_press_alt', 'to_temp', 'cr_press_alt_1000', 'cr_temp', 'travel_dist', 'cr_headwind',
+                   'fuel_capacity', 'ktas', 'fuel_flow'), ('fuel_required', 'fuel_reserve'),
+          compute_fuel, compute_fuel_batch),
+    Stage('landing', ('valid_land_press_alt', 'valid_land_temp', 'land_headwind', 'land_condition'),
+          ('land_roll', 'land_50_roll'), compute_landing, compute_landing_batch),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def find_affected_stages(changed_fields):
+    """Returns the stages that must be run when the given values change.
+
+    Args:
+        changed_fields (frozenset): names of the changed values.
+
+    Returns:
+        stages (tuple): affected stages, in execution order.
+    """
+    dirty = set(changed_fields)
+    stages = []
+    for stage in STAGES:
+        if dirty.intersection(stage.reads):
+            stages.append(stage)
+            dirty.update(stage.writes)
+    return tuple(stages)
+
+
+@functools.lru_cache(maxsize=None)
+def get_stages(*names):
+    """Returns the stages with the given names, in execution order."""
+    return tuple(stage for stage in STAGES if stage.name in names)
+
+
+def affected_stages(changed_fields):
+    """Returns the names of the stages that a change of the given input fields runs."""
+    return [stage.name for stage in find_affected_stages(frozenset(changed_fields))]
+
+
+def run_stages(state, stages):
+    """Runs the stages, storing the values they write in state."""
+    for stage in stages:
+        state.update(stage.function(state))
+    return None
+
+
+def evaluate(input_data):
+    """Returns the state of a scenario, with every stage computed.
+
+    Args:
+        input_data (dict): the input data of compute_performance.
+
+    Returns:
+        state (dict): input fields and values written by every stage.
+    """
+    input_check.check_input_data(input_data)
+    state = {field: input_data[field] for field in run_performance.INPUT_FIELDS}
+    run_stages(state, STAGES)
+    return state
+
+
+def what_if(state, changes):
+    """Returns the state of a scenario after changing some of its input fields.
+
+    Only the changed fields are checked, and only the stages affected by
+    them are run. The previous state is not modified.
+
+    Args:
+        state (dict): state returned by evaluate() or what_if().
+        changes (dict): new value of each changed input field.
+
+    Returns:
+        state (dict): the state of the edited scenario.
+    """
+    unknown = set(changes).difference(run_performance.INPUT_FIELDS)
+    if unknown:
+        raise ValueError('Unknown input fields: {}.'.format(', '.join(sorted(unknown))))
+    # The unchanged fields are valid, so the first invalid changed field is the
+    # one compute_performance would report.
+    for (field, rule) in schema.SCHEMA.items():
+        if field in changes:
+            schema.check_value(rule, changes[field])
+    new_state = dict(state)
+    new_state.update(changes)
+    run_stages(new_state, find_affected_stages(frozenset(field for field in changes if changes[field] != state[field])))
+    return new_state
+
+
+def get_results(state):
+    """Returns the results of a state, as returned by compute_performance."""
+    return {key: state[key] for key in run_performance.OUTPUT_FIELDS}
+
+
+class BatchState(dict):
+    """State of many variants of one scenario, as arrays.
+
+    The values that are not set are those of the scenario, broadcast to an
+    array the first time they are read.
+    """
+
+    def __init__(self, baseline, size):
+        super().__init__()
+        self.baseline = baseline
+        self.size = size
+
+    def __missing__(self, key):
+        value = self[key] = np.full(self.size, self.baseline[key])
+        return value
+
+
+def apply_deltas(state, deltas):
+    """Returns the input fields changed by the deltas, as one array per field.
+
+    Numeric deltas are added to the value of the scenario, with the angles
+    wrapping around between 1 and 360 degrees. The runway conditions are
+    replaced instead. As in compute_performance_batch, the rpm deltas must
+    be integers.
+
+    Args:
+        state (dict): state of the scenario.
+        deltas (list): one dict per variant, with the delta of each changed field.
+
+    Returns:
+        columns (dict): value of each changed field for every variant, in SCHEMA order.
+    """
+    unknown = set().union(*deltas).difference(run_performance.INPUT_FIELDS)
+    if unknown:
+        raise ValueError('Unknown input fields: {}.'.format(', '.join(sorted(unknown))))
+    columns = {}
+    for (field, rule) in schema.SCHEMA.items():
+        if not any(field in delta for delta in deltas):
+            continue
+        value = parse_value(rule, state[field])
+        if rule.kind == 'str':
+            columns[field] = np.array([delta.get(field, value) for delta in deltas])
+            continue
+        column = value + np.array([delta.get(field, 0) for delta in deltas])
+        if field in ANGLE_FIELDS:
+            column = (column - 1) % 360 + 1
+        columns[field] = column
+    return columns
+
+
+def compute_variants(state, columns, rows, stages, results, messages):
+    """Computes the given rows of checked variants, recording their errors.
+
+    As in compute_performance_batch, rows with a PerformanceError are split
+    in halves down to MIN_SPLIT_SIZE variants, which are then computed one
+    by one with what_if.
+
+    Args:
+        state (dict): state of the scenario.
+        columns (dict): value of each changed field for every variant.
+        rows (array): positions of the variants to compute.
+        stages (tuple): stages affected by the changed fields.
+        results (dict): object arrays where the results are stored.
+        messages (array): object array where the error messages are stored.
+    """
+    if len(rows) == 0:
+        return None
+    batch_state = BatchState(state, len(rows))
+    batch_state.update({field: column[rows] for (field, column) in columns.items()})
+    try:
+        for stage in stages:
+            batch_state.update(stage.batch_function(batch_state))
+    except errors.PerformanceError:
+        if len(rows) > run_performance.MIN_SPLIT_SIZE:
+            half = len(rows)//2
+            compute_variants(state, columns, rows[:half], stages, results, messages)
+            compute_variants(state, columns, rows[half:], stages, results, messages)
+            return None
+        for row in rows.tolist():
+            try:
+                output = what_if(state, {field: column[row].item() for (field, column) in columns.items()})
+            except errors.PerformanceError as error:
+                messages[row] = str(error)
+                continue
+            for key in run_performance.OUTPUT_FIELDS:
+                results[key][row] = output[key]
+        return None
+    for key in run_performance.OUTPUT_FIELDS:
+        results[key][rows] = batch_state[key].tolist()
+    return None
+
+
+def what_if_batch(state, deltas):
+    """Returns the results of many variants of a scenario at once.
+
+    The results are identical to those of compute_performance for each
+    variant. As with compute_performance_batch(on_error='record'), the
+    invalid variants get None results and an error message.
+
+    Args:
+        state (dict): state returned by evaluate() or what_if().
+        deltas (list): one dict per variant, with the delta of each changed
+            input field (see apply_deltas), e.g. {'to_temp': 5, 'to_weight': 100}.
+
+    Returns:
+        results (dict): object arrays with the same fields as the results
+            of compute_performance, one element per variant, plus an
+            'error' field (None for valid variants).
+    """
+    return what_if_columns(state, apply_deltas(state, deltas), len(deltas))
+
+
+def what_if_columns(state, columns, size):
+    """Returns the results of many variants of a scenario, given by the values of their changed fields.
+
+    Args:
+        state (dict): state returned by evaluate() or what_if().
+        columns (dict): array with the value of each changed input field
+            for every variant.
+        size (int): number of variants.
+
+    Returns:
+        results (dict): the results of what_if_batch.
+    """
+    if columns:
+        invalid, messages = schema.validate_columns(columns, {field: schema.SCHEMA[field] for field in columns})
+    else:
+        invalid, messages = np.zeros(size, dtype=bool), np.full(size, None, dtype=object)
+    results = {key: np.full(size, None, dtype=object) for key in run_performance.OUTPUT_FIELDS}
+    compute_variants(state, columns, np.flatnonzero(~invalid), find_affected_stages(frozenset(columns)), results, messages)
+    results['error'] = messages
+    return results
@@ -0,0 +1,149 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    power_index.py
+
+DESCRIPTION:
+    This module indexes the cruise power setting table (power.csv).
+
+    The table has a row for every valid (pressure altitude, rpm) pair and
+    three groups of columns (bhp, ktas and gph), one for each standard
+    temperature difference (ISA-20, ISA, ISA+20). The table is compiled
+    once into a PowerIndex:
+
+    > valid_rpm: valid rpm values for each pressure altitude, as arrays
+      sorted from the highest to the lowest rpm (table order).
+    > snapped_rpm: the valid rpm for every integer rpm between the lowest
+      and the highest rpm of the table, for each pressure altitude. The
+      value is -1 if there is no valid rpm.
+    > settings: dictionary from (press_alt, rpm, std_temp_difference) to
+      (bhp, ktas, gph).
+    > bhp, ktas, gph: the same values as arrays indexed by
+      [press_alt, rpm, std_temp_difference] position.
+
+    Both the rpm approximation and the power setting lookup are therefore
+    constant time, for a single scenario or for arrays of scenarios.
+"""
+
+import bisect
+from collections import namedtuple
+import numpy as np
+from . import cubes
+from .errors import PowerSettingError
+
+STD_TEMP_DIFFERENCES = ('isa_m20', 'isa', 'isa_p20')
+# Error messages.
+MSG_ERROR_LOW_RPM = 'Cruise rpm | ERROR: The rpm is below the lowest valid rpm for the cruise pressure altitude.'
+MSG_ERROR_NO_SETTING = 'Cruise rpm | ERROR: The power setting table has no entry for the cruise rpm, pressure altitude and temperature.'
+
+PowerIndex = namedtuple('PowerIndex', ['altitudes', 'valid_rpm', 'rpm_range', 'snapped_rpm',
+                                       'rpm_levels', 'settings', 'bhp', 'ktas', 'gph'])
+
+
+def approximate_rpm(rpm_values, cruise_rpm):
+    """Returns the valid rpm for cruise_rpm.
+
+    If cruise_rpm is not a valid rpm, it is approximated to the immediate
+    inferior or superior valid value.
+
+    Args:
+        rpm_values (list): valid rpm values sorted from highest to lowest.
+        cruise_rpm (int): rpm selected by the pilot.
+
+    Returns:
+        valid_rpm (int): approximated rpm.
+    """
+    rpm_values = list(rpm_values)
+    if cruise_rpm in rpm_values:
+        return cruise_rpm
+    bisect.insort(rpm_values, cruise_rpm, key=lambda x: -x)
+    rpm_index = rpm_values.index(cruise_rpm)
+    low_rpm = rpm_values[rpm_index-1]
+    high_rpm = rpm_values[rpm_index+1]
+    if cruise_rpm < (high_rpm + low_rpm)/2:
+        return low_rpm
+    return high_rpm
+
+
+def compile_power_index(power_df):
+    """Returns the PowerIndex of the cruise power setting table (ArrayTable or dataframe)."""
+    press_alt_column = np.asarray(power_df['press_alt'])
+    rpm_column = np.asarray(power_df['rpm'])
+    altitudes = np.unique(press_alt_column)
+    rpm_levels = np.unique(rpm_column)
+    rpm_range = (int(rpm_levels[0]), int(rpm_levels[-1]))
+    valid_rpm = {}
+    snapped_rpm = np.full((len(altitudes), rpm_range[1] - rpm_range[0] + 1), -1, dtype=np.int64)
+    for (i, press_alt) in enumerate(altitudes.tolist()):
+        rpm_values = np.sort(rpm_column[press_alt_column == press_alt])[::-1]
+        valid_rpm[press_alt] = rpm_values
+        for rpm in range(rpm_range[0], rpm_range[1] + 1):
+            try:
+                snapped_rpm[i, rpm - rpm_range[0]] = approximate_rpm(rpm_values.tolist(), rpm)
+            except IndexError:
+                continue
+    shape = (len(altitudes), len(rpm_levels), len(STD_TEMP_DIFFERENCES))
+    bhp = np.full(shape, -1, dtype=np.int64)
+    ktas = np.full(shape, -1, dtype=np.int64)
+    gph = np.full(shape, np.nan)
+    settings = {}
+    columns = {column: np.asarray(power_df[column]) for column in power_df.columns}
+    for row in range(len(power_df)):
+        i = int(np.searchsorted(altitudes, press_alt_column[row]))
+        j = int(np.searchsorted(rpm_levels, rpm_column[row]))
+        for (k, std_temp_difference) in enumerate(STD_TEMP_DIFFERENCES):
+            setting = (int(columns[std_temp_difference + '_bhp'][row]), int(columns[std_temp_difference + '_ktas'][row]),
+                       np.float64(columns[std_temp_difference + '_gph'][row]))
+            settings[(int(press_alt_column[row]), int(rpm_column[row]), std_temp_difference)] = setting
+            bhp[i, j, k], ktas[i, j, k], gph[i, j, k] = setting
+    for array in (snapped_rpm, bhp, ktas, gph):
+        array.flags.writeable = False
+    return PowerIndex(altitudes, valid_rpm, rpm_range, snapped_rpm, rpm_levels, settings, bhp, ktas, gph)
+
+
+def snap_rpm(index, press_alt, rpm):
+    """Returns the valid rpm for the cruise power pressure altitude.
+
+    Raises a PowerSettingError if rpm is below the lowest valid rpm.
+    """
+    rpm_values = index.valid_rpm[press_alt]
+    if rpm > index.rpm_range[1]:
+        return int(rpm_values[0])
+    if rpm < index.rpm_range[0]:
+        raise PowerSettingError(MSG_ERROR_LOW_RPM)
+    valid_rpm = index.snapped_rpm[int(np.searchsorted(index.altitudes, press_alt)), rpm - index.rpm_range[0]]
+    if valid_rpm < 0:
+        raise PowerSettingError(MSG_ERROR_LOW_RPM)
+    return int(valid_rpm)
+
+
+def snap_rpm_array(index, press_alt, rpm):
+    """Array version of snap_rpm. The rpm values must be integers."""
+    altitude_positions = cubes.compute_grid_positions(index.altitudes, press_alt)
+    offsets = np.clip(rpm - index.rpm_range[0], 0, index.snapped_rpm.shape[1] - 1)
+    valid_rpm = index.snapped_rpm[altitude_positions, offsets]
+    if np.any((valid_rpm < 0) | (rpm < index.rpm_range[0])):
+        raise PowerSettingError(MSG_ERROR_LOW_RPM)
+    return valid_rpm
+
+
+def lookup_power_setting(index, press_alt, rpm, std_temp_difference):
+    """Returns the (bhp, ktas, gph) power setting."""
+    try:
+        return index.settings[(press_alt, rpm, std_temp_difference)]
+    except KeyError:
+        raise PowerSettingError(MSG_ERROR_NO_SETTING) from None
+
+
+def lookup_power_setting_array(index, press_alt, rpm, std_temp_difference):
+    """Array version of lookup_power_setting."""
+    i = cubes.compute_grid_positions(index.altitudes, press_alt)
+    j = cubes.compute_grid_positions(index.rpm_levels, rpm)
+    k = np.select([std_temp_difference == value for value in STD_TEMP_DIFFERENCES], range(len(STD_TEMP_DIFFERENCES)), -1)
+    bhp = index.bhp[i, j, k]
+    if np.any(bhp < 0):
+        raise PowerSettingError(MSG_ERROR_NO_SETTING)
+    return bhp, index.ktas[i, j, k], index.gph[i, j, k]
@@ -0,0 +1,196 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    precompute.py
+
+DESCRIPTION:
+    This module runs the offline build steps: the table bundle and the
+    precomputed takeoff and landing distances.
+
+    compile_bundle() compiles every .csv file of the data folder into the
+    binary bundle described in bundle.py (tables.BUNDLE_FILE), which
+    tables.py prefers to the .csv files at runtime:
+
+        python -m performance.src.precompute bundle
+
+    Once the input data has been validated (see data.py), the takeoff
+    distances only depend on the weight (3 valid values), the pressure
+    altitude (9) and the temperature (5), and the landing distances on the
+    pressure altitude and the temperature. The wind and runway condition
+    corrections are applied afterwards. The build step enumerates that
+    discrete space and stores the ground roll and 50 ft roll of every
+    combination in a compact .npz file (PRECOMPUTED_FILE):
+
+        python -m performance.src.precompute build
+        python -m performance.src.precompute verify
+
+    The file also stores the SHA-256 digest of the .csv files it was built
+    from. install() loads the file at startup and registers the distance
+    cubes in tables.py, so compute_takeoff_performance and
+    compute_landing_performance reduce to an index lookup plus the wind
+    and runway condition corrections. If the file is missing, has another
+    version or was built from different tables, it is ignored and the
+    cubes are compiled from the .csv files as before.
+
+    The verify mode checks every precomputed distance against the scalar
+    takeoff and landing functions applied to the .csv tables.
+"""
+
+import argparse
+import hashlib
+import itertools
+import sys
+from pathlib import Path
+import numpy as np
+from . import bundle
+from . import cubes
+from . import tables
+from . import takeoff
+from . import landing
+
+FORMAT_VERSION = 1
+PRECOMPUTED_FILE = tables.DATA_DIR / 'precomputed.npz'
+
+# Cube name: (table name, cube compiler, scalar distance function).
+CUBES = {
+    'takeoff': ('takeoff', cubes.compile_takeoff_cube, takeoff.compute_takeoff_ground_roll),
+    'landing': ('landing', cubes.compile_landing_cube, landing.compute_landing_ground_roll),
+}
+
+
+def compute_source_digest(folder_path=tables.DATA_DIR):
+    """Returns the SHA-256 digest of the tables used by the precomputed cubes."""
+    digest = hashlib.sha256()
+    for (table_name, _, _) in CUBES.values():
+        digest.update(table_name.encode())
+        digest.update((Path(folder_path) / tables.TABLE_SPECS[table_name][0]).read_bytes())
+    return digest.hexdigest()
+
+
+def compile_bundle(path=tables.BUNDLE_FILE, folder_path=tables.DATA_DIR):
+    """Compiles the performance .csv files into a table bundle.
+
+    Args:
+        path: output bundle file.
+        folder_path: folder containing the performance .csv files.
+
+    Returns:
+        path: the output file.
+    """
+    dfs, _ = tables.load_tables(folder_path, bundle_path=None)
+    return bundle.write_bundle(path, dfs, tables.compute_source_digest(folder_path))
+
+
+def build(path=PRECOMPUTED_FILE, folder_path=tables.DATA_DIR):
+    """Writes the precomputed takeoff and landing distances to path.
+
+    Args:
+        path: output .npz file.
+        folder_path: folder containing the performance .csv files.
+
+    Returns:
+        path: the output file.
+    """
+    dfs, _ = tables.load_tables(folder_path, bundle_path=None)
+    arrays = {'version': np.array(FORMAT_VERSION), 'digest': np.array(compute_source_digest(folder_path))}
+    for (name, (table_name, compiler, _)) in CUBES.items():
+        cube = compiler(dfs[table_name])
+        for (i, axis) in enumerate(cube.axes):
+            arrays['{}_axis_{}'.format(name, i)] = axis.astype(np.int32)
+        # The distances are below 32767 ft, so 16 bits are enough.
+        arrays[name + '_ground_roll'] = cube.ground_roll.astype(np.int16)
+        arrays[name + '_fifty_ft_roll'] = cube.fifty_ft_roll.astype(np.int16)
+    with open(path, 'wb') as file:
+        np.savez_compressed(file, **arrays)
+    return path
+
+
+def load(path=PRECOMPUTED_FILE, folder_path=tables.DATA_DIR):
+    """Returns the precomputed distance cubes by name.
+
+    Returns None if the file does not exist, has another format version,
+    or was built from tables that differ from the current .csv files.
+    """
+    if not Path(path).exists():
+        return None
+    with np.load(path) as arrays:
+        if int(arrays['version']) != FORMAT_VERSION or str(arrays['digest']) != compute_source_digest(folder_path):
+            return None
+        precomputed = {}
+        for name in CUBES:
+            axes = []
+            while '{}_axis_{}'.format(name, len(axes)) in arrays:
+                axes.append(arrays['{}_axis_{}'.format(name, len(axes))].astype(np.int64))
+            ground_roll = arrays[name + '_ground_roll'].astype(np.int64)
+            fifty_ft_roll = arrays[name + '_fifty_ft_roll'].astype(np.int64)
+            ground_roll.flags.writeable = False
+            fifty_ft_roll.flags.writeable = False
+            positions = tuple({value.item(): index for (index, value) in enumerate(axis)} for axis in axes)
+            precomputed[name] = cubes.DistanceCube(tuple(axes), positions, ground_roll, fifty_ft_roll)
+    return precomputed
+
+
+def install(path=PRECOMPUTED_FILE):
+    """Registers the precomputed cubes for the registered tables.
+
+    Returns:
+        installed (bool): False if the file could not be used.
+    """
+    precomputed = load(path)
+    if precomputed is None:
+        return False
+    for (name, (table_name, compiler, _)) in CUBES.items():
+        tables.register_precompiled(table_name, compiler, precomputed[name])
+    return True
+
+
+def verify(path=PRECOMPUTED_FILE, folder_path=tables.DATA_DIR):
+    """Checks the precomputed distances against the scalar functions.
+
+    Every combination of valid values is computed with
+    compute_takeoff_ground_roll and compute_landing_ground_roll from the
+    .csv tables and compared with the precomputed file.
+
+    Returns:
+        errors (list): description of every difference, empty if the file is valid.
+    """
+    precomputed = load(path, folder_path)
+    if precomputed is None:
+        return ['{} is missing or out of date.'.format(path)]
+    dfs, _ = tables.load_tables(folder_path, bundle_path=None)
+    errors = []
+    for (name, (table_name, _, compute_ground_roll)) in CUBES.items():
+        cube = precomputed[name]
+        for keys in itertools.product(*(axis.tolist() for axis in cube.axes)):
+            expected = tuple(int(value) for value in compute_ground_roll(*keys, dfs[table_name]))
+            obtained = tuple(int(value) for value in cubes.lookup_distances(cube, *keys))
+            if obtained != expected:
+                errors.append('{} {}: expected {}, found {}.'.format(name, keys, expected, obtained))
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the table bundle, or build or verify the precomputed '
+                                                 'takeoff and landing distances.')
+    parser.add_argument('mode', choices=['bundle', 'build', 'verify'])
+    parser.add_argument('--path', help='output or verified file')
+    args = parser.parse_args(argv)
+    if args.mode == 'bundle':
+        print('Table bundle written to {}.'.format(compile_bundle(args.path or tables.BUNDLE_FILE)))
+        return 0
+    args.path = args.path or PRECOMPUTED_FILE
+    if args.mode == 'build':
+        print('Precomputed distances written to {}.'.format(build(args.path)))
+        return 0
+    errors = verify(args.path)
+    for error in errors:
+        print(error)
+    print('{} errors found in {}.'.format(len(errors), args.path))
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
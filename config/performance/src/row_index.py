@@ -0,0 +1,39 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    row_index.py
+
+DESCRIPTION:
+    This module indexes the tables whose rows are looked up by pressure
+    altitude (roc.csv and climb.csv).
+
+    A table is compiled once into a RowIndex: a dictionary from index value
+    to row position, a dictionary from column name to column position, and
+    the table values as a single array. As with df.loc[row][column], all
+    the values of a row share the common dtype of the table columns (e.g.
+    the climb table values are floats because the fuel column is a float
+    column), so the lookups return exactly the same values as the
+    dataframe, without pandas.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+RowIndex = namedtuple('RowIndex', ['positions', 'columns', 'values'])
+
+
+def compile_row_index(df):
+    """Returns the RowIndex of a performance table (ArrayTable or dataframe)."""
+    positions = {value: i for (i, value) in enumerate(np.asarray(df.index).tolist())}
+    columns = {column: j for (j, column) in enumerate(df.columns)}
+    values = np.array(df.to_numpy())
+    values.flags.writeable = False
+    return RowIndex(positions, columns, values)
+
+
+def lookup(index, row, column):
+    """Returns the value at [row][column]. Raises a KeyError if there is no such value."""
+    return index.values[index.positions[row], index.columns[column]]
@@ -7,6 +7,7 @@ Date: 13/09/2023
 
 import os
 import sys
+import time
 from . import input_check
 from . import data
 from . import wind
@@ -14,65 +15,259 @@ from . import takeoff
 from . import cruise
 from . import fuel
 from . import landing
-import pandas as pd
-from pathlib import Path
+from . import tables
+from . import cache
+from . import helpers
+from . import errors
+from . import schema
+from . import instrumentation
+from . import pipeline
+from common.rules import parse_column
+import numpy as np
 
 file_dir = os.path.dirname(__file__)
 sys.path.append(file_dir)
 
+INPUT_FIELDS = ['to_weight', 'fuel_capacity',
+                'to_heading', 'to_length', 'to_condition', 'to_press_alt', 'to_temp', 'to_wind_speed', 'to_wind_direction',
+                'travel_dist', 'cr_heading', 'cr_press_alt', 'cr_temp', 'cr_wind_speed', 'cr_wind_direction', 'cr_power',
+                'land_heading', 'land_length', 'land_condition', 'land_press_alt', 'land_temp', 'land_wind_speed', 'land_wind_direction']
+# Validated and wind-corrected values that determine the results (see cache.py and pipeline.py).
+CACHE_KEY_FIELDS = ['valid_to_weight', 'valid_to_press_alt', 'valid_to_temp', 'to_temp', 'to_wind_component', 'to_condition',
+                    'roc_press_alt', 'roc_temp', 'fuel_capacity', 'travel_dist', 'cr_press_alt_500', 'cr_press_alt_1000',
+                    'cr_power_press_alt', 'valid_cr_power', 'cr_temp', 'cr_wind_component',
+                    'valid_land_press_alt', 'valid_land_temp', 'land_wind_component', 'land_condition']
+# Performance tables used by compute_performance.
+TABLE_NAMES = ['takeoff', 'roc', 'climb', 'power', 'range40', 'range50', 'endurance40', 'endurance50', 'landing']
+# Stages of compute_performance_batch, in execution order.
+# compute_performance also times the 'tables' and 'cache' stages (see instrumentation.py).
+STAGES = ['check', 'data', 'wind', 'takeoff', 'cruise', 'fuel', 'landing']
+OUTPUT_FIELDS = ['to_roll', 'to_50_roll', 'to_roc', 'max_endurance', 'max_range', 'fuel_required', 'fuel_reserve', 'land_roll', 'land_50_roll']
+# Batches with errors are split in halves down to this size, and then computed one scenario at a time.
+MIN_SPLIT_SIZE = 64
+
 
 def compute_performance(input_data):
+    timer = instrumentation.start_timer()
+    try:
+        return compute_performance_stages(input_data, timer)
+    finally:
+        timer.finish()
+
+
+def compute_performance_stages(input_data, timer=instrumentation.NULL_TIMER):
+    """Returns the results of compute_performance, timing each stage with timer (see instrumentation.py).
+
+    The results are computed by the stages of pipeline.py, on a state that
+    holds the input fields and the values written by the stages.
+    """
 
     # Check input data.
     input_data = input_check.check_input_data(input_data)
+    timer.lap('check')
+
+    # Performance data (loaded once per process, without pandas).
+    for name in TABLE_NAMES:
+        tables.get_array_table(name)
+    timer.lap('tables')
+
+    # Generate valid performance data.
+    state = {field: input_data[field] for field in INPUT_FIELDS}
+    pipeline.run_stages(state, pipeline.get_stages('takeoff_data', 'cruise_data', 'landing_data'))
+    timer.lap('data')
+
+    # Compute wind intensity and direction for takeoff, cruise and landing.
+    pipeline.run_stages(state, pipeline.get_stages('takeoff_wind', 'cruise_wind', 'landing_wind'))
+    timer.lap('wind')
+
+    # Reuse the results of a previous equivalent scenario.
+    result_cache = cache.get_result_cache()
+    scenario_key = tuple(state[field] for field in CACHE_KEY_FIELDS)
+    results = result_cache.get(scenario_key)
+    timer.lap('cache')
+    if results is not None:
+        return dict(results)
+
+    # Compute takeoff, cruise, fuel and landing performance.
+    for stage in ('takeoff', 'cruise', 'fuel', 'landing'):
+        pipeline.run_stages(state, pipeline.get_stages(stage))
+        timer.lap(stage)
+
+    # Store results.
+    results = pipeline.get_results(state)
+    result_cache.set(scenario_key, dict(results))
+    return results
+
+
+def record_stage(timings, stage, start):
+    """Adds the time elapsed since start to timings[stage] and returns the current time.
+
+    Args:
+        timings (dict): seconds spent in each stage, or None.
+        stage (str): stage name.
+        start (float): time.perf_counter() value at the start of the stage.
+
+    Returns:
+        now (float): time.perf_counter() value at the end of the stage.
+    """
+    now = time.perf_counter()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + now - start
+    return now
+
 
-    # Store performance data.
-    folder_path = Path(__file__).parent.resolve() / "data"
-    # Store performance data.
-    takeoff_df = pd.read_csv(folder_path / "takeoff.csv")
-    roc_df = pd.read_csv(folder_path / "roc.csv", index_col=0)
-    climb_df = pd.read_csv(folder_path / "climb.csv", index_col=0)
-    power_df = pd.read_csv(folder_path / "power.csv")
-    range40_df = pd.read_csv(folder_path / "range40.csv", index_col=0)
-    range50_df = pd.read_csv(folder_path / "range50.csv", index_col=0)
-    endurance40_df = pd.read_csv(folder_path / "endurance40.csv", index_col=0)
-    endurance50_df = pd.read_csv(folder_path / "endurance50.csv", index_col=0)
-    landing_df = pd.read_csv(folder_path / "landing.csv", index_col=1)
+def compute_performance_batch(scenarios, timings=None, on_error='raise'):
+    """Returns the performance results of many scenarios at once.
+
+    Every stage of compute_performance is applied to whole columns of
+    scenarios, and the results are identical to those obtained by calling
+    compute_performance for each scenario.
+
+    Args:
+        scenarios: dataframe or dict of arrays with the same fields as the
+            input_data of compute_performance, one element per scenario.
+        timings (dict): if given, the seconds spent in each stage are added
+            to it (see STAGES).
+        on_error (str): 'raise' to raise the PerformanceError (see errors.py)
+            of the first invalid scenario, or 'record' to compute the valid
+            scenarios and record the error message of the invalid ones in
+            an 'error' field (None for valid scenarios). In that case, the
+            results are object arrays, with None for invalid scenarios.
+
+    Returns:
+        results: dataframe (if scenarios is a dataframe) or dict of arrays
+            with the same fields as the results of compute_performance.
+    """
+    if on_error not in ('raise', 'record'):
+        raise ValueError("on_error must be 'raise' or 'record', not {!r}.".format(on_error))
+    if not instrumentation.is_enabled():
+        return compute_performance_batch_stages(scenarios, timings, on_error)
+    # Time the stages locally and add them to the caller's timings and to the histograms.
+    batch_timings = {}
+    start = time.perf_counter()
+    try:
+        return compute_performance_batch_stages(scenarios, batch_timings, on_error)
+    finally:
+        if timings is not None:
+            for (stage, seconds) in batch_timings.items():
+                timings[stage] = timings.get(stage, 0.0) + seconds
+        record_stage(batch_timings, 'total', start)
+        instrumentation.record_stages(batch_timings, prefix='batch.')
+
+
+def compute_performance_batch_stages(scenarios, timings=None, on_error='raise'):
+    """Returns the results of compute_performance_batch, adding the seconds spent in each stage to timings."""
+    input_data = {field: np.asarray(scenarios[field]) for field in INPUT_FIELDS}
+    size = len(input_data['to_weight'])
+
+    # Check input data.
+    start = time.perf_counter()
+    invalid, messages = schema.validate_columns(input_data)
+    # Columns of mixed types (e.g. with missing values) are replaced by their parsed values.
+    for (field, rule) in schema.SCHEMA.items():
+        if input_data[field].dtype == object:
+            input_data[field] = parse_column(rule, input_data[field])[0]
+    if on_error == 'raise' and invalid.any():
+        # Raise the InputError of the first invalid scenario.
+        row = int(np.argmax(invalid))
+        input_check.check_input_data({field: input_data[field][row:row + 1].tolist()[0] for field in INPUT_FIELDS})
+    record_stage(timings, 'check', start)
+
+    if size == 0:
+        results = {key: np.array([]) for key in OUTPUT_FIELDS}
+    elif on_error == 'raise':
+        results = compute_valid_performance_batch(input_data, timings)
+    else:
+        results = {key: np.full(size, None, dtype=object) for key in OUTPUT_FIELDS}
+        compute_recorded_performance_batch(input_data, np.flatnonzero(~invalid), results, messages, timings)
+    if on_error == 'record':
+        results['error'] = messages
+
+    if helpers.is_dataframe(scenarios):
+        import pandas as pd
+        return pd.DataFrame(results, index=scenarios.index)
+    return results
+
+
+def compute_recorded_performance_batch(input_data, rows, results, messages, timings=None):
+    """Computes the given rows of checked input data, recording their errors.
+
+    If the rows contain an invalid scenario, they are split in halves that
+    are computed separately, down to MIN_SPLIT_SIZE scenarios, which are
+    then computed one by one with compute_performance.
+
+    Args:
+        input_data (dict): arrays of input data.
+        rows (array): positions of the scenarios to compute.
+        results (dict): object arrays where the results are stored.
+        messages (array): object array where the error messages are stored.
+        timings (dict): seconds spent in each stage, or None.
+    """
+    if len(rows) == 0:
+        return None
+    try:
+        outputs = compute_valid_performance_batch({field: input_data[field][rows] for field in INPUT_FIELDS}, timings)
+    except errors.PerformanceError:
+        if len(rows) > MIN_SPLIT_SIZE:
+            half = len(rows)//2
+            compute_recorded_performance_batch(input_data, rows[:half], results, messages, timings)
+            compute_recorded_performance_batch(input_data, rows[half:], results, messages, timings)
+            return None
+        start = time.perf_counter()
+        values = zip(*(input_data[field][rows].tolist() for field in INPUT_FIELDS))
+        for (row, scenario) in zip(rows.tolist(), values):
+            try:
+                output = compute_performance(dict(zip(INPUT_FIELDS, scenario)))
+            except errors.PerformanceError as error:
+                messages[row] = str(error)
+                continue
+            for key in OUTPUT_FIELDS:
+                results[key][row] = output[key]
+        record_stage(timings, 'scalar', start)
+        return None
+    for key in OUTPUT_FIELDS:
+        results[key][rows] = outputs[key].tolist()
+    return None
+
+
+def compute_valid_performance_batch(input_data, timings=None):
+    """Returns the results of compute_performance_batch for checked input data."""
+    start = time.perf_counter()
+    power_df = tables.get_array_table('power')
+    range_dfs = {40: tables.get_array_table('range40'), 50: tables.get_array_table('range50')}
+    endurance_dfs = {40: tables.get_array_table('endurance40'), 50: tables.get_array_table('endurance50')}
 
     # Generate valid performance data.
-    data.compute_valid_performance_data(input_data, power_df)
+    data.compute_valid_performance_data_batch(input_data, power_df)
+    start = record_stage(timings, 'data', start)
 
     # Compute wind intensity and direction for takeoff, cruise and landing.
-    wind.run_wind_analysis(input_data)
+    wind.run_wind_analysis_batch(input_data)
+    start = record_stage(timings, 'wind', start)
 
     # Compute takeoff performance.
-    to_roll, to_50_roll, roc = takeoff.compute_takeoff_performance(input_data, takeoff_df, roc_df)
+    to_roll, to_50_roll, roc = takeoff.compute_takeoff_performance_batch(input_data, tables.get_array_table('takeoff'), tables.get_array_table('roc'))
+    start = record_stage(timings, 'takeoff', start)
 
     # Compute cruise performance.
-    if input_data['fuel_capacity'] == 40:
-        range_df = range40_df
-        endurance_df = endurance40_df
-    else:
-        range_df = range50_df
-        endurance_df = endurance50_df
-    max_endurance, max_range, ktas, fuel_flow = cruise.compute_cruise_performance(input_data, power_df, range_df, endurance_df)
+    max_endurance, max_range, ktas, fuel_flow = cruise.compute_cruise_performance_batch(input_data, power_df, range_dfs, endurance_dfs)
+    start = record_stage(timings, 'cruise', start)
 
     # Compute fuel required.
-    fuel_required, fuel_reserve = fuel.compute_fuel_required(input_data, climb_df, ktas, fuel_flow)
+    fuel_required, fuel_reserve = fuel.compute_fuel_required_batch(input_data, tables.get_array_table('climb'), ktas, fuel_flow)
+    start = record_stage(timings, 'fuel', start)
 
     # Compute landing performance.
-    land_roll, land_50_roll = landing.compute_landing_performance(input_data, landing_df)
+    land_roll, land_50_roll = landing.compute_landing_performance_batch(input_data, tables.get_array_table('landing'))
+    record_stage(timings, 'landing', start)
 
     # Store results.
-    keys = ['to_roll', 'to_50_roll', 'to_roc', 'max_endurance', 'max_range', 'fuel_required', 'fuel_reserve', 'land_roll', 'land_50_roll']
     values = [to_roll, to_50_roll, roc, max_endurance, max_range, fuel_required, fuel_reserve, land_roll, land_50_roll]
-    results = {}
-    for (key, value) in zip(keys, values):
-        results[key] = value
-    return results
+    return dict(zip(OUTPUT_FIELDS, values))
 
 
 if __name__ == '__main__':
-    # TODO: add testing functionality.
-    print("Run directly")
+    # Batch command: python -m performance.src.run_performance scenarios.csv results.csv
+    from . import runner
+    sys.exit(runner.main())
     
\ No newline at end of file
@@ -0,0 +1,268 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    runner.py
+
+DESCRIPTION:
+    This module runs large scenario files from the command line:
+
+        python -m performance.src.run_performance scenarios.csv results.csv
+
+    The scenarios file is a .csv file with a header row (the input fields
+    of compute_performance) or a .jsonl file with one JSON object per line.
+    The scenarios are read in chunks, and the chunks are distributed across
+    a pool of processes (one per available core by default) that run
+    compute_performance_batch. The results are written to the output file
+    (.csv or .jsonl) as soon as they are available, in input order.
+
+    An invalid scenario does not stop the batch: compute_performance_batch
+    records the error message of each invalid scenario (see errors.py),
+    which is written in the error column. Missing fields and values that
+    are not numbers or strings (e.g. JSON lists) are invalid values.
+
+    At the end, the number of scenarios, the throughput (scenarios/s) and
+    the time spent in each stage (summed over all the processes) are
+    printed.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from . import errors
+from . import run_performance
+
+DEFAULT_CHUNK_SIZE = 10000
+RESULT_FIELDS = ['row'] + run_performance.OUTPUT_FIELDS + ['error']
+
+
+def available_cores():
+    """Returns the number of cores available to this process."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def detect_format(path):
+    """Returns 'jsonl' for .jsonl and .json files, and 'csv' otherwise."""
+    return 'jsonl' if str(path).lower().endswith(('.jsonl', '.json')) else 'csv'
+
+
+def parse_value(value):
+    """Returns the .csv value as an int, a float or a string."""
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            continue
+    return value.strip()
+
+
+def read_scenarios(file, file_format):
+    """Yields the scenarios of the file, one dict per row.
+
+    Args:
+        file: open scenarios file.
+        file_format (str): 'csv' or 'jsonl'.
+
+    Yields:
+        scenario (dict): input data of compute_performance.
+    """
+    if file_format == 'jsonl':
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        for row in csv.DictReader(file):
+            yield {field: parse_value(value) for (field, value) in row.items()}
+
+
+def iter_chunks(scenarios, chunk_size):
+    """Yields lists of at most chunk_size scenarios."""
+    chunk = []
+    for scenario in scenarios:
+        chunk.append(scenario)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def get_input_data(scenario):
+    """Returns the input fields of a scenario, with None for missing and nested values."""
+    values = (scenario.get(field) for field in run_performance.INPUT_FIELDS)
+    return {field: None if isinstance(value, (list, dict)) else value
+            for (field, value) in zip(run_performance.INPUT_FIELDS, values)}
+
+
+def describe_error(error):
+    """Returns the error message written in the error column."""
+    return str(error) or type(error).__name__
+
+
+def run_scenario(scenario):
+    """Returns the results of a single scenario, or its error message."""
+    try:
+        results = run_performance.compute_performance(get_input_data(scenario))
+    except errors.PerformanceError as error:
+        return {'error': describe_error(error)}
+    return results
+
+
+def compute_chunk(chunk, timings):
+    """Returns the results of a chunk of scenarios, one dict per scenario."""
+    scenarios = [get_input_data(scenario) for scenario in chunk]
+    columns = {field: [scenario[field] for scenario in scenarios] for field in run_performance.INPUT_FIELDS}
+    # The scenarios that the batch cannot compute are isolated by compute_recorded_performance_batch.
+    outputs = run_performance.compute_performance_batch(columns, timings, on_error='record')
+    values = zip(outputs['error'].tolist(), *(outputs[field].tolist() for field in run_performance.OUTPUT_FIELDS))
+    return [{'error': row[0]} if row[0] is not None else dict(zip(run_performance.OUTPUT_FIELDS, row[1:])) for row in values]
+
+
+def run_chunk(chunk):
+    """Returns the results of a chunk of scenarios and the time spent in each stage.
+
+    Args:
+        chunk (list): scenarios.
+
+    Returns:
+        results (list): one dict per scenario, with the output fields or an
+            'error' field.
+        timings (dict): seconds spent in each stage.
+    """
+    timings = {}
+    return compute_chunk(chunk, timings), timings
+
+
+class ResultWriter:
+    """Writes results to a .csv or .jsonl file, numbering the rows."""
+
+    def __init__(self, file, file_format):
+        self.file = file
+        self.file_format = file_format
+        self.rows = 0
+        self.errors = 0
+        if file_format == 'csv':
+            self.writer = csv.DictWriter(file, RESULT_FIELDS, extrasaction='ignore')
+            self.writer.writeheader()
+
+    def write(self, results):
+        for result in results:
+            result = dict(result, row=self.rows)
+            if 'error' in result:
+                self.errors += 1
+            if self.file_format == 'csv':
+                self.writer.writerow(result)
+            else:
+                self.file.write(json.dumps(result) + '\n')
+            self.rows += 1
+
+
+def iter_result_text(scenarios, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields the results of the scenarios as .csv or .jsonl text, in input order.
+
+    The scenarios are computed in this process, one chunk at a time, so
+    only one chunk is kept in memory (e.g. to stream an HTTP response).
+
+    Args:
+        scenarios: iterable of scenarios (see read_scenarios).
+        file_format (str): 'csv' or 'jsonl'.
+        chunk_size (int): number of scenarios computed at a time.
+
+    Yields:
+        text (str): results of a chunk (the first one includes the .csv header).
+    """
+    buffer = io.StringIO()
+    writer = ResultWriter(buffer, file_format)
+    for chunk in iter_chunks(scenarios, chunk_size):
+        writer.write(run_chunk(chunk)[0])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer.rows == 0:
+        yield buffer.getvalue()
+
+
+def run_batch(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """Computes every scenario of input_path and writes the results to output_path.
+
+    Args:
+        input_path: .csv or .jsonl scenarios file.
+        output_path: .csv or .jsonl results file.
+        chunk_size (int): number of scenarios sent to a process at a time.
+        workers (int): number of processes. By default, the available cores.
+            With 1 worker, the scenarios are computed in this process.
+
+    Returns:
+        summary (dict): number of scenarios and errors, elapsed time in
+            seconds, throughput in scenarios/s and seconds spent in each stage.
+    """
+    workers = workers or available_cores()
+    timings = {}
+    start = time.perf_counter()
+
+    def collect(results, chunk_timings):
+        write_start = time.perf_counter()
+        writer.write(results)
+        run_performance.record_stage(timings, 'write', write_start)
+        for (stage, seconds) in chunk_timings.items():
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+    with open(input_path, newline='') as input_file, open(output_path, 'w', newline='') as output_file:
+        writer = ResultWriter(output_file, detect_format(output_path))
+        chunks = iter_chunks(read_scenarios(input_file, detect_format(input_path)), chunk_size)
+        if workers == 1:
+            for chunk in chunks:
+                collect(*run_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                # Keep a bounded number of chunks in flight and write them in input order.
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(run_chunk, chunk))
+                    if len(pending) >= 2*workers:
+                        collect(*pending.popleft().result())
+                while pending:
+                    collect(*pending.popleft().result())
+
+    elapsed = time.perf_counter() - start
+    return {'scenarios': writer.rows, 'errors': writer.errors, 'elapsed': elapsed,
+            'throughput': writer.rows/elapsed if elapsed > 0 else 0.0, 'timings': timings}
+
+
+def format_summary(summary):
+    """Returns the summary of run_batch as printable text."""
+    lines = ['Scenarios: {} ({} errors)'.format(summary['scenarios'], summary['errors']),
+             'Elapsed: {:.2f} s'.format(summary['elapsed']),
+             'Throughput: {:.0f} scenarios/s'.format(summary['throughput']),
+             'Stage timings (s, summed over processes):']
+    stages = run_performance.STAGES + ['scalar', 'write']
+    for stage in stages:
+        if stage in summary['timings']:
+            lines.append('  {:<8} {:9.3f}'.format(stage, summary['timings'][stage]))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compute the performance of every scenario of a .csv or .jsonl file.')
+    parser.add_argument('input', help='scenarios file (.csv or .jsonl)')
+    parser.add_argument('output', help='results file (.csv or .jsonl)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='scenarios per chunk')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default: available cores)')
+    args = parser.parse_args(argv)
+    summary = run_batch(args.input, args.output, args.chunk_size, args.workers)
+    print(format_summary(summary))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
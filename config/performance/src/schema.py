@@ -0,0 +1,61 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    schema.py
+
+DESCRIPTION:
+    This module describes the valid input data in a single place.
+
+    SCHEMA maps the input fields of compute_performance to their rules
+    (see common/rules.py for the attributes of a Rule and the checks). The
+    same rules are used by the forms and the model validators (see
+    validators.py), by input_check.py for a single scenario, and by
+    validate_columns() for whole columns of scenarios. The latter returns
+    a per-row error mask and the error message of each invalid row, which
+    is the message of the InputError (see errors.py) that input_check.py
+    raises for that row.
+"""
+
+from common import rules
+from common.rules import Rule
+from .errors import InputError
+
+TAKEOFF_WEIGHT = Rule('Takeoff weight', 'The weight must be between 1397 and 2300 pounds', min_value=1397, max_value=2300, negative=True)
+FUEL_CAPACITY = Rule('Fuel capacity', 'The fuel capacity must be 40 or 50 gallons', choices=(40, 50))
+RUNWAY_HEADING = Rule('Runway heading', 'The runway heading must be between 1 and 360', min_value=1, max_value=360)
+RUNWAY_LENGTH = Rule('Runway length', 'The runway length must be bigger than 0', min_value=1)
+RUNWAY_CONDITION = Rule('Runway condition', 'The runway condition must be p (paved) or g (grass)', kind='str', choices=('p', 'g'))
+PRESSURE_ALTITUDE = Rule('Pressure altitude', 'The pressure altitude must be between 0 and 14200 feets', min_value=0, max_value=14200)
+TEMPERATURE = Rule('Temperature', 'The temperature must be between -20 and 40 degrees Celsius', min_value=-20, max_value=40)
+WIND_SPEED = Rule('Wind speed', 'The wind speed must be between 0 and 50 knots', min_value=0, max_value=50)
+WIND_DIRECTION = Rule('Wind direction', 'The wind direction must be a multiple of 5 between 1 and 360', min_value=1, max_value=360, step=5)
+TRAVEL_DISTANCE = Rule('Travel distance', 'The distance must be between 0 and 750 nautical miles', min_value=0, max_value=750, negative=True)
+CRUISE_HEADING = Rule('Cruise heading', 'The heading must be between 1 and 360', min_value=1, max_value=360)
+CRUISE_RPM = Rule('Cruise rpm', 'The rpm must be between 2100 and 2650', min_value=2100, max_value=2650)
+
+# Input fields in checking order.
+SCHEMA = {
+    'to_weight': TAKEOFF_WEIGHT, 'fuel_capacity': FUEL_CAPACITY,
+    'to_heading': RUNWAY_HEADING, 'to_length': RUNWAY_LENGTH, 'to_condition': RUNWAY_CONDITION,
+    'to_press_alt': PRESSURE_ALTITUDE, 'to_temp': TEMPERATURE, 'to_wind_speed': WIND_SPEED, 'to_wind_direction': WIND_DIRECTION,
+    'travel_dist': TRAVEL_DISTANCE, 'cr_heading': CRUISE_HEADING, 'cr_press_alt': PRESSURE_ALTITUDE, 'cr_temp': TEMPERATURE,
+    'cr_wind_speed': WIND_SPEED, 'cr_wind_direction': WIND_DIRECTION, 'cr_power': CRUISE_RPM,
+    'land_heading': RUNWAY_HEADING, 'land_length': RUNWAY_LENGTH, 'land_condition': RUNWAY_CONDITION,
+    'land_press_alt': PRESSURE_ALTITUDE, 'land_temp': TEMPERATURE, 'land_wind_speed': WIND_SPEED, 'land_wind_direction': WIND_DIRECTION,
+}
+
+
+def check_value(rule, value):
+    """Raises an InputError (see errors.py) if value breaks the rule."""
+    message = rules.find_error(rule, value)
+    if message is not None:
+        raise InputError(rule.label, message)
+    return None
+
+
+def validate_columns(columns, schema=SCHEMA):
+    """Validates whole columns of scenarios at once (see common/rules.py)."""
+    return rules.validate_columns(columns, schema)
@@ -0,0 +1,339 @@
+"""
+Cessna 172N Performance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    tables.py
+
+DESCRIPTION:
+    This module is the process-wide registry of the performance tables.
+
+    The tables stored in the data folder are read and validated only once
+    per process, the first time one of them is requested. After that,
+    every call to compute_performance reuses the same tables. The tables
+    are shared, so their values are write-protected: any attempt to modify
+    a registered table raises a ValueError.
+
+    The tables are stored as ArrayTables: read-only numpy arrays with the
+    subset of the DataFrame interface used by the table compilers (columns,
+    index, len(), table[column] and to_numpy()). The single-scenario path
+    (compute_performance) only uses ArrayTables, so pandas is not imported
+    until a dataframe is requested with get_table() or get_tables().
+
+    If the compiled table bundle (see bundle.py) is valid and up to date,
+    the tables are read from it instead of parsing the .csv files. The
+    source of the tables, the time spent loading them and the memory they
+    use can be obtained with get_load_report().
+
+    Lookup structures compiled from a table (see cubes.py) are cached with
+    get_compiled(), so they are also built only once per table. Structures
+    compiled offline (see precompute.py) can be registered with
+    register_precompiled(), and are then used instead of compiling the
+    registered table.
+"""
+
+import csv
+import threading
+import time
+import weakref
+from pathlib import Path
+from types import MappingProxyType
+import numpy as np
+from . import bundle
+
+DATA_DIR = Path(__file__).parent.resolve() / "data"
+BUNDLE_FILE = DATA_DIR / "tables.bundle"
+
+TEMP_COLUMNS = [str(temp) + suffix for temp in range(0, 50, 10) for suffix in ('_celsius_gr_roll', '_celsius_50_ft')]
+POWER_COLUMNS = [band + suffix for band in ('isa_m20', 'isa', 'isa_p20') for suffix in ('_bhp', '_ktas', '_gph')]
+CRUISE_COLUMNS = ['75', '65', '55', '45']
+
+# Table name: (file name, index column, key columns, required columns).
+TABLE_SPECS = {
+    'takeoff': ('takeoff.csv', None, ['weight', 'press_alt'], ['weight', 'press_alt'] + TEMP_COLUMNS),
+    'roc': ('roc.csv', 0, [], ['roc_m20', 'roc_0', 'roc_p20', 'roc_p40']),
+    'climb': ('climb.csv', 0, [], ['temp', 'time', 'fuel', 'distance']),
+    'power': ('power.csv', None, ['press_alt', 'rpm'], ['press_alt', 'rpm'] + POWER_COLUMNS),
+    'range40': ('range40.csv', 0, [], CRUISE_COLUMNS),
+    'range50': ('range50.csv', 0, [], CRUISE_COLUMNS),
+    'endurance40': ('endurance40.csv', 0, [], CRUISE_COLUMNS),
+    'endurance50': ('endurance50.csv', 0, [], CRUISE_COLUMNS),
+    'landing': ('landing.csv', 1, ['press_alt'], ['press_alt'] + TEMP_COLUMNS),
+}
+
+_lock = threading.Lock()
+_tables = None
+_dataframes = None
+_report = None
+_compiled = {}
+_precompiled = {}
+
+
+class ArrayTable:
+    """Performance table stored as read-only numpy arrays.
+
+    Args:
+        columns (dict): column arrays by column name, in table order.
+        index (array): index values, or None for the default 0..n-1 index.
+        index_name (str): name of the index column, or None.
+    """
+
+    def __init__(self, columns, index=None, index_name=None):
+        self._columns = dict(columns)
+        self.columns = list(self._columns)
+        size = len(self._columns[self.columns[0]]) if self.columns else 0
+        self.index = np.arange(size) if index is None else index
+        self.index_name = index_name
+        for values in [self.index] + list(self._columns.values()):
+            values.flags.writeable = False
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, column):
+        return self._columns[column]
+
+    @property
+    def nbytes(self):
+        """Returns the memory used by the index and the columns in bytes."""
+        return self.index.nbytes + sum(values.nbytes for values in self._columns.values())
+
+    def to_numpy(self):
+        """Returns the columns as a 2D array of their common dtype, like DataFrame.to_numpy()."""
+        values = [self._columns[column] for column in self.columns]
+        return np.column_stack(values).astype(np.result_type(*values), copy=False)
+
+    def to_dataframe(self):
+        """Returns a read-only dataframe that shares the arrays of the table."""
+        import pandas as pd
+        if self.index_name is None:
+            index = pd.RangeIndex(len(self))
+        else:
+            index = pd.Index(self.index, name=self.index_name, copy=False)
+        return pd.DataFrame(self._columns, index=index, copy=False)
+
+
+def parse_column(values):
+    """Returns the values of a .csv column as an int64 or float64 array."""
+    try:
+        return np.array([int(value) for value in values], dtype=np.int64)
+    except ValueError:
+        return np.array([float(value) if value.strip() else np.nan for value in values], dtype=np.float64)
+
+
+def read_csv_table(path, index_col):
+    """Returns the ArrayTable stored in a .csv file.
+
+    Args:
+        path: .csv file with a header row.
+        index_col (int): position of the index column, or None.
+
+    Returns:
+        table (ArrayTable): the table, with int64 columns when every value
+            is an integer and float64 columns otherwise.
+    """
+    with open(path, newline='') as file:
+        rows = [row for row in csv.reader(file) if row]
+    header = rows[0]
+    columns = {column: parse_column([row[i] for row in rows[1:]]) for (i, column) in enumerate(header)}
+    if index_col is None:
+        return ArrayTable(columns)
+    index_name = header[index_col]
+    index = columns.pop(index_name)
+    return ArrayTable(columns, index, index_name)
+
+
+def validate_table(name, table, index_col, key_columns, required_columns):
+    """Raises a ValueError if the table is not a valid performance table.
+
+    Args:
+        name (str): table name.
+        table: performance table (ArrayTable or dataframe).
+        index_col (int): position of the index column in the file, or None.
+        key_columns (list): columns whose combined values must be unique.
+        required_columns (list): columns used by the performance modules.
+
+    Returns:
+        None
+    """
+    if len(table) == 0:
+        raise ValueError(name + ' table | ERROR: the table is empty.')
+    missing = [column for column in required_columns if column not in table.columns]
+    if missing:
+        raise ValueError(name + ' table | ERROR: missing columns ' + ', '.join(missing) + '.')
+    values = [np.asarray(table[column]) for column in table.columns] + [np.asarray(table.index)]
+    if any(np.isnan(array).any() for array in values if array.dtype.kind == 'f'):
+        raise ValueError(name + ' table | ERROR: the table has missing values.')
+    if index_col is not None and key_columns == [] and not np.all(np.diff(np.asarray(table.index)) > 0):
+        raise ValueError(name + ' table | ERROR: the index must be unique and increasing.')
+    if key_columns:
+        keys = np.column_stack([np.asarray(table[column]) for column in key_columns])
+        if len(np.unique(keys, axis=0)) != len(keys):
+            raise ValueError(name + ' table | ERROR: duplicated rows for ' + ', '.join(key_columns) + '.')
+    return None
+
+
+def compute_source_digest(folder_path=DATA_DIR):
+    """Returns the digest of the performance .csv files (see bundle.py)."""
+    return bundle.compute_source_digest(Path(folder_path) / spec[0] for spec in TABLE_SPECS.values())
+
+
+def read_bundle_tables(folder_path=DATA_DIR, bundle_path=BUNDLE_FILE):
+    """Returns the tables stored in the bundle, or None if it cannot be used."""
+    if bundle_path is None:
+        return None
+    try:
+        arrays = bundle.read_bundle(bundle_path, compute_source_digest(folder_path))
+    except bundle.BundleError:
+        return None
+    if any(name not in arrays for name in TABLE_SPECS):
+        return None
+    return {name: ArrayTable(columns, index, index_name) for (name, (index_name, index, columns)) in arrays.items()}
+
+
+def load_tables(folder_path=DATA_DIR, bundle_path=BUNDLE_FILE):
+    """Returns the validated performance tables and a load report.
+
+    The tables are read from the bundle if it is valid and up to date,
+    and from the .csv files otherwise.
+
+    Args:
+        folder_path: folder containing the performance .csv files.
+        bundle_path: compiled table bundle, or None to read the .csv files.
+
+    Returns:
+        tables (dict): performance ArrayTables by table name.
+        report (dict): source ('bundle' or 'csv'), load time in seconds and
+            memory use in bytes.
+    """
+    tables = {}
+    report = {'source': 'csv', 'load_time': 0.0, 'memory': 0, 'tables': {}}
+    start = time.perf_counter()
+    bundle_tables = read_bundle_tables(folder_path, bundle_path)
+    if bundle_tables is not None:
+        report['source'] = 'bundle'
+    for (name, (file_name, index_col, key_columns, required_columns)) in TABLE_SPECS.items():
+        table_start = time.perf_counter()
+        if bundle_tables is not None:
+            table = bundle_tables[name]
+        else:
+            table = read_csv_table(Path(folder_path) / file_name, index_col)
+        validate_table(name, table, index_col, key_columns, required_columns)
+        tables[name] = table
+        report['tables'][name] = {'rows': len(table), 'columns': len(table.columns),
+                                  'memory': table.nbytes, 'load_time': time.perf_counter() - table_start}
+        report['memory'] += table.nbytes
+    report['load_time'] = time.perf_counter() - start
+    return tables, report
+
+
+def get_array_tables():
+    """Returns a read-only mapping with every performance ArrayTable.
+
+    The tables are loaded the first time this function is called and
+    reused by every later call in the same process.
+    """
+    global _tables, _report
+    if _tables is None:
+        with _lock:
+            if _tables is None:
+                tables, _report = load_tables()
+                _tables = MappingProxyType(tables)
+    return _tables
+
+
+def get_array_table(name):
+    """Returns the performance ArrayTable registered as name."""
+    return get_array_tables()[name]
+
+
+def get_tables():
+    """Returns a read-only mapping with every performance table as a dataframe.
+
+    The dataframes share the arrays of the registered ArrayTables. pandas
+    is imported the first time this function is called.
+    """
+    global _dataframes
+    tables = get_array_tables()
+    if _dataframes is None:
+        with _lock:
+            if _dataframes is None:
+                _dataframes = MappingProxyType({name: table.to_dataframe() for (name, table) in tables.items()})
+    return _dataframes
+
+
+def get_table(name):
+    """Returns the performance dataframe registered as name."""
+    return get_tables()[name]
+
+
+def get_load_report():
+    """Returns the time and memory used to load the performance tables.
+
+    Returns:
+        report (dict): source of the tables ('source'), total load time in
+        seconds ('load_time'), total memory in bytes ('memory') and the same
+        values for each table ('tables').
+    """
+    get_array_tables()
+    return _report
+
+
+def get_compiled(df, compiler):
+    """Returns compiler(df), computing it only once for each table.
+
+    Args:
+        df: performance table (ArrayTable or dataframe).
+        compiler: function that builds a lookup structure from df.
+
+    Returns:
+        compiled: the lookup structure built from df.
+    """
+    key = (id(df), compiler)
+    entry = _compiled.get(key)
+    if entry is None or entry[0]() is not df:
+        compiled = find_precompiled(df, compiler)
+        if compiled is None:
+            compiled = compiler(df)
+        entry = (weakref.ref(df), compiled)
+        _compiled[key] = entry
+        weakref.finalize(df, _compiled.pop, key, None)
+    return entry[1]
+
+
+def register_precompiled(name, compiler, compiled):
+    """Registers compiled as the result of compiler for the table registered as name.
+
+    Args:
+        name (str): table name.
+        compiler: function that builds a lookup structure from a table.
+        compiled: the lookup structure, built offline from the same table file.
+
+    Returns:
+        None
+    """
+    with _lock:
+        _precompiled[(name, compiler)] = compiled
+        _compiled.clear()
+    return None
+
+
+def find_precompiled(df, compiler):
+    """Returns the precompiled structure for df, or None if df is not a registered table."""
+    for registry in (_tables, _dataframes):
+        for (name, table) in (registry or {}).items():
+            if table is df:
+                return _precompiled.get((name, compiler))
+    return None
+
+
+def reset():
+    """Drops the registered tables so that the next access reloads them."""
+    global _tables, _dataframes, _report
+    with _lock:
+        _tables = None
+        _dataframes = None
+        _report = None
+        _compiled.clear()
+    return None
@@ -20,7 +20,12 @@ DESCRIPTION:
         Maximum Rate of Climb expected immediately after takeoff.
 """
 
+import functools
 import math
+import numpy as np
+from . import cubes
+from . import helpers
+from . import tables
 
 
 def compute_takeoff_ground_roll(weight, press_alt, temp, takeoff_df):
@@ -40,9 +45,8 @@ def compute_takeoff_ground_roll(weight, press_alt, temp, takeoff_df):
         ground_roll (int): minimum required takeoff distance.
         fifty_ft_roll (int): distance required to clear a 50 ft obstacle.
     """
-    takeoff_df = takeoff_df[(takeoff_df['weight'] == weight) & (takeoff_df['press_alt'] == press_alt)]
-    ground_roll = takeoff_df.iloc[0][str(temp) + '_celsius_gr_roll']
-    fifty_ft_roll = takeoff_df.iloc[0][str(temp) + '_celsius_50_ft']
+    takeoff_cube = tables.get_compiled(takeoff_df, cubes.compile_takeoff_cube)
+    ground_roll, fifty_ft_roll = cubes.lookup_distances(takeoff_cube, weight, press_alt, temp)
     return ground_roll, fifty_ft_roll
 
 
@@ -103,11 +107,11 @@ def compute_takeoff_roc(press_alt, roc_temp, roc_df):
         roc (int): rate of climb in ft/min.
     """
     if roc_temp < 0:
-        roc = roc_df.loc[press_alt]['roc_m' + str(roc_temp)]
+        roc = helpers.dataframe_lookup(press_alt, 'roc_m' + str(-roc_temp), roc_df)
     elif roc_temp > 0:
-        roc = roc_df.loc[press_alt]['roc_p' + str(roc_temp)]
+        roc = helpers.dataframe_lookup(press_alt, 'roc_p' + str(roc_temp), roc_df)
     else:
-        roc = roc_df.loc[press_alt]['roc_' + str(roc_temp)]
+        roc = helpers.dataframe_lookup(press_alt, 'roc_' + str(roc_temp), roc_df)
     return roc
 
 
@@ -129,3 +133,48 @@ def compute_takeoff_performance(input_data, takeoff_df, roc_df):
     roc_temp = input_data['roc_temp']
     roc = compute_takeoff_roc(roc_press_alt, roc_temp, roc_df)
     return int(ground_roll), int(fifty_ft_roll), int(roc)
+
+
+def correct_distance_for_wind_batch(ground_roll, fifty_ft_roll, headwind):
+    """Array version of correct_distance_for_wind.
+
+    The wind is given by its signed headwind component (see
+    wind.compute_wind_components) instead of its speed and direction.
+    """
+    wind_speed = np.abs(headwind)
+    corr = np.where(headwind > 0,
+                    -1*helpers.round_array((wind_speed*0.1)/9, 2),
+                    helpers.round_array((wind_speed*0.1)/2, 2))
+    windy = headwind != 0
+    ground_roll = np.where(windy, np.ceil(ground_roll + ground_roll*corr), ground_roll)
+    fifty_ft_roll = np.where(windy, np.ceil(fifty_ft_roll + fifty_ft_roll*corr), fifty_ft_roll)
+    return ground_roll, fifty_ft_roll
+
+
+def correct_distance_for_runway_condition_batch(ground_roll, fifty_ft_roll, condition):
+    """Array version of correct_distance_for_runway_condition."""
+    corr = helpers.round_array(ground_roll*0.15, 2)
+    grass = condition == 'g'
+    ground_roll = np.where(grass, np.ceil(ground_roll + corr), ground_roll)
+    fifty_ft_roll = np.where(grass, np.ceil(fifty_ft_roll + corr), fifty_ft_roll)
+    return ground_roll, fifty_ft_roll
+
+
+def compute_takeoff_performance_batch(input_data, takeoff_df, roc_df):
+    """Array version of compute_takeoff_performance."""
+    weight = input_data['to_weight']
+    press_alt = input_data['to_press_alt']
+    temp = input_data['to_temp']
+    # Read the takeoff distances from the compiled table.
+    takeoff_cube = tables.get_compiled(takeoff_df, cubes.compile_takeoff_cube)
+    ground_roll, fifty_ft_roll = cubes.lookup_distances_array(takeoff_cube, weight, press_alt, temp)
+    # Correct takeoff distance for wind.
+    ground_roll, fifty_ft_roll = correct_distance_for_wind_batch(ground_roll, fifty_ft_roll, input_data['to_headwind'])
+    # Correct takeoff distance for runway condition.
+    condition = input_data['to_condition']
+    ground_roll, fifty_ft_roll = correct_distance_for_runway_condition_batch(ground_roll, fifty_ft_roll, condition)
+    # Compute takeoff rate of climb.
+    roc_press_alt = input_data['roc_press_alt']
+    roc_temp = input_data['roc_temp']
+    roc = helpers.apply_to_unique(functools.partial(compute_takeoff_roc, roc_df=roc_df), roc_press_alt, roc_temp)
+    return ground_roll.astype(np.int64), fifty_ft_roll.astype(np.int64), roc.astype(np.int64)
@@ -13,10 +13,26 @@ DESCRIPTION:
     for takeoff, cruise and landing. The objective is to reduce the user
     workload and enhance the final results accuracy.
 
+    compute_wind_components() is the array kernel used by the batch engine:
+    it computes the headwind and crosswind components of any number of
+    heading/wind pairs at once, with a numeric sign instead of the 'H'/'T'
+    direction of compute_wind_component:
+
+    > headwind: positive for a headwind, negative for a tailwind.
+    > crosswind: positive for a wind from the right, negative from the left.
+
+    run_runway_analysis() applies the kernel to many runways at once.
 """
 
 
 import math
+import numpy as np
+from . import helpers
+
+# Maximum demonstrated crosswind velocity of the C172N, in knots.
+MAX_DEMONSTRATED_CROSSWIND = 15
+# Stages whose wind components are computed by run_wind_analysis_batch.
+WIND_STAGES = ['to', 'cr', 'land']
 
 
 def compute_wind_component(heading, wind_speed, wind_direction):
@@ -58,3 +74,77 @@ def run_wind_analysis(input_data):
     input_data['land_wind_speed'] = land_wind_component[0]
     input_data['land_wind_direction'] = land_wind_component[1]
     return None
+
+
+def compute_wind_components(heading, wind_speed, wind_direction):
+    """Returns the headwind and crosswind components of the wind.
+
+    The arguments can be scalars or arrays of any broadcastable shapes.
+    The components are rounded to 0.1 knots, and the absolute value of the
+    headwind component is the aligned speed of compute_wind_component.
+
+    Args:
+        heading (array): aircraft or runway heading in degrees.
+        wind_speed (array): wind speed in knots.
+        wind_direction (array): direction the wind blows from, in degrees.
+
+    Returns:
+        headwind (array): wind component along the heading (negative for a tailwind).
+        crosswind (array): wind component across the heading (negative from the left).
+    """
+    delta = np.asarray(wind_direction) - np.asarray(heading)
+    angle = np.abs(delta)
+    headwind = helpers.round_array(wind_speed*np.cos(np.radians(angle)), 1)
+    # A wind perpendicular to the heading has no aligned component.
+    headwind = np.where((angle == 90) | (angle == 270), 0.0, headwind)
+    crosswind = helpers.round_array(wind_speed*np.sin(np.radians(delta)), 1)
+    return headwind, crosswind
+
+
+def run_wind_analysis_batch(input_data):
+    """Array version of run_wind_analysis.
+
+    Instead of replacing the wind speed and direction, the signed wind
+    components of each stage (see compute_wind_components) are stored in
+    input_data as '<stage>_headwind' and '<stage>_crosswind', e.g.
+    'to_headwind'. The three stages are computed in a single call.
+    """
+    headings = np.stack([input_data[stage + '_heading'] for stage in WIND_STAGES])
+    wind_speeds = np.stack([input_data[stage + '_wind_speed'] for stage in WIND_STAGES])
+    wind_directions = np.stack([input_data[stage + '_wind_direction'] for stage in WIND_STAGES])
+    headwind, crosswind = compute_wind_components(headings, wind_speeds, wind_directions)
+    for (i, stage) in enumerate(WIND_STAGES):
+        input_data[stage + '_headwind'] = headwind[i]
+        input_data[stage + '_crosswind'] = crosswind[i]
+    return None
+
+
+def run_runway_analysis(runway_headings, wind_speed, wind_direction, max_crosswind=MAX_DEMONSTRATED_CROSSWIND):
+    """Returns the wind components of many runways for one or many winds.
+
+    Args:
+        runway_headings (array): headings of the R runways in degrees.
+        wind_speed (array): wind speed in knots, a scalar or N values.
+        wind_direction (array): wind direction in degrees, a scalar or N values.
+        max_crosswind (float): crosswind limit in knots.
+
+    Returns:
+        analysis (dict): with the following arrays, of shape (R,) for a
+            single wind or (N, R) for N winds:
+            > 'headwind', 'crosswind': wind components of each runway.
+            > 'within_limits': True if the crosswind does not exceed max_crosswind.
+            and 'best_runway': position of the runway with the highest
+            headwind among those within limits, or -1 if there is none
+            (a scalar for a single wind or N values).
+    """
+    runway_headings = np.asarray(runway_headings)
+    wind_speed = np.asarray(wind_speed)
+    wind_direction = np.asarray(wind_direction)
+    if wind_speed.ndim or wind_direction.ndim:
+        wind_speed = np.broadcast_to(wind_speed, np.broadcast(wind_speed, wind_direction).shape)[:, np.newaxis]
+        wind_direction = np.broadcast_to(wind_direction, wind_speed.shape[:1])[:, np.newaxis]
+    headwind, crosswind = compute_wind_components(runway_headings, wind_speed, wind_direction)
+    within_limits = np.abs(crosswind) <= max_crosswind
+    candidates = np.where(within_limits, headwind, -np.inf)
+    best_runway = np.where(within_limits.any(axis=-1), np.argmax(candidates, axis=-1), -1)
+    return {'headwind': headwind, 'crosswind': crosswind, 'within_limits': within_limits, 'best_runway': best_runway}
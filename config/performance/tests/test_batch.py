@@ -0,0 +1,83 @@
+import random
+import unittest
+import pandas as pd
+from ..src import errors
+from ..src import run_performance
+
+SCENARIO = {'to_weight': 2120, 'fuel_capacity': 40,
+            'to_heading': 170, 'to_length': 1750, 'to_condition': 'g', 'to_press_alt': 1200, 'to_temp': 15,
+            'to_wind_speed': 27, 'to_wind_direction': 110,
+            'travel_dist': 590, 'cr_heading': 90, 'cr_press_alt': 7000, 'cr_temp': 4,
+            'cr_wind_speed': 18, 'cr_wind_direction': 270, 'cr_power': 2500,
+            'land_heading': 220, 'land_length': 2000, 'land_condition': 'p', 'land_press_alt': 4000, 'land_temp': 10,
+            'land_wind_speed': 9, 'land_wind_direction': 70}
+
+
+def generate_scenarios(size, seed=0):
+    """Returns random scenarios that compute_performance can solve."""
+    rng = random.Random(seed)
+    scenarios = []
+    while len(scenarios) < size:
+        scenario = dict(SCENARIO,
+                        to_weight=rng.randint(1397, 2300), fuel_capacity=rng.choice([40, 50]),
+                        to_heading=rng.randint(1, 360), to_condition=rng.choice('pg'),
+                        to_press_alt=rng.randint(0, 14200), to_temp=rng.randint(-20, 40),
+                        to_wind_speed=rng.randint(0, 35), to_wind_direction=5*rng.randint(1, 72),
+                        travel_dist=rng.randint(0, 750), cr_heading=5*rng.randint(1, 72),
+                        cr_press_alt=rng.randint(0, 14200), cr_temp=rng.randint(-20, 40),
+                        cr_wind_speed=rng.randint(0, 50), cr_wind_direction=5*rng.randint(1, 72),
+                        cr_power=rng.randint(2100, 2650),
+                        land_heading=rng.randint(1, 360), land_condition=rng.choice('pg'),
+                        land_press_alt=rng.randint(0, 14200), land_temp=rng.randint(-20, 40),
+                        land_wind_speed=rng.randint(0, 35), land_wind_direction=5*rng.randint(1, 72))
+        try:
+            run_performance.compute_performance(dict(scenario))
+        except errors.PerformanceError:
+            continue
+        scenarios.append(scenario)
+    return scenarios
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_batch_matches_compute_performance(self):
+        scenarios = generate_scenarios(500)
+        results = run_performance.compute_performance_batch(pd.DataFrame(scenarios))
+        self.assertEqual(list(results.columns), run_performance.OUTPUT_FIELDS)
+        for (i, scenario) in enumerate(scenarios):
+            expected = run_performance.compute_performance(dict(scenario))
+            obtained = results.iloc[i].to_dict()
+            self.assertEqual(obtained, expected, msg=str(scenario))
+
+    def test_batch_accepts_dict_of_lists(self):
+        columns = {field: [SCENARIO[field]]*3 for field in SCENARIO}
+        results = run_performance.compute_performance_batch(columns)
+        expected = run_performance.compute_performance(dict(SCENARIO))
+        for field in run_performance.OUTPUT_FIELDS:
+            self.assertEqual(results[field].tolist(), [expected[field]]*3)
+
+    def test_batch_records_errors(self):
+        scenarios = generate_scenarios(200, seed=1)
+        # Invalid input data, and an rpm that is too low for the cruise altitude.
+        scenarios[10] = dict(SCENARIO, to_weight=2500)
+        scenarios[150] = dict(SCENARIO, cr_power=2100, cr_press_alt=12000)
+        with self.assertRaises(errors.InputError):
+            run_performance.compute_performance_batch(pd.DataFrame(scenarios))
+        results = run_performance.compute_performance_batch(pd.DataFrame(scenarios), on_error='record')
+        self.assertEqual(list(results.columns), run_performance.OUTPUT_FIELDS + ['error'])
+        for (i, scenario) in enumerate(scenarios):
+            try:
+                expected = dict(run_performance.compute_performance(dict(scenario)), error=None)
+            except errors.PerformanceError as error:
+                expected = dict({field: None for field in run_performance.OUTPUT_FIELDS}, error=str(error))
+            self.assertEqual(results.iloc[i].to_dict(), expected, msg=str(scenario))
+        self.assertTrue(results['error'][10].startswith('Takeoff weight |'))
+        self.assertTrue(results['error'][150].startswith('Cruise rpm |'))
+
+    def test_empty_batch(self):
+        results = run_performance.compute_performance_batch({field: [] for field in SCENARIO})
+        self.assertEqual(len(results['to_roll']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+from benchmarks import run_benchmarks
+from ..src import run_performance
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_generated_scenarios_are_valid(self):
+        scenarios = run_benchmarks.generate_scenarios(500)
+        results = run_performance.compute_performance_batch(scenarios, on_error='record')
+        self.assertTrue(all(error is None for error in results['error'].tolist()))
+
+    def test_find_regressions(self):
+        baseline = {'metrics': {'latency': run_benchmarks.metric(100.0, 'us'),
+                                'throughput': run_benchmarks.metric(1000.0, 'scenarios/s', 'higher'),
+                                'removed': run_benchmarks.metric(1.0, 'ms')}}
+        results = {'metrics': {'latency': run_benchmarks.metric(115.0, 'us'),
+                               'throughput': run_benchmarks.metric(700.0, 'scenarios/s', 'higher'),
+                               'added': run_benchmarks.metric(1.0, 'ms')}}
+        regressions = run_benchmarks.find_regressions(results, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('throughput'))
+        self.assertEqual(len(run_benchmarks.find_regressions(results, baseline, threshold=0.1)), 2)
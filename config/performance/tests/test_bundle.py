@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import pandas as pd
+from ..src import bundle
+from ..src import precompute
+from ..src import tables
+
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.data_folder = self.folder / 'data'
+        shutil.copytree(tables.DATA_DIR, self.data_folder)
+        self.path = precompute.compile_bundle(self.folder / 'tables.bundle', self.data_folder)
+
+    def test_bundle_matches_csv(self):
+        csv_tables, csv_report = tables.load_tables(self.data_folder, bundle_path=None)
+        bundle_tables, bundle_report = tables.load_tables(self.data_folder, self.path)
+        self.assertEqual((csv_report['source'], bundle_report['source']), ('csv', 'bundle'))
+        for (name, table) in csv_tables.items():
+            pd.testing.assert_frame_equal(bundle_tables[name].to_dataframe(), table.to_dataframe())
+
+    def test_bundle_is_read_only(self):
+        (_, _, columns) = bundle.read_bundle(self.path)['takeoff']
+        with self.assertRaises(ValueError):
+            columns['weight'][0] = 0
+
+    def test_corrupted_bundle(self):
+        data = bytearray(self.path.read_bytes())
+        data[-1] ^= 0xFF
+        self.path.write_bytes(bytes(data))
+        with self.assertRaises(bundle.BundleError):
+            bundle.read_bundle(self.path)
+        self.assertEqual(tables.load_tables(self.data_folder, self.path)[1]['source'], 'csv')
+
+    def test_corrupted_header(self):
+        original = self.path.read_bytes()
+        start = bundle.PREAMBLE.size
+        # An invalid UTF-8 byte, a renamed key and an unknown dtype.
+        for (old, new) in ((b'{', b'\xff'), (b'"checksum"', b'"checksun"'), (b'"<i8"', b'"zzz"')):
+            with self.subTest(old=old):
+                position = original.index(old, start)
+                self.path.write_bytes(original[:position] + new + original[position + len(old):])
+                with self.assertRaises(bundle.BundleError):
+                    bundle.read_bundle(self.path)
+                self.assertEqual(tables.load_tables(self.data_folder, self.path)[1]['source'], 'csv')
+
+    def test_outdated_bundle(self):
+        with open(self.data_folder / 'roc.csv', 'a') as file:
+            file.write('\n')
+        with self.assertRaises(bundle.BundleError):
+            bundle.read_bundle(self.path, tables.compute_source_digest(self.data_folder))
+        self.assertEqual(tables.load_tables(self.data_folder, self.path)[1]['source'], 'csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import time
+import unittest
+from ..src import cache
+from ..src import run_performance
+from .test_batch import SCENARIO
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        result_cache = cache.ResultCache(maxsize=2)
+        result_cache.set('a', 1)
+        result_cache.set('b', 2)
+        result_cache.get('a')
+        result_cache.set('c', 3)
+        self.assertIsNone(result_cache.get('b'))
+        self.assertEqual(result_cache.get('a'), 1)
+        self.assertEqual(result_cache.get('c'), 3)
+        stats = result_cache.stats()
+        self.assertEqual((stats['size'], stats['hits'], stats['misses'], stats['evictions']), (2, 3, 1, 1))
+
+    def test_ttl_expiry(self):
+        result_cache = cache.ResultCache(maxsize=2, ttl=0.01)
+        result_cache.set('a', 1)
+        time.sleep(0.02)
+        self.assertIsNone(result_cache.get('a'))
+        self.assertEqual(result_cache.stats()['evictions'], 1)
+
+    def test_disabled_cache(self):
+        result_cache = cache.ResultCache(maxsize=0)
+        result_cache.set('a', 1)
+        self.assertIsNone(result_cache.get('a'))
+
+
+class TestComputePerformanceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.result_cache = cache.configure_result_cache()
+
+    def tearDown(self):
+        cache.configure_result_cache()
+
+    def test_equivalent_scenarios_hit_the_cache(self):
+        results = run_performance.compute_performance(dict(SCENARIO))
+        # A slightly different pressure altitude is approximated to the same table values.
+        cached_results = run_performance.compute_performance(dict(SCENARIO, to_press_alt=SCENARIO['to_press_alt'] - 100))
+        self.assertEqual(cached_results, results)
+        stats = self.result_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_cached_results_are_copies(self):
+        results = run_performance.compute_performance(dict(SCENARIO))
+        results['to_roll'] = None
+        self.assertIsNotNone(run_performance.compute_performance(dict(SCENARIO))['to_roll'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from common import executor
+from ..src import cache
+from ..src import coalesce
+from ..src import run_performance
+from .test_batch import SCENARIO
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = coalesce.SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow(self, value):
+        self.calls += 1
+        self.release.wait(5)
+        if value < 0:
+            raise ValueError('negative')
+        return value*2
+
+    def wait_for_followers(self, count):
+        while self.flight.stats()['coalesced'] < count:
+            threading.Event().wait(0.001)
+
+    def test_concurrent_calls_share_one_computation(self):
+        with ThreadPoolExecutor(5) as pool:
+            futures = [pool.submit(self.flight.call, 'key', self.slow, 21) for _ in range(5)]
+            self.wait_for_followers(4)
+            self.release.set()
+            self.assertEqual([future.result() for future in futures], [42]*5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flight.stats(), {'in_flight': 0, 'leaders': 1, 'coalesced': 4})
+
+    def test_errors_are_shared(self):
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(self.flight.call, 'key', self.slow, -1) for _ in range(3)]
+            self.wait_for_followers(2)
+            self.release.set()
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result()
+        self.assertEqual(self.calls, 1)
+
+    def test_sequential_and_unkeyed_calls_are_not_merged(self):
+        self.release.set()
+        self.flight.call('key', self.slow, 1)
+        self.flight.call('key', self.slow, 1)
+        self.flight.call(None, self.slow, 1)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.flight.stats()['coalesced'], 0)
+
+    def test_async_requests_share_one_executor_slot(self):
+        pool = executor.BoundedExecutor(max_workers=1, max_queued=0)
+
+        async def request():
+            future = self.flight.submit('key', pool.submit, self.slow, 21)
+            return await pool.wait(future, timeout=5, shared=True)
+
+        async def main():
+            requests = [asyncio.ensure_future(request()) for _ in range(4)]
+            await asyncio.sleep(0.01)
+            self.release.set()
+            return await asyncio.gather(*requests)
+
+        self.assertEqual(asyncio.run(main()), [42]*4)
+        pool.shutdown()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(pool.stats()['rejected'], 0)
+        self.assertEqual(self.flight.stats()['coalesced'], 3)
+
+
+class TestCanonicalKey(unittest.TestCase):
+
+    def test_identical_inputs(self):
+        self.assertEqual(coalesce.canonical_key(dict(SCENARIO)), coalesce.canonical_key(SCENARIO))
+        self.assertNotEqual(coalesce.canonical_key(dict(SCENARIO, to_temp=16)), coalesce.canonical_key(SCENARIO))
+
+    def test_inputs_are_not_normalized(self):
+        # compute_performance does not treat these values as the same.
+        for changes in [{'to_condition': 'G'}, {'to_temp': '15'}, {'to_temp': 15.0}]:
+            self.assertNotEqual(coalesce.canonical_key(dict(SCENARIO, **changes)), coalesce.canonical_key(SCENARIO))
+
+    def test_invalid_inputs_are_not_merged(self):
+        self.assertIsNone(coalesce.canonical_key(dict(SCENARIO, to_weight='heavy')))
+        self.assertIsNone(coalesce.canonical_key({}))
+
+    def test_compute_performance(self):
+        self.assertEqual(coalesce.compute_performance(dict(SCENARIO)), run_performance.compute_performance(dict(SCENARIO)))
+
+    def test_concurrent_inputs_that_differ_in_case(self):
+        cache.configure_result_cache(0)
+        self.addCleanup(cache.configure_result_cache)
+        scenarios = [dict(SCENARIO, to_condition='g'), dict(SCENARIO, to_condition='G')]
+        expected = [run_performance.compute_performance(dict(scenario)) for scenario in scenarios]
+        self.assertNotEqual(expected[0]['to_roll'], expected[1]['to_roll'])
+        compute_performance = run_performance.compute_performance
+        # Both computations must be in flight at the same time.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow(input_data):
+            barrier.wait()
+            return compute_performance(input_data)
+
+        with mock.patch.object(run_performance, 'compute_performance', slow), ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(coalesce.compute_performance, dict(scenario)) for scenario in scenarios]
+            self.assertEqual([future.result() for future in futures], expected)
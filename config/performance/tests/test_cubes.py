@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+from ..src import cubes
+from ..src import tables
+
+
+class TestCubes(unittest.TestCase):
+
+    def test_takeoff_cube_matches_table(self):
+        takeoff_df = tables.get_table('takeoff')
+        cube = cubes.compile_takeoff_cube(takeoff_df)
+        for (_, row) in takeoff_df.iterrows():
+            for temp in range(0, 50, 10):
+                obtained = cubes.lookup_distances(cube, row['weight'], row['press_alt'], temp)
+                expected = (row[str(temp) + '_celsius_gr_roll'], row[str(temp) + '_celsius_50_ft'])
+                self.assertEqual(obtained, expected)
+                self.assertEqual(type(obtained[0]), type(expected[0]))
+
+    def test_landing_cube_matches_table(self):
+        landing_df = tables.get_table('landing')
+        cube = cubes.compile_landing_cube(landing_df)
+        for (_, row) in landing_df.iterrows():
+            for temp in range(0, 50, 10):
+                obtained = cubes.lookup_distances(cube, row['press_alt'], temp)
+                expected = (row[str(temp) + '_celsius_gr_roll'], row[str(temp) + '_celsius_50_ft'])
+                self.assertEqual(obtained, expected)
+
+    def test_array_lookup(self):
+        cube = cubes.compile_takeoff_cube(tables.get_table('takeoff'))
+        weights = np.array([1900, 2100, 2300])
+        altitudes = np.array([0, 4000, 8000])
+        temps = np.array([40, 10, 0])
+        ground_roll, fifty_ft_roll = cubes.lookup_distances_array(cube, weights, altitudes, temps)
+        self.assertEqual(ground_roll.tolist(), [620, 910, 1550])
+        self.assertEqual(fifty_ft_roll.tolist(), [1115, 1640, 2870])
+        with self.assertRaises(KeyError):
+            cubes.lookup_distances_array(cube, weights, altitudes, np.array([0, 5, 10]))
+
+
+if __name__ == '__main__':
+    unittest.main()
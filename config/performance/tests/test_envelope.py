@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ..src import cache
+from ..src import envelope
+from ..src import errors
+from ..src import run_performance
+from .test_batch import SCENARIO
+
+
+class TestEnvelope(unittest.TestCase):
+
+    def setUp(self):
+        cache.configure_result_cache(0)
+
+    def tearDown(self):
+        cache.configure_result_cache()
+
+    def compute_point(self, **changes):
+        """Returns the results of SCENARIO with the given changes, or None if it is invalid."""
+        try:
+            return run_performance.compute_performance(dict(SCENARIO, **changes))
+        except errors.PerformanceError:
+            return None
+
+    def assert_point(self, value, expected):
+        if expected is None:
+            self.assertTrue(np.isnan(value))
+        else:
+            self.assertEqual(value, expected)
+
+    def test_takeoff_envelope_matches_compute_performance(self):
+        press_alts, temps, weights = [0, 1300, 5000, 8800, 14000], [-20, -3, 14, 38, 45], [1500, 2000, 2290, 2400]
+        result = envelope.takeoff_envelope(press_alts, temps, weights, headwind=-5, condition='G')
+        self.assertEqual(result.values['to_roll'].shape, (5, 5, 4))
+        for (i, press_alt) in enumerate(press_alts):
+            for (j, temp) in enumerate(temps):
+                for (k, weight) in enumerate(weights):
+                    # A tailwind of 5 knots.
+                    expected = self.compute_point(to_press_alt=press_alt, to_temp=temp, to_weight=weight, to_heading=90,
+                                                  to_wind_speed=5, to_wind_direction=270, to_condition='g')
+                    self.assert_point(result.values['to_roll'][i, j, k], expected and expected['to_roll'])
+                    self.assert_point(result.values['to_50_roll'][i, j, k], expected and expected['to_50_roll'])
+
+    def test_landing_envelope_matches_compute_performance(self):
+        press_alts, temps = [0, 2600, 9000], [-10, 22, 41]
+        result = envelope.landing_envelope(press_alts, temps, headwind=10)
+        for (i, press_alt) in enumerate(press_alts):
+            for (j, temp) in enumerate(temps):
+                expected = self.compute_point(land_press_alt=press_alt, land_temp=temp, land_heading=180,
+                                              land_wind_speed=10, land_wind_direction=180, land_condition='p')
+                self.assert_point(result.values['land_roll'][i, j], expected and expected['land_roll'])
+
+    def test_cruise_envelope_matches_compute_performance(self):
+        press_alts, rpms = np.arange(0, 14201, 700), np.arange(2100, 2651, 25)
+        result = envelope.cruise_envelope(press_alts, rpms, temps=-5, fuel_capacity=40)
+        self.assertTrue(np.isnan(result.values['max_range']).any())
+        for (i, press_alt) in enumerate(press_alts.tolist()):
+            for (j, rpm) in enumerate(rpms.tolist()):
+                expected = self.compute_point(cr_press_alt=press_alt, cr_power=rpm, cr_temp=-5, cr_wind_speed=0,
+                                              fuel_capacity=40)
+                self.assert_point(result.values['max_range'][i, j], expected and expected['max_range'])
+                self.assert_point(result.values['max_endurance'][i, j], expected and expected['max_endurance'])
+
+    def test_invalid_conditions(self):
+        with self.assertRaises(errors.InputError):
+            envelope.takeoff_envelope([0], [15], [2000], condition='x')
+        with self.assertRaises(errors.InputError):
+            envelope.cruise_envelope([4000], [2400], fuel_capacity=45)
+
+    def test_to_table(self):
+        result = envelope.takeoff_envelope([0, 1000], [10, 20, 30], [2000, 2300])
+        table = envelope.to_table(result)
+        self.assertEqual(list(table.columns), ['to_press_alt', 'to_temp', 'to_weight', 'to_roll', 'to_50_roll'])
+        self.assertEqual(len(table), 12)
+        row = table[(table['to_press_alt'] == 1000) & (table['to_temp'] == 20) & (table['to_weight'] == 2300)]
+        self.assertEqual(row['to_roll'].item(), result.values['to_roll'][1, 1, 1])
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'envelope.npz')
+            arguments = {'press_alts': [0, 4000], 'temps': [0, 20], 'weights': [2000]}
+            first = envelope.compute_envelope('takeoff', path, **arguments)
+            self.assertTrue(os.path.exists(path))
+            cached = envelope.load_envelope(path, envelope.format_arguments('takeoff', arguments))
+            self.assertEqual(list(cached.axes), list(first.axes))
+            np.testing.assert_array_equal(cached.values['to_roll'], first.values['to_roll'])
+            # Other arguments do not use the cached envelope.
+            self.assertIsNone(envelope.load_envelope(path, envelope.format_arguments('takeoff', dict(arguments, weights=[2300]))))
+            other = envelope.compute_envelope('takeoff', path, **dict(arguments, weights=[2300]))
+            self.assertEqual(other.values['to_roll'].shape, (2, 2, 1))
+        with self.assertRaises(ValueError):
+            envelope.compute_envelope('climb')
@@ -0,0 +1,36 @@
+import unittest
+from ..src import cruise
+from ..src import errors
+from ..src import input_check
+from ..src import run_performance
+from .test_batch import SCENARIO
+
+
+class TestErrors(unittest.TestCase):
+
+    def test_invalid_input_raises_input_error(self):
+        with self.assertRaises(errors.InputError) as context:
+            run_performance.compute_performance(dict(SCENARIO, to_weight=2500))
+        self.assertEqual(str(context.exception), 'Takeoff weight | ERROR: The weight must be between 1397 and 2300 pounds.')
+        self.assertEqual(context.exception.label, 'Takeoff weight')
+        self.assertIsInstance(context.exception, errors.PerformanceError)
+
+    def test_non_numeric_value(self):
+        with self.assertRaises(errors.InputError):
+            input_check.check_wind_speed('calm')
+        with self.assertRaises(errors.InputError):
+            input_check.check_take_off_weight(None)
+
+    def test_invalid_power_setting(self):
+        with self.assertRaises(errors.PowerSettingError):
+            cruise.check_for_invalid_data(2000, 2500)
+        with self.assertRaises(errors.PowerSettingError):
+            run_performance.compute_performance(dict(SCENARIO, cr_power=2100, cr_press_alt=12000))
+
+    def test_errors_are_not_system_exit(self):
+        for error in (errors.InputError('Label', 'message'), errors.PowerSettingError(), errors.TableRangeError()):
+            self.assertIsInstance(error, Exception)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import unittest
+from common import executor
+from ..src import run_performance
+from .test_batch import SCENARIO
+
+
+class TestBoundedExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = executor.BoundedExecutor(max_workers=1, max_queued=1)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.pool.shutdown()
+
+    def test_run_returns_the_result(self):
+        results = asyncio.run(self.pool.run(run_performance.compute_performance, dict(SCENARIO)))
+        self.assertEqual(results, run_performance.compute_performance(dict(SCENARIO)))
+        self.assertEqual(self.pool.stats()['active'], 0)
+
+    def test_errors_are_propagated(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(self.pool.run(run_performance.compute_performance, dict(SCENARIO, to_weight=5000)))
+
+    def test_saturated_pool_rejects_work(self):
+        running = self.pool.submit(self.release.wait)
+        queued = self.pool.submit(self.release.wait)
+        self.assertTrue(self.pool.is_saturated())
+        with self.assertRaises(executor.ExecutorSaturated):
+            self.pool.submit(self.release.wait)
+        self.release.set()
+        self.pool.shutdown()
+        self.assertTrue(running.done() and queued.done())
+        self.assertEqual(self.pool.stats()['rejected'], 1)
+        self.assertFalse(self.pool.is_saturated())
+
+    def test_timeout_keeps_the_slot_until_the_work_ends(self):
+        with self.assertRaises(TimeoutError):
+            asyncio.run(self.pool.run(self.release.wait, timeout=0.01))
+        self.assertEqual(self.pool.stats()['active'], 1)
+        self.assertEqual(self.pool.stats()['timeouts'], 1)
+        self.release.set()
+        self.pool.shutdown()
+        self.assertEqual(self.pool.stats()['active'], 0)
+
+    def test_iterate(self):
+        async def collect():
+            return [item async for item in self.pool.iterate(iter(range(5)))]
+
+        self.assertEqual(asyncio.run(collect()), list(range(5)))
+        self.assertEqual(self.pool.stats()['active'], 0)
@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+from ..src import data
+from ..src import grids
+
+SPECS = [grids.TAKEOFF_WEIGHT, grids.TAKEOFF_PRESS_ALT, grids.TAKEOFF_TEMP, grids.ROC_PRESS_ALT, grids.ROC_TEMP,
+         grids.CRUISE_PRESS_ALT_500, grids.CRUISE_PRESS_ALT_1000, grids.CRUISE_POWER_PRESS_ALT,
+         grids.LANDING_PRESS_ALT, grids.LANDING_TEMP]
+
+
+class TestGrids(unittest.TestCase):
+
+    def test_conservative_rounding(self):
+        self.assertEqual(data.valid_takeoff_press_alt(1249), 1000)
+        self.assertEqual(data.valid_takeoff_press_alt(1250), 2000)
+        self.assertEqual(data.valid_takeoff_weight(1949), 1900)
+        self.assertEqual(data.valid_takeoff_weight(1950), 2100)
+        self.assertEqual(data.valid_roc_temp(-11), -20)
+        self.assertEqual(data.valid_roc_temp(-10), 0)
+
+    def test_clamp(self):
+        self.assertEqual(data.valid_takeoff_temp(-20), 0)
+        self.assertEqual(data.valid_takeoff_press_alt(14200), 8000)
+        self.assertEqual(data.valid_cruise_power_press_alt(0), 2000)
+        self.assertIsNone(data.valid_takeoff_weight(2350))
+
+    def test_array_snapping_matches_scalar_snapping(self):
+        values = np.arange(-50, 14201)
+        for spec in SPECS:
+            if not spec.clamp:
+                values = values[values < spec.grid[-1] + spec.threshold]
+            expected = [grids.snap(spec, value) for value in values.tolist()]
+            self.assertEqual(grids.snap_array(spec, values).tolist(), expected)
+
+    def test_array_without_valid_value(self):
+        with self.assertRaises(ValueError):
+            grids.snap_array(grids.TAKEOFF_TEMP, np.array([10, 45]))
+
+
+if __name__ == '__main__':
+    unittest.main()
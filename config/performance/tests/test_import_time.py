@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# Maximum time in seconds to import config.wsgi in a new interpreter.
+IMPORT_TIME_BUDGET = 1.0
+
+CONFIG_DIR = Path(__file__).resolve().parents[2]
+
+MEASURE_IMPORT = """
+import json, sys, time
+start = time.perf_counter()
+import config.wsgi
+from performance.src import run_performance
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'pandas': 'pandas' in sys.modules}))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_wsgi_import_time(self):
+        output = subprocess.run([sys.executable, '-c', MEASURE_IMPORT], cwd=CONFIG_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        measure = json.loads(output.splitlines()[-1])
+        self.assertFalse(measure['pandas'], 'pandas must not be imported at startup.')
+        self.assertLess(measure['elapsed'], IMPORT_TIME_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import cProfile
+import unittest
+from ..src import cache
+from ..src import instrumentation
+from ..src import run_performance
+from .test_batch import SCENARIO, generate_scenarios
+
+SCALAR_STAGES = ['check', 'tables', 'data', 'wind', 'cache', 'takeoff', 'cruise', 'fuel', 'landing', 'total']
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+        cache.configure_result_cache(0)
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+        cache.configure_result_cache()
+
+    def test_disabled_records_nothing(self):
+        self.assertIs(instrumentation.start_timer(), instrumentation.NULL_TIMER)
+        run_performance.compute_performance(dict(SCENARIO))
+        self.assertEqual(instrumentation.get_stats(), {})
+
+    def test_stages_are_recorded(self):
+        instrumentation.enable()
+        for _ in range(3):
+            run_performance.compute_performance(dict(SCENARIO))
+        stats = instrumentation.get_stats()
+        self.assertEqual(list(stats), SCALAR_STAGES)
+        for values in stats.values():
+            self.assertEqual(values['count'], 3)
+            self.assertLessEqual(values['min'], values['p50'])
+            self.assertLessEqual(values['p99'], values['max'])
+        self.assertEqual(instrumentation.get_profiles(), [])
+
+    def test_failed_computations_are_recorded(self):
+        instrumentation.enable()
+        with self.assertRaises(ValueError):
+            run_performance.compute_performance(dict(SCENARIO, to_weight=5000))
+        self.assertEqual(list(instrumentation.get_stats()), ['total'])
+
+    def test_batch_stages_are_recorded(self):
+        instrumentation.enable()
+        scenarios = generate_scenarios(50)
+        timings = {}
+        run_performance.compute_performance_batch(
+            {field: [scenario[field] for scenario in scenarios] for field in run_performance.INPUT_FIELDS}, timings)
+        stats = instrumentation.get_stats()
+        self.assertEqual(sorted(timings), sorted(run_performance.STAGES))
+        for stage in run_performance.STAGES + ['total']:
+            self.assertEqual(stats['batch.' + stage]['count'], 1)
+
+    def test_sampled_profiles(self):
+        instrumentation.enable(sample_rate=1.0, profiler='cprofile')
+        run_performance.compute_performance(dict(SCENARIO))
+        run_performance.compute_performance(dict(SCENARIO))
+        profiles = instrumentation.get_profiles()
+        self.assertEqual(len(profiles), 2)
+        self.assertIsInstance(profiles[0], cProfile.Profile)
+
+    def test_custom_profiler_hook(self):
+        calls = []
+
+        class Hook:
+            def start(self):
+                calls.append('start')
+
+            def stop(self):
+                calls.append('stop')
+                return 'profile'
+
+        instrumentation.enable(sample_rate=1.0, profiler=Hook)
+        run_performance.compute_performance(dict(SCENARIO))
+        self.assertEqual(calls, ['start', 'stop'])
+        self.assertEqual(instrumentation.get_profiles(), ['profile'])
+
+    def test_unknown_profiler(self):
+        with self.assertRaises(ValueError):
+            instrumentation.enable(sample_rate=0.5, profiler='perf')
+
+
+class TestStageHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = instrumentation.StageHistogram()
+        for _ in range(99):
+            histogram.record(1e-5)
+        histogram.record(1.0)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 100)
+        self.assertLess(snapshot['p50'], 2e-5)
+        self.assertLess(snapshot['p90'], 2e-5)
+        self.assertEqual(snapshot['max'], 1.0)
+        self.assertEqual(sum(count for (_, count) in snapshot['buckets']), 100)
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from ..src import interpolation
+from ..src import tables
+from ..src.helpers import dataframe_interpolation
+
+# (press_alt, power, endurance40, range40) obtained with the original
+# list-based interpolation.
+EXPECTED = [
+    (2000, 60, 5.14, 540.5),
+    (3000, 60, 5.12, 541.75),
+    (3000, 65, 4.72, 520.5),
+    (5000, 44, 6.34, 583.28),
+    (500, 72, 4.33, 485.1),
+]
+
+
+class TestInterpolation(unittest.TestCase):
+
+    def setUp(self):
+        self.endurance_df = tables.get_table('endurance40')
+        self.range_df = tables.get_table('range40')
+
+    def test_dataframe_interpolation(self):
+        for (press_alt, power, endurance, rang) in EXPECTED:
+            self.assertEqual(dataframe_interpolation(press_alt, power, self.endurance_df), endurance)
+            self.assertEqual(dataframe_interpolation(press_alt, power, self.range_df), rang)
+
+    def test_table_values_are_not_interpolated(self):
+        self.assertEqual(dataframe_interpolation(4000, 55, self.endurance_df), 5.48)
+
+    def test_array_interpolation(self):
+        grid = interpolation.compile_table_grid(self.range_df)
+        rows = np.array([row[0] for row in EXPECTED] + [4000])
+        columns = np.array([row[1] for row in EXPECTED] + [55])
+        expected = [row[3] for row in EXPECTED] + [564]
+        self.assertEqual(interpolation.interpolate(grid, rows, columns).tolist(), expected)
+
+    def test_power_above_table(self):
+        grid = interpolation.compile_table_grid(self.range_df)
+        with self.assertRaises(IndexError):
+            interpolation.interpolate(grid, np.array([2000, 2000]), np.array([60, 76]))
+
+
+if __name__ == '__main__':
+    unittest.main()
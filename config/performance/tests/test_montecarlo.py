@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from ..src import cache
+from ..src import errors
+from ..src import montecarlo
+from ..src import pipeline
+from ..src import run_performance
+from .test_batch import SCENARIO
+
+DISTRIBUTIONS = {'to_temp': montecarlo.normal(8), 'to_wind_speed': montecarlo.normal(4),
+                 'to_wind_direction': montecarlo.uniform(-60, 60), 'to_press_alt': montecarlo.normal(300),
+                 'cr_temp': montecarlo.normal(5), 'cr_wind_speed': montecarlo.triangular(-5, 0, 15),
+                 'land_temp': montecarlo.normal(8)}
+
+
+class TestMonteCarlo(unittest.TestCase):
+
+    def setUp(self):
+        cache.configure_result_cache(0)
+
+    def tearDown(self):
+        cache.configure_result_cache()
+
+    def test_results_match_compute_performance(self):
+        result = montecarlo.run_monte_carlo(SCENARIO, DISTRIBUTIONS, size=2000, seed=1, workers=1)
+        self.assertFalse(result.valid.all())
+        for row in range(0, 2000, 7):
+            scenario = dict(SCENARIO, **{field: values[row].item() for (field, values) in result.samples.items()})
+            try:
+                expected = run_performance.compute_performance(scenario)
+            except errors.PerformanceError:
+                self.assertFalse(result.valid[row])
+                self.assertTrue(np.isnan(result.results['to_roll'][row]))
+                continue
+            self.assertTrue(result.valid[row])
+            self.assertEqual({key: result.results[key][row] for key in expected}, expected)
+
+    def test_summary(self):
+        result = montecarlo.run_monte_carlo(SCENARIO, DISTRIBUTIONS, size=2000, seed=1, workers=1,
+                                            thresholds={'to_50_roll': 1200})
+        values = result.results['to_50_roll'][result.valid]
+        self.assertEqual(list(result.percentiles['to_50_roll']), [50, 90, 99])
+        self.assertEqual(result.percentiles['to_50_roll'][90], np.percentile(values, 90))
+        self.assertLessEqual(result.percentiles['fuel_reserve'][50], result.percentiles['fuel_reserve'][99])
+        self.assertEqual(result.exceedance['to_50_roll > 1200'], (values > 1200).mean())
+        self.assertEqual(result.exceedance['to_50_roll > to_length'], (values > SCENARIO['to_length']).mean())
+        self.assertIn('fuel_reserve < 0', result.exceedance)
+
+    def test_samples_do_not_depend_on_the_processes(self):
+        single = montecarlo.run_monte_carlo(SCENARIO, DISTRIBUTIONS, size=3000, seed=7, chunk_size=1000, workers=1)
+        pool = montecarlo.run_monte_carlo(SCENARIO, DISTRIBUTIONS, size=3000, seed=7, chunk_size=1000, workers=2)
+        np.testing.assert_array_equal(single.valid, pool.valid)
+        np.testing.assert_array_equal(single.results['to_50_roll'], pool.results['to_50_roll'])
+        self.assertEqual(single.percentiles, pool.percentiles)
+
+    def test_draw_samples(self):
+        state = pipeline.evaluate(dict(SCENARIO, to_wind_direction=350, to_wind_speed=2))
+        samples = montecarlo.draw_samples(state, {'to_wind_direction': montecarlo.uniform(0, 30),
+                                                  'to_wind_speed': montecarlo.uniform(-10, -5)}, 1000, seed=0)
+        self.assertEqual(list(samples), ['to_wind_speed', 'to_wind_direction'])
+        self.assertTrue(np.all(samples['to_wind_direction'] % 5 == 0))
+        self.assertTrue(np.all((samples['to_wind_direction'] >= 350) | (samples['to_wind_direction'] <= 20)))
+        self.assertTrue(np.all(samples['to_wind_speed'] == 0))
+        with self.assertRaises(ValueError):
+            montecarlo.draw_samples(state, {'to_condition': montecarlo.normal(1)}, 10)
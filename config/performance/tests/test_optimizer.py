@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+from ..src import cache
+from ..src import optimizer
+from ..src import run_performance
+from .test_batch import SCENARIO
+
+WINDS = {6000: (25, 90), 10000: (10, 180)}
+
+
+class TestOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        cache.configure_result_cache(0)
+
+    def tearDown(self):
+        cache.configure_result_cache()
+
+    def test_options_match_compute_performance(self):
+        scenario = dict(SCENARIO, travel_dist=300)
+        options = optimizer.evaluate_cruise_options(scenario, temps={12000: -10}, winds=WINDS)
+        self.assertGreater(len(options['cr_press_alt']), 20)
+        for row in range(len(options['cr_press_alt'])):
+            press_alt = options['cr_press_alt'][row].item()
+            wind_speed, wind_direction = WINDS.get(press_alt, (scenario['cr_wind_speed'], scenario['cr_wind_direction']))
+            expected = run_performance.compute_performance(dict(
+                scenario, cr_press_alt=press_alt, cr_power=options['cr_power'][row].item(), cr_temp=options['cr_temp'][row].item(),
+                cr_wind_speed=wind_speed, cr_wind_direction=wind_direction))
+            for key in ('max_endurance', 'max_range', 'fuel_required', 'fuel_reserve'):
+                self.assertEqual(options[key][row], expected[key])
+        self.assertEqual(options['cr_temp'][options['cr_press_alt'] == 12000].tolist()[0], -10)
+
+    def test_optimize_cruise_returns_the_pareto_set(self):
+        options = optimizer.evaluate_cruise_options(SCENARIO)
+        front = optimizer.optimize_cruise(SCENARIO)
+        self.assertEqual(list(front), optimizer.OPTION_FIELDS)
+        self.assertTrue(np.all(np.diff(front['trip_time']) > 0))
+        self.assertTrue(np.all(np.diff(front['fuel_required']) < 0))
+        for (fuel_required, trip_time) in zip(options['fuel_required'].tolist(), options['trip_time'].tolist()):
+            dominated = (front['fuel_required'] <= fuel_required) & (front['trip_time'] <= trip_time)
+            self.assertTrue(dominated.any())
+
+    def test_find_pareto_front(self):
+        fuel_required = np.array([10.0, 12.0, 9.0, 9.0, 11.0])
+        trip_time = np.array([2.0, 1.5, 2.5, 2.5, 2.0])
+        self.assertEqual(optimizer.find_pareto_front(fuel_required, trip_time).tolist(), [True, True, True, False, False])
+
+    def test_unreachable_altitudes_are_discarded(self):
+        options = optimizer.evaluate_cruise_options(dict(SCENARIO, travel_dist=10))
+        self.assertTrue(np.all(options['cr_press_alt'] <= 4000))
+
+    def test_altitudes_outside_the_temperature_limits_are_discarded(self):
+        # The lapse-rate temperature at 2000 ft is 39 and 41 degrees, respectively.
+        options = optimizer.evaluate_cruise_options(dict(SCENARIO, cr_press_alt=4000, cr_temp=35))
+        self.assertEqual(options['cr_press_alt'].min(), 2000)
+        scenario = dict(SCENARIO, cr_press_alt=4000, cr_temp=37)
+        options = optimizer.evaluate_cruise_options(scenario)
+        self.assertEqual(options['cr_press_alt'].min(), 4000)
+        options = optimizer.evaluate_cruise_options(scenario, temps={2000: 40})
+        self.assertEqual(options['cr_temp'][options['cr_press_alt'] == 2000].tolist()[0], 40)
@@ -0,0 +1,111 @@
+import random
+import unittest
+from unittest import mock
+import numpy as np
+from ..src import cache
+from ..src import errors
+from ..src import pipeline
+from ..src import run_performance
+from .test_batch import SCENARIO, generate_scenarios
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        cache.configure_result_cache(0)
+
+    def tearDown(self):
+        cache.configure_result_cache()
+
+    def test_evaluate_matches_compute_performance(self):
+        for scenario in generate_scenarios(100):
+            self.assertEqual(pipeline.get_results(pipeline.evaluate(dict(scenario))),
+                             run_performance.compute_performance(dict(scenario)))
+
+    def test_what_if_matches_compute_performance(self):
+        rng = random.Random(0)
+        edits = generate_scenarios(100, seed=1)
+        for (scenario, edit) in zip(generate_scenarios(100), edits):
+            changes = {field: edit[field] for field in rng.sample(run_performance.INPUT_FIELDS, rng.randint(1, 4))}
+            try:
+                expected = run_performance.compute_performance(dict(scenario, **changes))
+            except errors.PerformanceError as error:
+                with self.assertRaises(type(error)):
+                    pipeline.what_if(pipeline.evaluate(dict(scenario)), changes)
+                continue
+            self.assertEqual(pipeline.get_results(pipeline.what_if(pipeline.evaluate(dict(scenario)), changes)), expected)
+
+    def test_compute_performance_runs_the_stages(self):
+        with mock.patch.object(pipeline, 'run_stages', wraps=pipeline.run_stages) as run_stages:
+            run_performance.compute_performance(dict(SCENARIO))
+        names = [stage.name for call in run_stages.call_args_list for stage in call.args[1]]
+        self.assertEqual(sorted(names), sorted(stage.name for stage in pipeline.STAGES))
+
+    def test_affected_stages(self):
+        self.assertEqual(pipeline.affected_stages(['land_temp']), ['landing_data', 'landing'])
+        self.assertEqual(pipeline.affected_stages(['land_condition']), ['landing'])
+        self.assertEqual(pipeline.affected_stages(['cr_wind_speed']), ['cruise_wind', 'cruise', 'fuel'])
+        self.assertEqual(pipeline.affected_stages(['to_press_alt']), ['takeoff_data', 'takeoff', 'fuel'])
+        self.assertEqual(pipeline.affected_stages([]), [])
+
+    def test_what_if_checks_the_changed_fields(self):
+        state = pipeline.evaluate(dict(SCENARIO))
+        with self.assertRaises(errors.InputError) as context:
+            pipeline.what_if(state, {'land_temp': 60, 'to_weight': 5000})
+        self.assertEqual(context.exception.label, 'Takeoff weight')
+        with self.assertRaises(ValueError):
+            pipeline.what_if(state, {'altitude': 1000})
+
+    def test_previous_state_is_not_modified(self):
+        state = pipeline.evaluate(dict(SCENARIO))
+        previous = dict(state)
+        pipeline.what_if(state, {'land_temp': 30, 'cr_power': 2300})
+        self.assertEqual(state, previous)
+
+
+class TestWhatIfBatch(unittest.TestCase):
+
+    def setUp(self):
+        cache.configure_result_cache(0)
+
+    def tearDown(self):
+        cache.configure_result_cache()
+
+    def test_matches_compute_performance(self):
+        rng = random.Random(0)
+        fields = ['to_weight', 'to_press_alt', 'to_temp', 'cr_press_alt', 'cr_temp', 'cr_power', 'cr_wind_speed',
+                  'cr_wind_direction', 'land_temp', 'land_wind_direction', 'travel_dist']
+        for scenario in generate_scenarios(10):
+            deltas = [{field: rng.choice([-500, -30, -5, 0, 5, 30, 100]) for field in rng.sample(fields, rng.randint(0, 3))}
+                      for _ in range(200)]
+            results = pipeline.what_if_batch(pipeline.evaluate(dict(scenario)), deltas)
+            columns = pipeline.apply_deltas(scenario, deltas)
+            for (row, delta) in enumerate(deltas):
+                variant = dict(scenario, **{field: column[row].item() for (field, column) in columns.items()})
+                try:
+                    expected = run_performance.compute_performance(variant)
+                except errors.PerformanceError as error:
+                    self.assertEqual(results['error'][row], str(error))
+                    continue
+                self.assertIsNone(results['error'][row])
+                self.assertEqual({key: results[key][row] for key in run_performance.OUTPUT_FIELDS}, expected)
+
+    def test_apply_deltas(self):
+        state = dict(SCENARIO, cr_wind_direction=10, to_temp='15')
+        columns = pipeline.apply_deltas(state, [{'cr_wind_direction': -30, 'to_condition': 'g'}, {'to_temp': 5},
+                                                {'cr_wind_direction': 355}])
+        self.assertEqual(list(columns), ['to_condition', 'to_temp', 'cr_wind_direction'])
+        self.assertEqual(columns['cr_wind_direction'].tolist(), [340, 10, 5])
+        self.assertEqual(columns['to_temp'].tolist(), [15, 20, 15])
+        self.assertEqual(columns['to_condition'].tolist(), ['g', SCENARIO['to_condition'], SCENARIO['to_condition']])
+        with self.assertRaises(ValueError):
+            pipeline.apply_deltas(state, [{'altitude': 1000}])
+
+    def test_invalid_variants_are_recorded(self):
+        state = pipeline.evaluate(dict(SCENARIO))
+        results = pipeline.what_if_batch(state, [{}, {'to_weight': 5000}])
+        self.assertEqual({key: results[key][0] for key in run_performance.OUTPUT_FIELDS}, pipeline.get_results(state))
+        self.assertIsNone(results['to_roll'][1])
+        self.assertTrue(results['error'][1].startswith('Takeoff weight'))
+        self.assertEqual(len(pipeline.what_if_batch(state, [])['error']), 0)
+        self.assertIsInstance(results['error'], np.ndarray)
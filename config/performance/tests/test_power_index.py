@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from ..src import power_index
+from ..src import tables
+
+
+class TestPowerIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.power_df = tables.get_table('power')
+        self.index = power_index.compile_power_index(self.power_df)
+
+    def test_valid_rpm(self):
+        self.assertEqual(self.index.valid_rpm[8000].tolist(), [2650, 2600, 2500, 2400, 2300, 2200])
+
+    def test_snap_rpm(self):
+        self.assertEqual(power_index.snap_rpm(self.index, 2000, 2400), 2400)
+        self.assertEqual(power_index.snap_rpm(self.index, 2000, 2650), 2500)
+        self.assertEqual(power_index.snap_rpm(self.index, 2000, 2340), 2400)
+        self.assertEqual(power_index.snap_rpm(self.index, 2000, 2360), 2300)
+        with self.assertRaises(IndexError):
+            power_index.snap_rpm(self.index, 8000, 2150)
+
+    def test_snap_rpm_array_matches_scalar(self):
+        for press_alt in self.index.altitudes.tolist():
+            rpm = np.arange(self.index.valid_rpm[press_alt][-1], 2701)
+            expected = [power_index.snap_rpm(self.index, press_alt, value) for value in rpm.tolist()]
+            obtained = power_index.snap_rpm_array(self.index, np.full(len(rpm), press_alt), rpm)
+            self.assertEqual(obtained.tolist(), expected)
+
+    def test_power_setting_matches_table(self):
+        for (_, row) in self.power_df.iterrows():
+            for std_temp_difference in power_index.STD_TEMP_DIFFERENCES:
+                expected = (row[std_temp_difference + '_bhp'], row[std_temp_difference + '_ktas'],
+                            row[std_temp_difference + '_gph'])
+                key = (int(row['press_alt']), int(row['rpm']), std_temp_difference)
+                self.assertEqual(power_index.lookup_power_setting(self.index, *key), expected)
+                arrays = power_index.lookup_power_setting_array(self.index, *(np.array([value]) for value in key))
+                self.assertEqual(tuple(array[0] for array in arrays), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from ..src import cubes
+from ..src import precompute
+from ..src import tables
+
+
+class TestPrecompute(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.path = self.folder / 'precomputed.npz'
+        precompute.build(self.path)
+
+    def test_verify(self):
+        self.assertEqual(precompute.verify(self.path), [])
+
+    def test_precomputed_cubes_match_tables(self):
+        precomputed = precompute.load(self.path)
+        for (name, (table_name, compiler, _)) in precompute.CUBES.items():
+            cube = compiler(tables.get_table(table_name))
+            self.assertEqual(precomputed[name].ground_roll.tolist(), cube.ground_roll.tolist())
+            self.assertEqual(precomputed[name].fifty_ft_roll.tolist(), cube.fifty_ft_roll.tolist())
+
+    def test_outdated_file_is_ignored(self):
+        data_folder = self.folder / 'data'
+        shutil.copytree(tables.DATA_DIR, data_folder)
+        with open(data_folder / 'landing.csv', 'a') as file:
+            file.write('\n')
+        self.assertIsNone(precompute.load(self.path, data_folder))
+        self.assertIsNone(precompute.load(self.folder / 'missing.npz'))
+
+    def test_install(self):
+        self.assertTrue(precompute.install(self.path))
+        takeoff_df = tables.get_table('takeoff')
+        takeoff_cube = tables.find_precompiled(takeoff_df, cubes.compile_takeoff_cube)
+        self.assertIsNotNone(takeoff_cube)
+        self.assertIs(tables.get_compiled(takeoff_df, cubes.compile_takeoff_cube), takeoff_cube)
+
+
+if __name__ == '__main__':
+    unittest.main()
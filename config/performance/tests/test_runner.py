@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from ..src import run_performance
+from ..src import runner
+from .test_batch import SCENARIO, generate_scenarios
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.scenarios = generate_scenarios(150, seed=3)
+        # An invalid scenario (the takeoff weight is too big).
+        self.scenarios.insert(70, dict(SCENARIO, to_weight=2500))
+        self.expected = [runner.run_scenario(scenario) for scenario in self.scenarios]
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, run_performance.INPUT_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.scenarios)
+
+    def check_results(self, results):
+        self.assertEqual([result['row'] for result in results], list(range(len(self.scenarios))))
+        for (result, expected) in zip(results, self.expected):
+            if 'error' in expected:
+                self.assertEqual(result['error'], expected['error'])
+            else:
+                self.assertEqual([float(result[field]) for field in run_performance.OUTPUT_FIELDS],
+                                 [float(expected[field]) for field in run_performance.OUTPUT_FIELDS])
+
+    def test_csv_in_process(self):
+        self.write_csv(self.folder / 'scenarios.csv')
+        summary = runner.run_batch(self.folder / 'scenarios.csv', self.folder / 'results.csv', chunk_size=100, workers=1)
+        self.assertEqual((summary['scenarios'], summary['errors']), (151, 1))
+        with open(self.folder / 'results.csv', newline='') as file:
+            results = [{key: value for (key, value) in row.items() if value != ''} for row in csv.DictReader(file)]
+        self.check_results([dict(result, row=int(result['row'])) for result in results])
+
+    def test_jsonl_process_pool(self):
+        with open(self.folder / 'scenarios.jsonl', 'w') as file:
+            file.writelines(json.dumps(scenario) + '\n' for scenario in self.scenarios)
+        summary = runner.run_batch(self.folder / 'scenarios.jsonl', self.folder / 'results.jsonl', chunk_size=20, workers=2)
+        self.assertGreater(summary['throughput'], 0)
+        self.assertIn('takeoff', summary['timings'])
+        with open(self.folder / 'results.jsonl') as file:
+            self.check_results([json.loads(line) for line in file])
+
+    def test_streamed_results(self):
+        text = ''.join(runner.iter_result_text(iter(self.scenarios), 'csv', chunk_size=40))
+        results = [{key: value for (key, value) in row.items() if value != ''} for row in csv.DictReader(io.StringIO(text))]
+        self.check_results([dict(result, row=int(result['row'])) for result in results])
+        self.assertEqual(''.join(runner.iter_result_text(iter([]), 'csv')), ','.join(runner.RESULT_FIELDS) + '\r\n')
+
+    def test_malformed_scenarios_are_recorded(self):
+        missing = {field: value for (field, value) in SCENARIO.items() if field != 'cr_temp'}
+        results, _ = runner.run_chunk([dict(SCENARIO), missing, dict(SCENARIO, to_weight=[2120])])
+        self.assertNotIn('error', results[0])
+        self.assertEqual(results[1]['error'], 'Temperature | ERROR: invalid value.')
+        self.assertEqual(results[2]['error'], 'Takeoff weight | ERROR: invalid value.')
+        self.assertEqual(results[1:], [runner.run_scenario(missing), runner.run_scenario(dict(SCENARIO, to_weight=[2120]))])
+
+    def test_programming_errors_are_raised(self):
+        with mock.patch.object(run_performance, 'compute_valid_performance_batch', side_effect=ZeroDivisionError):
+            with self.assertRaises(ZeroDivisionError):
+                runner.run_chunk(self.scenarios)
+
+
+if __name__ == '__main__':
+    unittest.main()
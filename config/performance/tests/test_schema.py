@@ -0,0 +1,64 @@
+import random
+import unittest
+import numpy as np
+from common.rules import find_error
+from ..src import errors
+from ..src import input_check
+from ..src import run_performance
+from ..src import schema
+from .test_batch import SCENARIO
+
+# Valid and invalid values of every type.
+VALUES = [None, 'x', '12', '1.5', 1.5, -3, 0, 1, 5, 35, 40, 41, 45, 50, 90.0, 92.5, '90', 360, 361, 750, 751,
+          1397, 2100, 2300, 2650, 2700, 14200, -20, float('nan'), True, 'p', 'G']
+
+
+def check_message(scenario):
+    """Returns the InputError message of the scenario, or None if it is valid."""
+    try:
+        input_check.check_input_data(dict(scenario))
+    except errors.InputError as error:
+        return str(error)
+    return None
+
+
+class TestSchema(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.scenarios = []
+        for _ in range(2000):
+            scenario = dict(SCENARIO)
+            for field in rng.sample(run_performance.INPUT_FIELDS, rng.randint(0, 2)):
+                scenario[field] = rng.choice(VALUES)
+            self.scenarios.append(scenario)
+
+    def test_schema_fields(self):
+        self.assertEqual(list(schema.SCHEMA), run_performance.INPUT_FIELDS)
+
+    def test_find_error(self):
+        self.assertIsNone(find_error(schema.WIND_DIRECTION, 90))
+        self.assertEqual(find_error(schema.WIND_DIRECTION, 92), 'ERROR: The wind direction must be a multiple of 5 between 1 and 360.')
+        self.assertEqual(find_error(schema.TAKEOFF_WEIGHT, -1), "ERROR: the value can't be negative.")
+        self.assertEqual(find_error(schema.TAKEOFF_WEIGHT, 'heavy'), 'ERROR: invalid value.')
+        self.assertIsNone(find_error(schema.RUNWAY_CONDITION, 'G'))
+        self.assertIsNotNone(find_error(schema.FUEL_CAPACITY, 45))
+
+    def test_columns_match_scalar_check(self):
+        expected = [check_message(scenario) for scenario in self.scenarios]
+        columns = {field: np.array([scenario[field] for scenario in self.scenarios], dtype=object)
+                   for field in run_performance.INPUT_FIELDS}
+        invalid, messages = schema.validate_columns(columns)
+        self.assertEqual(messages.tolist(), expected)
+        self.assertEqual(invalid.tolist(), [message is not None for message in expected])
+
+    def test_typed_columns(self):
+        scenarios = [dict(SCENARIO, to_weight=2400, to_wind_direction=92), dict(SCENARIO), dict(SCENARIO, land_condition='x')]
+        columns = {field: [scenario[field] for scenario in scenarios] for field in run_performance.INPUT_FIELDS}
+        invalid, messages = schema.validate_columns(columns)
+        self.assertEqual(invalid.tolist(), [True, False, True])
+        self.assertEqual(messages.tolist(), [check_message(scenario) for scenario in scenarios])
+
+
+if __name__ == '__main__':
+    unittest.main()
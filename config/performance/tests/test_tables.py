@@ -0,0 +1,33 @@
+import unittest
+import pandas as pd
+from ..src import tables
+
+
+class TestTables(unittest.TestCase):
+
+    def test_tables_are_loaded_once(self):
+        self.assertIs(tables.get_table('takeoff'), tables.get_table('takeoff'))
+        self.assertEqual(set(tables.get_tables()), set(tables.TABLE_SPECS))
+
+    def test_tables_are_read_only(self):
+        takeoff_df = tables.get_table('takeoff')
+        with self.assertRaises(ValueError):
+            takeoff_df.iloc[0, 0] = 0
+        with self.assertRaises(TypeError):
+            tables.get_tables()['takeoff'] = takeoff_df
+
+    def test_csv_tables_match_pandas(self):
+        csv_tables, _ = tables.load_tables(bundle_path=None)
+        for (name, (file_name, index_col, _, _)) in tables.TABLE_SPECS.items():
+            expected = pd.read_csv(tables.DATA_DIR / file_name, index_col=index_col)
+            pd.testing.assert_frame_equal(csv_tables[name].to_dataframe(), expected, check_exact=True)
+            self.assertEqual(csv_tables[name].to_numpy().tolist(), expected.to_numpy().tolist())
+
+    def test_load_report(self):
+        report = tables.get_load_report()
+        self.assertGreater(report['load_time'], 0)
+        self.assertEqual(report['memory'], sum(table['memory'] for table in report['tables'].values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
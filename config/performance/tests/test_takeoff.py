@@ -6,7 +6,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../s
 import unittest
 from ..src.takeoff import compute_takeoff_ground_roll
 
-performance_path = r'C:\Users\luish\Desktop\Projects\performance_cessna_172\config\performance\src\data\\'
+performance_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'data', '')
 takeoff_df = pd.read_csv(performance_path + 'takeoff.csv')
 roc_df = pd.read_csv(performance_path + 'roc.csv', index_col=0)
 
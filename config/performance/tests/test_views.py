@@ -0,0 +1,181 @@
+import csv
+import io
+import json
+import threading
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import override_settings
+# The modules used by the views, which are the same under manage.py test and pytest.
+from common import executor
+from performance import views
+from performance.src import cache
+from performance.src import run_performance
+from performance.src import runner
+from .test_batch import SCENARIO
+
+
+def write_wide_csv(scenarios):
+    """Returns a .csv file with a header row and one scenario per row."""
+    file = io.StringIO()
+    writer = csv.DictWriter(file, run_performance.INPUT_FIELDS)
+    writer.writeheader()
+    writer.writerows(scenarios)
+    return file.getvalue().encode()
+
+
+# The session is stored in a signed cookie, so the tests do not use the database.
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+class TestWideCsvUpload(SimpleTestCase):
+
+    def setUp(self):
+        cache.configure_result_cache(0)
+
+    def tearDown(self):
+        cache.configure_result_cache()
+
+    def post_file(self, url, content):
+        csv_file = SimpleUploadedFile('scenarios.csv', content, content_type='text/csv')
+        return self.client.post(url, {'submit_file_form': '', 'csv_file': csv_file})
+
+    def test_wide_csv_is_computed(self):
+        scenarios = [SCENARIO, dict(SCENARIO, to_weight=5000), dict(SCENARIO, to_temp=-5, to_condition='p')]
+        response = self.post_file('/performance/', write_wide_csv(scenarios))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment', response['Content-Disposition'])
+        text = b''.join(response.streaming_content).decode()
+        self.assertEqual(text.splitlines()[0].split(','), runner.RESULT_FIELDS)
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual([row['row'] for row in rows], ['0', '1', '2'])
+        self.assertEqual(rows[0]['error'], '')
+        self.assertNotEqual(rows[1]['error'], '')
+        self.assertEqual(rows[1]['to_roll'], '')
+        self.assertEqual(rows[2]['error'], '')
+        expected = run_performance.compute_performance(dict(SCENARIO))
+        self.assertEqual(float(rows[0]['to_roll']), float(expected['to_roll']))
+        self.assertEqual(float(rows[0]['fuel_reserve']), float(expected['fuel_reserve']))
+
+
+class AuthenticatedUser:
+    is_authenticated = True
+
+
+@override_settings(JSON_API_TOKENS=['secret'], JSON_API_MAX_BODY_SIZE=4096, JSON_API_MAX_SCENARIOS=3)
+class TestJsonApi(SimpleTestCase):
+
+    def setUp(self):
+        cache.configure_result_cache(0)
+
+    def tearDown(self):
+        cache.configure_result_cache()
+
+    def post(self, body, token='secret'):
+        headers = {'Authorization': 'Bearer ' + token} if token else {}
+        return self.client.post('/performance/api', body, content_type='application/json', headers=headers)
+
+    def test_results_are_streamed(self):
+        scenarios = [SCENARIO, dict(SCENARIO, to_weight=5000), dict(SCENARIO, to_temp=-5)]
+        response = self.post(json.dumps(scenarios))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        items = [item.decode() for item in response.streaming_content]
+        # '[', one item per scenario and ']'.
+        self.assertEqual(len(items), 5)
+        results = json.loads(''.join(items))
+        expected = run_performance.compute_performance(dict(SCENARIO))
+        self.assertEqual(results[0]['results']['to_roll'], expected['to_roll'])
+        self.assertIn('to_weight', results[1]['errors'])
+        self.assertIn('results', results[2])
+
+    def test_body_limit(self):
+        response = self.post(json.dumps([dict(SCENARIO, padding='x'*5000)]))
+        self.assertEqual(response.status_code, 413)
+
+    def test_scenario_limit(self):
+        response = self.post(json.dumps([SCENARIO]*4))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.post(json.dumps([SCENARIO]*3)).status_code, 200)
+
+    def test_malformed_json(self):
+        self.assertEqual(self.post('[{"to_weight": 2120,').status_code, 400)
+        self.assertEqual(self.post(json.dumps({'to_weight': 2120})).status_code, 400)
+        self.assertEqual(self.post(json.dumps([1, 2])).status_code, 400)
+
+    def test_authentication(self):
+        self.assertEqual(self.post(json.dumps([SCENARIO]), token=None).status_code, 401)
+        self.assertEqual(self.post(json.dumps([SCENARIO]), token='other').status_code, 401)
+        self.assertEqual(self.client.get('/performance/api', headers={'Authorization': 'Bearer secret'}).status_code, 405)
+
+    def test_sessions_need_the_csrf_token(self):
+        request = RequestFactory().post('/performance/api', json.dumps([SCENARIO]), content_type='application/json')
+        request.user = AuthenticatedUser()
+        self.assertEqual(views.data_api(request).status_code, 403)
+        request = RequestFactory().post('/performance/api', json.dumps([SCENARIO]), content_type='application/json')
+        request.user = AuthenticatedUser()
+        request._dont_enforce_csrf_checks = True
+        self.assertEqual(views.data_api(request).status_code, 200)
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+class TestAsyncViews(SimpleTestCase):
+
+    def setUp(self):
+        cache.configure_result_cache(0)
+        self.pool = executor.configure_executor('performance', max_workers=1, max_queued=0, timeout=5)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.pool.shutdown()
+        executor.configure_executor('performance')
+        cache.configure_result_cache()
+
+    def post_form(self, data):
+        return async_to_sync(self.async_client.post)('/performance/async', data)
+
+    def post_file(self, content):
+        csv_file = SimpleUploadedFile('scenarios.csv', content, content_type='text/csv')
+        return self.post_form({'submit_file_form': '', 'csv_file': csv_file})
+
+    def test_manual_form(self):
+        response = self.post_form(dict(SCENARIO, submit_manual_form=''))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.pool.stats()['completed'], 1)
+
+    def test_saturated_executor(self):
+        self.pool.submit(self.release.wait)
+        response = self.post_form(dict(SCENARIO, submit_manual_form=''))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.post_file(write_wide_csv([SCENARIO])).status_code, 503)
+        self.assertEqual(self.pool.stats()['rejected'], 1)
+
+    def test_timeout(self):
+        self.pool = executor.configure_executor('performance', max_workers=1, max_queued=0, timeout=0.05)
+        with mock.patch.object(run_performance, 'compute_performance', lambda data: self.release.wait()):
+            response = self.post_form(dict(SCENARIO, submit_manual_form=''))
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(self.pool.stats()['timeouts'], 1)
+
+    def test_wide_csv_is_streamed(self):
+        scenarios = [dict(SCENARIO, to_temp=temp) for temp in range(-20, 45, 5)]
+        with mock.patch.object(views, 'UPLOAD_CHUNK_SIZE', 4):
+            response = self.post_file(write_wide_csv(scenarios))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+
+            async def collect():
+                return [chunk async for chunk in response.streaming_content]
+
+            chunks = async_to_sync(collect)()
+        # The header and the results of each chunk of 4 rows.
+        self.assertEqual(len(chunks), 4)
+        rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode())))
+        self.assertEqual(len(rows), len(scenarios))
+        self.assertEqual([row['error'] != '' for row in rows], [scenario['to_temp'] > 40 for scenario in scenarios])
+        self.assertEqual(self.pool.stats()['active'], 0)
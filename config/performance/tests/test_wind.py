@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+from ..src import wind
+
+
+class TestWind(unittest.TestCase):
+
+    def test_components_match_scalar(self):
+        heading, wind_direction, wind_speed = np.meshgrid(np.arange(1, 361), np.arange(5, 361, 5), [0, 7, 18, 35], indexing='ij')
+        headwind, crosswind = wind.compute_wind_components(heading, wind_speed, wind_direction)
+        for (h, s, d, head) in zip(heading.ravel().tolist(), wind_speed.ravel().tolist(), wind_direction.ravel().tolist(),
+                                   headwind.ravel().tolist()):
+            aligned_speed, aligned_direction = wind.compute_wind_component(h, s, d)
+            self.assertEqual(abs(head), aligned_speed)
+            if head != 0:
+                self.assertEqual('H' if head > 0 else 'T', aligned_direction)
+        self.assertTrue(np.all(np.abs(crosswind) <= wind_speed))
+
+    def test_crosswind_sign(self):
+        headwind, crosswind = wind.compute_wind_components(np.array([360, 360, 90]), 10, np.array([90, 270, 90]))
+        self.assertEqual(headwind.tolist(), [0.0, 0.0, 10.0])
+        self.assertEqual(crosswind.tolist(), [10.0, -10.0, 0.0])
+
+    def test_runway_analysis(self):
+        analysis = wind.run_runway_analysis([90, 270, 180], 20, 250)
+        self.assertEqual(analysis['headwind'].shape, (3,))
+        self.assertEqual(int(analysis['best_runway']), 1)
+        analysis = wind.run_runway_analysis([90, 270, 180], [20, 20, 30], [250, 170, 90])
+        self.assertEqual(analysis['headwind'].shape, (3, 3))
+        # 180 is out of limits for the third wind, which blows across it at 30 kts.
+        self.assertEqual(analysis['best_runway'].tolist(), [1, 2, 0])
+        self.assertFalse(analysis['within_limits'][2, 2])
+        analysis = wind.run_runway_analysis([360], 30, 90)
+        self.assertEqual(int(analysis['best_runway']), -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,28 @@
 # Imports.
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from django.http import HttpResponse
 from django.http import HttpResponseRedirect
+from django.http import StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from common import executor
+from common import json_api
 from .src import run_performance
+from .src import coalesce
+from .src import errors
+from .src import runner
 from .forms import CSVFileForm
 from .forms import ManualForm
 from .models import CSVFile, UploadCSVData
 import csv
 import io
+import itertools
 from .validators import *
 
+# Number of scenarios of an uploaded file computed at a time.
+UPLOAD_CHUNK_SIZE = 1000
+
 
 def data_input(request):
     file_form = CSVFileForm
@@ -18,28 +32,178 @@ def data_input(request):
             file_form = CSVFileForm(request.POST, request.FILES)
             if file_form.is_valid():
                 csv_file = file_form.cleaned_data
-                data = process_csv(csv_file)
-                request.session["output_data"] = run_performance.compute_performance(data)
-                return HttpResponseRedirect("output")
+                lines = open_csv(csv_file)
+                first_line = next(lines, '')
+                lines = itertools.chain([first_line], lines)
+                if is_wide_header(first_line):
+                    return process_wide_csv(lines)
+                data = process_csv(lines)
+                try:
+                    request.session["output_data"] = coalesce.compute_performance(data)
+                except errors.PerformanceError as error:
+                    file_form.add_error(None, str(error))
+                else:
+                    return HttpResponseRedirect("output")
         elif 'submit_manual_form' in request.POST:
             manual_form = ManualForm(request.POST)
             if manual_form.is_valid():
                 data = manual_form.cleaned_data
-                request.session["output_data"] = run_performance.compute_performance(data)
+                try:
+                    request.session["output_data"] = coalesce.compute_performance(data)
+                except errors.PerformanceError as error:
+                    manual_form.add_error(None, str(error))
+                else:
+                    return HttpResponseRedirect("output")
+    return render(request, "performance/input.html", {'file_form': file_form, 'manual_form': manual_form})
+
+
+async def data_input_async(request):
+    """Async version of data_input.
+
+    compute_performance runs in the bounded executor (see
+    common/executor.py), so the event loop keeps serving other requests.
+    The response is 503 if the executor is saturated, and 504 if the
+    results are not available within the per-request timeout.
+    """
+    file_form = CSVFileForm
+    manual_form = ManualForm
+    if request.method == 'POST':
+        form = None
+        if 'submit_file_form' in request.POST:
+            file_form = CSVFileForm(request.POST, request.FILES)
+            if file_form.is_valid():
+                csv_file = file_form.cleaned_data
+                lines = open_csv(csv_file)
+                first_line = next(lines, '')
+                lines = itertools.chain([first_line], lines)
+                if is_wide_header(first_line):
+                    return process_wide_csv_async(lines)
+                form, data = file_form, process_csv(lines)
+        elif 'submit_manual_form' in request.POST:
+            manual_form = ManualForm(request.POST)
+            if manual_form.is_valid():
+                form, data = manual_form, manual_form.cleaned_data
+        if form is not None:
+            try:
+                results, error_response = await compute_performance_in_executor(data)
+            except errors.PerformanceError as error:
+                form.add_error(None, str(error))
+            else:
+                if error_response is not None:
+                    return error_response
+                # The session may be loaded from the database, which is not allowed in async code.
+                await sync_to_async(request.session.__setitem__)("output_data", results)
                 return HttpResponseRedirect("output")
     return render(request, "performance/input.html", {'file_form': file_form, 'manual_form': manual_form})
 
 
+async def compute_performance_in_executor(data):
+    """Returns the results of compute_performance, computed in the bounded executor, or an error response.
+
+    Concurrent requests for the same scenario share a single computation
+    (see coalesce.py), which takes a single executor slot.
+
+    Returns:
+        results (dict): the results, or None if they could not be computed.
+        response: 503 (executor saturated) or 504 (timeout) response, or
+            None if the results were computed.
+    """
+    pool = executor.get_executor('performance')
+    key = coalesce.canonical_key(data)
+    try:
+        future = coalesce.get_single_flight().submit(key, pool.submit, run_performance.compute_performance, data)
+        return dict(await pool.wait(future, executor.get_timeout('performance'), shared=key is not None)), None
+    except executor.ExecutorSaturated:
+        return None, busy_response()
+    except TimeoutError:
+        return None, HttpResponse('The computation took too long, please try again later.', status=504)
+
+
+def busy_response():
+    """Returns the 503 response of a request rejected by a saturated executor."""
+    return HttpResponse('The server is busy, please try again later.', status=503, headers={'Retry-After': '1'})
+
+
 def data_output(request):
     performance_data = request.session["output_data"]
     return render(request, "performance/output.html", {'performance_data': performance_data})
 
 
-def process_csv(csv_file):
-    file = csv_file['csv_file'].open(mode='r')
-    data_set = file.read()
-    io_string = io.StringIO(data_set.decode("utf-8"))
-    csv_reader = csv.reader(io_string, delimiter=',')
+@csrf_exempt
+@require_POST
+@json_api.require_api_access
+def data_api(request):
+    """Returns the performance results of a JSON array of scenarios.
+
+    Each scenario is validated with the ManualForm rules. The response is a
+    JSON array, streamed as the scenarios are computed, with one object per
+    scenario: {"results": {...}} or {"errors": {field: [messages]}}. Only
+    authenticated sessions and API tokens have access (see
+    common/json_api.py).
+    """
+    scenarios, error_response = json_api.read_json_scenarios(request)
+    if error_response is not None:
+        return error_response
+    return StreamingHttpResponse(json_api.iter_json_results(scenarios, compute_api_scenario), content_type='application/json')
+
+
+def compute_api_scenario(scenario):
+    """Returns the results or the validation errors of a JSON API scenario."""
+    manual_form = ManualForm(scenario)
+    if not manual_form.is_valid():
+        return {'errors': {field: list(messages) for (field, messages) in manual_form.errors.items()}}
+    try:
+        return {'results': coalesce.compute_performance(manual_form.cleaned_data)}
+    except errors.PerformanceError as error:
+        return {'errors': {'__all__': [str(error)]}}
+
+
+def open_csv(csv_file):
+    """Returns the lines of the uploaded file, decoded incrementally."""
+    file = csv_file['csv_file'].open(mode='rb')
+    return io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+
+
+def is_wide_header(line):
+    """Returns True if the line is the header of a file with one scenario per row."""
+    header = next(csv.reader([line]), [])
+    return set(run_performance.INPUT_FIELDS).issubset(header)
+
+
+def process_wide_csv(lines):
+    """Returns a downloadable .csv file with the results of every scenario.
+
+    The file has a header row with the input fields and one scenario per
+    row. The rows are read as the response is streamed and computed in
+    chunks by the batch engine, so the memory used does not depend on the
+    size of the file (see runner.py for the results format).
+    """
+    scenarios = runner.read_scenarios(lines, 'csv')
+    response = StreamingHttpResponse(runner.iter_result_text(scenarios, 'csv', UPLOAD_CHUNK_SIZE), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="performance_results.csv"'
+    return response
+
+
+def process_wide_csv_async(lines):
+    """Async version of process_wide_csv.
+
+    The chunks are computed in the bounded executor (see
+    common/executor.py), one at a time, holding a single slot for the
+    whole file.
+    """
+    pool = executor.get_executor('performance')
+    if pool.is_saturated():
+        return busy_response()
+    scenarios = runner.read_scenarios(lines, 'csv')
+    chunks = pool.iterate(runner.iter_result_text(scenarios, 'csv', UPLOAD_CHUNK_SIZE), executor.get_timeout('performance'))
+    response = StreamingHttpResponse(chunks, content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="performance_results.csv"'
+    return response
+
+
+def process_csv(lines):
+    """Returns the scenario of a file with one "field,value" row per input field."""
+    csv_reader = csv.reader(lines, delimiter=',')
     performance_data = {}
     fields = ['to_weight', 'fuel_capacity',
               'to_heading', 'to_length', 'to_condition', 'to_press_alt', 'to_temp', 'to_wind_speed', 'to_wind_direction',
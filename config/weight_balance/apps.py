@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class WeightBalanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'weight_balance'
+
+    def ready(self):
+        from common import executor
+        executor.configure_executor(self.name, getattr(settings, 'WEIGHT_BALANCE_EXECUTOR_WORKERS', executor.DEFAULT_WORKERS),
+                                    getattr(settings, 'WEIGHT_BALANCE_EXECUTOR_QUEUED', executor.DEFAULT_QUEUED),
+                                    getattr(settings, 'WEIGHT_BALANCE_TIMEOUT', executor.DEFAULT_TIMEOUT))
@@ -0,0 +1,40 @@
+"""
+Cessna 172N Weight and Balance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    errors.py
+
+DESCRIPTION:
+    This module defines the errors raised by the weight and balance
+    calculator.
+
+    Invalid input data used to stop the program with sys.exit, which also
+    stops the web server worker that runs the computation. These errors are
+    ordinary exceptions, so the callers can report the error of a single
+    scenario and carry on with the others:
+
+    > WeightBalanceError: base class of every error of the calculator.
+    > InputError: a value of the input data is invalid or out of limits.
+
+    The string of an error is the message previously passed to sys.exit.
+"""
+
+
+class WeightBalanceError(Exception):
+    """Base class of the errors of the weight and balance calculator."""
+
+
+class InputError(WeightBalanceError, ValueError):
+    """Raised when a value of the input data is invalid or out of limits.
+
+    Args:
+        label (str): name of the value in the error message, e.g. 'Basic weight'.
+        message (str): error message.
+    """
+
+    def __init__(self, label, message):
+        super().__init__('{} | {}'.format(label, message))
+        self.label = label
+        self.message = message
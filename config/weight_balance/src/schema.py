@@ -0,0 +1,46 @@
+"""
+Cessna 172N Weight and Balance Calculator
+Author: Luis Hernández
+GitHub: luisrnandezc
+
+NAME:
+    schema.py
+
+DESCRIPTION:
+    This module describes the valid input data in a single place.
+
+    SCHEMA maps the input fields of compute_weight_and_balance to their
+    rules (see common/rules.py for the attributes of a Rule and the
+    checks). The same rules are used by the forms and the model validators
+    (see validators.py) and by input_check.py, which raises an InputError
+    (see errors.py) for the first invalid field.
+"""
+
+from common import rules
+from common.rules import Rule
+from .errors import InputError
+
+SEAT_CONFIG = Rule('Seat configuration', 'The seat configuration must be 0 (standard) or 1 (optional)', choices=(0, 1))
+BASIC_WEIGHT = Rule('Basic weight', 'The weight must be between 1397 and 2300 pounds', min_value=1397, max_value=2300, negative=True)
+BASIC_MOMENT = Rule('Basic moment', 'The moment must be between 0 and 120 lb-in (/1000)', min_value=0, max_value=120, negative=True)
+USABLE_FUEL = Rule('Usable fuel', 'The usable fuel must be between 0 and 50 gallons', min_value=0, max_value=50, negative=True)
+PERSON_WEIGHT = Rule('Person weight', 'The person weight must be between 0 and 400 pounds', min_value=0, max_value=400, negative=True)
+CARGO_1 = Rule('Baggage area 1', 'The weight must be between 0 and 120 pounds', min_value=0, max_value=120, negative=True)
+CARGO_2 = Rule('Baggage area 2', 'The weight must be between 0 and 50 pounds', min_value=0, max_value=50, negative=True)
+FUEL_ALLOWANCE = Rule('Fuel allowance', 'The fuel allowance must be between 0 and 2 gallons', kind='float', min_value=0, max_value=2, negative=True)
+
+# Input fields in checking order.
+SCHEMA = {
+    'seat_config': SEAT_CONFIG, 'basic_weight': BASIC_WEIGHT, 'basic_moment': BASIC_MOMENT,
+    'usable_fuel': USABLE_FUEL, 'pilot': PERSON_WEIGHT, 'front_pax': PERSON_WEIGHT,
+    'rear_pax_left': PERSON_WEIGHT, 'rear_pax_right': PERSON_WEIGHT,
+    'cargo_1': CARGO_1, 'cargo_2': CARGO_2, 'fuel_allowance': FUEL_ALLOWANCE,
+}
+
+
+def check_value(rule, value):
+    """Raises an InputError (see errors.py) if value breaks the rule."""
+    message = rules.find_error(rule, value)
+    if message is not None:
+        raise InputError(rule.label, message)
+    return None
@@ -0,0 +1,71 @@
+import unittest
+from django.core.exceptions import ValidationError
+from django.utils.functional import Promise
+from common.rules import find_error
+from ..forms import ManualForm
+from ..src import errors
+from ..src import input_check
+from ..src import schema
+from ..validators import validate_fuel_allowance
+
+SCENARIO = {'seat_config': 0, 'basic_weight': 1500, 'basic_moment': 62, 'usable_fuel': 30, 'pilot': 160,
+            'front_pax': 140, 'rear_pax_left': 50, 'rear_pax_right': 0, 'cargo_1': 20, 'cargo_2': 0,
+            'fuel_allowance': 1.1}
+
+
+def check_message(scenario):
+    """Returns the InputError message of the scenario, or None if it is valid."""
+    try:
+        input_check.check_input_data(dict(scenario))
+    except errors.InputError as error:
+        return str(error)
+    return None
+
+
+class TestSchema(unittest.TestCase):
+
+    def test_schema_fields(self):
+        self.assertEqual(list(schema.SCHEMA), list(SCENARIO))
+
+    def test_find_error(self):
+        self.assertIsNone(find_error(schema.SEAT_CONFIG, 1))
+        self.assertEqual(find_error(schema.SEAT_CONFIG, 2),
+                         'ERROR: The seat configuration must be 0 (standard) or 1 (optional).')
+        self.assertEqual(find_error(schema.BASIC_WEIGHT, -1), "ERROR: the value can't be negative.")
+        self.assertEqual(find_error(schema.PERSON_WEIGHT, 'heavy'), 'ERROR: invalid value.')
+        self.assertIsNone(find_error(schema.FUEL_ALLOWANCE, '1.5'))
+        self.assertIsNotNone(find_error(schema.FUEL_ALLOWANCE, 2.5))
+        self.assertIsNotNone(find_error(schema.CARGO_2, 51))
+
+    def test_check_input_data(self):
+        self.assertIsNone(check_message(SCENARIO))
+        self.assertEqual(check_message(dict(SCENARIO, basic_moment=121, cargo_1=-5)),
+                         'Basic moment | ERROR: The moment must be between 0 and 120 lb-in (/1000).')
+        self.assertEqual(check_message(dict(SCENARIO, rear_pax_right='x')), 'Person weight | ERROR: invalid value.')
+
+
+class TestManualForm(unittest.TestCase):
+
+    def test_valid_form(self):
+        form = ManualForm(SCENARIO)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data, SCENARIO)
+
+    def test_rule_errors(self):
+        form = ManualForm(dict(SCENARIO, basic_weight=2400, pilot=-1, fuel_allowance=3.5, seat_config=2))
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['basic_weight'], [schema.BASIC_WEIGHT.description])
+        self.assertEqual(form.errors['pilot'], [schema.PERSON_WEIGHT.description])
+        self.assertEqual(form.errors['fuel_allowance'], [schema.FUEL_ALLOWANCE.description])
+        self.assertIn('seat_config', form.errors)
+        self.assertEqual(set(form.errors), {'basic_weight', 'pilot', 'fuel_allowance', 'seat_config'})
+
+    def test_validator_messages_are_translatable(self):
+        with self.assertRaises(ValidationError) as context:
+            validate_fuel_allowance(3)
+        self.assertIsInstance(context.exception.message, Promise)
+        self.assertEqual(context.exception.messages, [schema.FUEL_ALLOWANCE.description])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import threading
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+from django.test import override_settings
+# The modules used by the views, which are the same under manage.py test and pytest.
+from common import executor
+from weight_balance.src import run_weight_balance
+from .test_schema import SCENARIO
+
+
+# The session is stored in a signed cookie, so the tests do not use the database.
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+class TestAsyncViews(SimpleTestCase):
+
+    def setUp(self):
+        self.pool = executor.configure_executor('weight_balance', max_workers=1, max_queued=0, timeout=5)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.pool.shutdown()
+        executor.configure_executor('weight_balance')
+
+    def post_form(self, data):
+        return async_to_sync(self.async_client.post)('/weight_balance/async', dict(data, submit_manual_form=''))
+
+    def test_manual_form(self):
+        self.assertEqual(self.post_form(SCENARIO).status_code, 302)
+        self.assertEqual(self.pool.stats()['completed'], 1)
+
+    def test_saturated_executor(self):
+        self.pool.submit(self.release.wait)
+        response = self.post_form(SCENARIO)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_timeout(self):
+        self.pool = executor.configure_executor('weight_balance', max_workers=1, max_queued=0, timeout=0.05)
+        with mock.patch.object(run_weight_balance, 'compute_weight_and_balance', lambda data: self.release.wait()):
+            response = self.post_form(SCENARIO)
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(self.pool.stats()['timeouts'], 1)
+
+    def test_apps_have_their_own_executor(self):
+        self.assertIsNot(executor.get_executor('performance'), self.pool)
@@ -5,5 +5,7 @@ app_name = 'weight_balance'
 
 urlpatterns = [
     path("", views.data_input, name="input"),
+    path("async", views.data_input_async, name="input_async"),
     path("output", views.data_output, name="output"),
+    path("api", views.data_api, name="api"),
 ]
@@ -0,0 +1,72 @@
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from common.rules import find_error
+from .src import schema
+
+
+def validate_rule(rule, value):
+    """Raise an exception if the argument breaks the schema rule (see src/schema.py)."""
+    if find_error(rule, value) is not None:
+        raise ValidationError(_(rule.description))
+
+
+def rule_validator(rule):
+    """Returns a validator function for the schema rule."""
+    def validate(value):
+        validate_rule(rule, value)
+    return validate
+
+
+def validate_seat_config(seat_config):
+    """Raise an exception if the argument is an invalid seat configuration."""
+    validate_rule(schema.SEAT_CONFIG, seat_config)
+
+
+def validate_basic_weight(basic_weight):
+    """Raise an exception if the argument is an invalid basic empty weight."""
+    validate_rule(schema.BASIC_WEIGHT, basic_weight)
+
+
+def validate_basic_moment(basic_moment):
+    """Raise an exception if the argument is an invalid basic empty moment."""
+    validate_rule(schema.BASIC_MOMENT, basic_moment)
+
+
+def validate_usable_fuel(usable_fuel):
+    """Raise an exception if the argument is an invalid fuel volume."""
+    validate_rule(schema.USABLE_FUEL, usable_fuel)
+
+
+def validate_pilot(pilot):
+    """Raise an exception if the argument is an invalid weight."""
+    validate_rule(schema.PERSON_WEIGHT, pilot)
+
+
+def validate_front_pax(front_pax):
+    """Raise an exception if the argument is an invalid weight."""
+    validate_rule(schema.PERSON_WEIGHT, front_pax)
+
+
+def validate_rear_pax_left(rear_pax_left):
+    """Raise an exception if the argument is an invalid weight."""
+    validate_rule(schema.PERSON_WEIGHT, rear_pax_left)
+
+
+def validate_rear_pax_right(rear_pax_right):
+    """Raise an exception if the argument is an invalid weight."""
+    validate_rule(schema.PERSON_WEIGHT, rear_pax_right)
+
+
+def validate_cargo_1(cargo_1):
+    """Raise an exception if the argument is an invalid weight."""
+    validate_rule(schema.CARGO_1, cargo_1)
+
+
+def validate_cargo_2(cargo_2):
+    """Raise an exception if the argument is an invalid weight."""
+    validate_rule(schema.CARGO_2, cargo_2)
+
+
+def validate_fuel_allowance(fuel_allowance):
+    """Raise an exception if the argument is an invalid fuel volume."""
+    validate_rule(schema.FUEL_ALLOWANCE, fuel_allowance)
@@ -1,7 +1,15 @@
 # Imports.
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from django.http import HttpResponse
 from django.http import HttpResponseRedirect
+from django.http import StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from common import executor
+from common import json_api
 from .src import run_weight_balance
+from .src import errors
 from .forms import CSVFileForm
 from .forms import ManualForm
 from .models import CSVFile, UploadCSVData
@@ -18,22 +26,111 @@ def data_input(request):
             if file_form.is_valid():
                 csv_file = file_form.cleaned_data
                 data = process_csv(csv_file)
-                request.session["output_data"] = run_weight_balance.compute_weight_and_balance(data)
-                return HttpResponseRedirect("output")
+                try:
+                    request.session["output_data"] = run_weight_balance.compute_weight_and_balance(data)
+                except errors.WeightBalanceError as error:
+                    file_form.add_error(None, str(error))
+                else:
+                    return HttpResponseRedirect("output")
         elif 'submit_manual_form' in request.POST:
             manual_form = ManualForm(request.POST)
             if manual_form.is_valid():
                 data = manual_form.cleaned_data
-                request.session["output_data"] = run_weight_balance.compute_weight_and_balance(data)
+                try:
+                    request.session["output_data"] = run_weight_balance.compute_weight_and_balance(data)
+                except errors.WeightBalanceError as error:
+                    manual_form.add_error(None, str(error))
+                else:
+                    return HttpResponseRedirect("output")
+    return render(request, "weight_balance/input.html", {'file_form': file_form, 'manual_form': manual_form})
+
+
+async def data_input_async(request):
+    """Async version of data_input.
+
+    compute_weight_and_balance runs in the bounded executor (see
+    common/executor.py), so the event loop keeps serving other requests. The
+    response is 503 if the executor is saturated, and 504 if the results
+    are not available within the per-request timeout.
+    """
+    file_form = CSVFileForm
+    manual_form = ManualForm
+    if request.method == 'POST':
+        form = None
+        if 'submit_file_form' in request.POST:
+            file_form = CSVFileForm(request.POST, request.FILES)
+            if file_form.is_valid():
+                csv_file = file_form.cleaned_data
+                form, data = file_form, process_csv(csv_file)
+        elif 'submit_manual_form' in request.POST:
+            manual_form = ManualForm(request.POST)
+            if manual_form.is_valid():
+                form, data = manual_form, manual_form.cleaned_data
+        if form is not None:
+            try:
+                results, error_response = await compute_in_executor(run_weight_balance.compute_weight_and_balance, data)
+            except errors.WeightBalanceError as error:
+                form.add_error(None, str(error))
+            else:
+                if error_response is not None:
+                    return error_response
+                # The session may be loaded from the database, which is not allowed in async code.
+                await sync_to_async(request.session.__setitem__)("output_data", results)
                 return HttpResponseRedirect("output")
     return render(request, "weight_balance/input.html", {'file_form': file_form, 'manual_form': manual_form})
 
 
+async def compute_in_executor(function, *args):
+    """Returns the result of function(*args), computed in the bounded executor, or an error response.
+
+    Returns:
+        result: the result, or None if it could not be computed.
+        response: 503 (executor saturated) or 504 (timeout) response, or
+            None if the result was computed.
+    """
+    pool = executor.get_executor('weight_balance')
+    try:
+        return await pool.run(function, *args, timeout=executor.get_timeout('weight_balance')), None
+    except executor.ExecutorSaturated:
+        return None, HttpResponse('The server is busy, please try again later.', status=503, headers={'Retry-After': '1'})
+    except TimeoutError:
+        return None, HttpResponse('The computation took too long, please try again later.', status=504)
+
+
 def data_output(request):
     weight_balance_data = request.session["output_data"]
     return render(request, "weight_balance/output.html", {'weight_balance_data': weight_balance_data})
 
 
+@csrf_exempt
+@require_POST
+@json_api.require_api_access
+def data_api(request):
+    """Returns the weight and balance results of a JSON array of scenarios.
+
+    Each scenario is validated with the ManualForm rules. The response is a
+    JSON array, streamed as the scenarios are computed, with one object per
+    scenario: {"results": {...}} or {"errors": {field: [messages]}}. Only
+    authenticated sessions and API tokens have access (see
+    common/json_api.py).
+    """
+    scenarios, error_response = json_api.read_json_scenarios(request)
+    if error_response is not None:
+        return error_response
+    return StreamingHttpResponse(json_api.iter_json_results(scenarios, compute_api_scenario), content_type='application/json')
+
+
+def compute_api_scenario(scenario):
+    """Returns the results or the validation errors of a JSON API scenario."""
+    manual_form = ManualForm(scenario)
+    if not manual_form.is_valid():
+        return {'errors': {field: list(messages) for (field, messages) in manual_form.errors.items()}}
+    try:
+        return {'results': run_weight_balance.compute_weight_and_balance(manual_form.cleaned_data)}
+    except errors.WeightBalanceError as error:
+        return {'errors': {'__all__': [str(error)]}}
+
+
 def process_csv(csv_file):
     file = csv_file['csv_file'].open(mode='r')
     data_set = file.read()